@@ -0,0 +1,57 @@
+"""Wall time of probing the example puzzles that propagation leaves stuck, with the
+serial ProbingEngine and with ParallelProbingEngine over increasing worker counts.
+
+python benchmarks/bench_probing.py [--workers 1 2 4 8]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from nonogram.parser import parse_nonogram
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.parallel_probing import ParallelProbingEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import ProbingEngine
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def stalled(path: Path):
+    puzzle = parse_nonogram(str(path))
+    PropagationEngine(make_line_solver()).propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+    return puzzle
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    workers = [int(arg) for arg in args[args.index("--workers") + 1 :]] if args else [1, 2, 4]
+
+    print(f"{'puzzle':<10} {'engine':<12} {'status':<8} {'probes':>7} {'wall':>8}")
+    for path in sorted(EXAMPLES.glob("*.json")):
+        if stalled(path).grid.is_solved():
+            continue
+
+        puzzle = stalled(path)
+        start = time.perf_counter()
+        result = ProbingEngine(PropagationEngine(make_line_solver()), time_budget=None).probe(
+            puzzle.grid, puzzle.row_clues, puzzle.col_clues
+        )
+        wall = time.perf_counter() - start
+        print(f"{path.stem:<10} {'serial':<12} {result.status:<8} {result.probes:>7} {wall:>7.2f}s")
+
+        grids = set()
+        for count in workers:
+            puzzle = stalled(path)
+            engine = ParallelProbingEngine(count, time_budget=None)
+            start = time.perf_counter()
+            result = engine.probe(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+            wall = time.perf_counter() - start
+            grids.add(str(puzzle.grid.cells))
+            name = f"{count} workers"
+            print(f"{'':<10} {name:<12} {result.status:<8} {result.probes:>7} {wall:>7.2f}s")
+        assert len(grids) == 1, "results differ between worker counts"
+
+
+if __name__ == "__main__":
+    main()
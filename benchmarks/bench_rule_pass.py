@@ -0,0 +1,60 @@
+"""Time of one line solver pass over every line the engine solves for a puzzle.
+
+The (clues, line) inputs are recorded from a full propagation first, then replayed
+through a fresh line solver, so only the rules are timed.
+
+python benchmarks/bench_rule_pass.py [puzzle.json] [--repeat N]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from nonogram.core import Clues, LineState
+from nonogram.parser import parse_nonogram
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.pipeline import make_line_solver
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+class RecordingLineSolver(LineSolver):
+    def __init__(self, line_solver: LineSolver) -> None:
+        super().__init__(line_solver.rules)
+        self.line_solver = line_solver
+        self.inputs: list[tuple[Clues, LineState]] = []
+
+    def solve(self, clues: Clues, state: LineState) -> LineState:
+        self.inputs.append((clues, LineState(state)))
+        return self.line_solver.solve(clues, state)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in args:
+        at = args.index("--repeat")
+        repeat = int(args[at + 1])
+        del args[at : at + 2]
+    path = args[0] if args else str(EXAMPLES / "bench.json")
+
+    puzzle = parse_nonogram(path)
+    recorder = RecordingLineSolver(make_line_solver())
+    PropagationEngine(recorder).propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+    line_solver = make_line_solver()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for clues, state in recorder.inputs:
+            line_solver.solve(clues, state)
+        best = min(best, time.perf_counter() - start)
+
+    lines = len(recorder.inputs)
+    print(f"{Path(path).name}: {lines} line solves in {best * 1000:.1f}ms (best of {repeat})")
+    print(f"{best / lines * 1e6:.1f}us per line solve")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Queue overhead of the propagation work-list as the grid grows.
+
+Replays a synthetic engine workload (pop a line, re-queue a handful of crossing lines)
+against the old deque pattern and each `LineScheduler` strategy, and reports the cost per
+queue operation. The scheduler should stay flat; the deque grows with the grid.
+
+    python benchmarks/bench_scheduler.py
+"""
+
+import random
+import time
+from collections import deque
+
+from nonogram.solver.scheduler import STRATEGIES, LineScheduler, all_lines
+
+SIZES = (25, 50, 100, 200)
+PUSHES_PER_POP = 8
+
+
+def workload(n: int, seed: int = 0) -> list[list[tuple[str, int]]]:
+    """For each of `8n` pops, the crossing lines that pop re-queues."""
+    rng = random.Random(seed)
+    pushes = []
+    for step in range(8 * n):
+        kind = "col" if step % 2 else "row"
+        pushes.append([(kind, rng.randrange(n)) for _ in range(PUSHES_PER_POP)])
+    return pushes
+
+
+def run_deque(n: int, pushes: list[list[tuple[str, int]]]) -> int:
+    queue = deque(all_lines(n, n))
+    ops = 0
+    for batch in pushes:
+        if queue:
+            queue.popleft()
+        for line in batch:
+            if line in queue:
+                queue.remove(line)
+            queue.appendleft(line)
+        ops += 1 + len(batch)
+    return ops
+
+
+def run_scheduler(strategy: str, n: int, pushes: list[list[tuple[str, int]]]) -> int:
+    queue = LineScheduler(strategy, all_lines(n, n))
+    ops = 0
+    for batch in pushes:
+        if queue:
+            queue.pop()
+        for line in batch:
+            queue.push(line)
+        ops += 1 + len(batch)
+    return ops
+
+
+def main() -> None:
+    print(f"{'size':>8} {'deque':>10}" + "".join(f" {s:>10}" for s in STRATEGIES) + "  (ns/op)")
+    for n in SIZES:
+        pushes = workload(n)
+        timings = []
+        for run in [lambda: run_deque(n, pushes)] + [
+            lambda s=s: run_scheduler(s, n, pushes) for s in STRATEGIES
+        ]:
+            start = time.perf_counter()
+            ops = run()
+            timings.append((time.perf_counter() - start) / ops * 1e9)
+        print(f"{n:>4}x{n:<3} " + " ".join(f"{t:>10.0f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Line-solve calls needed to reach the propagation fixpoint under each strategy.
+
+python benchmarks/bench_scheduling.py [--complete]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from nonogram.parser import parse_nonogram
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.scheduler import STRATEGIES
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def main() -> None:
+    complete = "--complete" in sys.argv[1:]
+    paths = sorted(EXAMPLES.glob("*.json"))
+
+    print(f"{'puzzle':<16}" + "".join(f" {s:>14}" for s in STRATEGIES) + "  (line solves)")
+    totals = dict.fromkeys(STRATEGIES, 0)
+    elapsed = dict.fromkeys(STRATEGIES, 0.0)
+    for path in paths:
+        row = f"{path.stem:<16}"
+        for strategy in STRATEGIES:
+            puzzle = parse_nonogram(str(path))
+            engine = PropagationEngine(make_line_solver(complete=complete), strategy=strategy)
+            start = time.perf_counter()
+            engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+            elapsed[strategy] += time.perf_counter() - start
+            totals[strategy] += engine.stats.line_solves
+            row += f" {engine.stats.line_solves:>14}"
+        print(row)
+
+    print(f"{'total':<16}" + "".join(f" {totals[s]:>14}" for s in STRATEGIES))
+    print(f"{'seconds':<16}" + "".join(f" {elapsed[s]:>14.2f}" for s in STRATEGIES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Time of the first row and column sweeps of overlap and never-black on generated
+puzzles, line by line with the rules against one NumPy batch per axis.
+
+python benchmarks/bench_vectorised.py [size ...]
+"""
+
+import sys
+import time
+
+from nonogram.bench import generate_puzzle
+from nonogram.parser import parse_puzzle
+from nonogram.rules.overlap_rules import NeverBlackRule, OverlapRule
+from nonogram.solver.vectorised import ArrayGrid, pad_clues, sweep
+
+
+def rules_sweep(size: int) -> float:
+    puzzle = parse_puzzle(generate_puzzle(size, seed=1))
+    grid = puzzle.grid
+    start = time.perf_counter()
+    for i, clues in enumerate(puzzle.row_clues):
+        grid.apply_row(i, NeverBlackRule.apply(clues, OverlapRule.apply(clues, grid.row(i))))
+    for j, clues in enumerate(puzzle.col_clues):
+        grid.apply_col(j, NeverBlackRule.apply(clues, OverlapRule.apply(clues, grid.col(j))))
+    return time.perf_counter() - start
+
+
+def batch_sweep(size: int) -> float:
+    puzzle = parse_puzzle(generate_puzzle(size, seed=1))
+    grid = ArrayGrid.from_grid(puzzle.grid)
+    start = time.perf_counter()
+    sweep(grid, *pad_clues(puzzle.row_clues), "row")
+    sweep(grid, *pad_clues(puzzle.col_clues), "col")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 200, 400]
+    print(f"{'size':>6} {'rules':>10} {'numpy':>10} {'speedup':>8}")
+    for size in sizes:
+        rules = min(rules_sweep(size) for _ in range(3))
+        batch = min(batch_sweep(size) for _ in range(3))
+        print(f"{size:>6} {rules * 1e3:>8.1f}ms {batch * 1e3:>8.1f}ms {rules / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
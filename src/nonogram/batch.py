@@ -0,0 +1,230 @@
+"""
+Headless batch solving.
+
+Puzzles in the `parser` JSON format are read from files, directories, globs or JSON lines
+(`.jsonl` files, or `-` for stdin), or from `.ngc` corpus files (see `corpus`), and solved
+across a process pool. Corpus puzzles are sent to workers by reference and decoded there.
+One JSON line is written per puzzle, in completion order:
+
+{
+    "id": <str>, # source path, path:line for JSON lines, or the id packed in a corpus
+    "title": <str | None>,
+    "status": "solved" | "stuck" | "contradiction" | "invalid",
+    "grid": <list[str] | None>,
+    "line_solves": <int>,
+    "parse_time": <float>, # seconds
+    "solve_time": <float>, # seconds
+    "error": <str | None>
+}
+"""
+
+import glob
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from multiprocessing import util
+from pathlib import Path
+from typing import Any, TextIO
+
+from nonogram.core import Grid
+from nonogram.corpus import SUFFIX, Corpus, CorpusRef
+from nonogram.exceptions import Contradiction
+from nonogram.parser import ParseError, parse_puzzle
+from nonogram.solver.cache import CachedLineSolver, LineCache
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.search import SearchEngine
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    complete: bool = False
+    search: bool = False
+    max_nodes: int = 100_000
+    cache: str | None = None
+
+
+def iter_sources(
+    inputs: Iterable[str], stdin: TextIO | None = None, exclude: Iterable[str] = ()
+) -> Iterator[tuple[str, Any]]:
+    """Yields (id, decoded JSON) for every puzzle named by `inputs`, skipping the files
+    in `exclude`.
+
+    Records that are not valid JSON, and corpus files that cannot be read, are yielded as
+    None so they are reported, not lost. Puzzles in a corpus are yielded as a `CorpusRef`
+    rather than decoded.
+    """
+    excluded = {Path(path).resolve() for path in exclude}
+    for source in inputs:
+        if source == "-":
+            yield from _iter_json_lines("stdin", stdin or sys.stdin)
+            continue
+
+        path = Path(source)
+        if path.is_dir():
+            paths = sorted(path.glob("*.json")) + sorted(path.glob("*.jsonl"))
+            paths += sorted(path.glob(f"*{SUFFIX}"))
+        elif path.is_file():
+            paths = [path]
+        else:
+            paths = [Path(p) for p in sorted(glob.glob(source, recursive=True))]
+
+        for p in paths:
+            if p.resolve() in excluded:
+                continue
+            if p.suffix == ".jsonl":
+                with p.open() as f:
+                    yield from _iter_json_lines(str(p), f)
+            elif p.suffix == SUFFIX:
+                try:
+                    corpus = Corpus(p)
+                except ParseError:
+                    yield str(p), None
+                    continue
+                with corpus:
+                    try:
+                        yield from corpus.refs()
+                    except ParseError:
+                        # The rest of a corrupt corpus is reported as one invalid source
+                        yield str(p), None
+            else:
+                yield str(p), _load_json(p.read_text())
+
+
+def _iter_json_lines(name: str, stream: TextIO) -> Iterator[tuple[str, Any]]:
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield f"{name}:{number}", _load_json(line)
+
+
+def _load_json(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+_line_solver: LineSolver | None = None
+_corpora: dict[str, Corpus] = {}  # corpora opened by this process, by path
+
+
+def _init_worker(options: BatchOptions) -> None:
+    """Builds the per-process line solver once, rather than per puzzle."""
+    global _line_solver
+    _line_solver = make_line_solver(complete=options.complete)
+    if options.cache is not None:
+        cache = LineCache(path=options.cache)
+        util.Finalize(cache, cache.close, exitpriority=10)
+        _line_solver = CachedLineSolver(_line_solver, cache)
+
+
+def solve_record(source: str, data: Any, options: BatchOptions) -> dict[str, Any]:
+    """Solves one decoded puzzle, returning its result record."""
+    if _line_solver is None:
+        _init_worker(options)
+    assert _line_solver is not None
+
+    record: dict[str, Any] = {
+        "id": source,
+        "title": None,
+        "status": "invalid",
+        "grid": None,
+        "line_solves": 0,
+        "parse_time": 0.0,
+        "solve_time": 0.0,
+        "error": None,
+    }
+
+    start = time.perf_counter()
+    try:
+        if isinstance(data, CorpusRef):
+            if data.path not in _corpora:
+                _corpora[data.path] = Corpus(data.path)
+            puzzle = _corpora[data.path][data.index]
+        elif not isinstance(data, dict):
+            raise ParseError("Record is not a JSON object")
+        else:
+            puzzle = parse_puzzle(data)
+    except (ParseError, TypeError, ValueError) as exc:
+        record["error"] = str(exc)
+        return record
+    record["title"] = puzzle.meta.get("title")
+    record["parse_time"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = PropagationEngine(_line_solver)
+    grid: Grid = puzzle.grid
+    try:
+        engine.propagate(grid, puzzle.row_clues, puzzle.col_clues)
+        # Search propagates again with the same engine, replacing its stats each time
+        line_solves = engine.stats.line_solves
+        record["status"] = "solved" if grid.is_solved() else "stuck"
+        if record["status"] == "stuck" and options.search:
+            result = SearchEngine(engine, max_nodes=options.max_nodes).solve(
+                grid, puzzle.row_clues, puzzle.col_clues
+            )
+            line_solves += result.line_solves
+            if result.grid is not None:
+                grid = result.grid
+                record["status"] = "solved"
+            elif result.status == "unsolvable":
+                record["status"] = "contradiction"
+    except Contradiction as exc:
+        line_solves = engine.stats.line_solves
+        record["status"] = "contradiction"
+        record["error"] = str(exc)
+
+    record["line_solves"] = line_solves
+    record["solve_time"] = time.perf_counter() - start
+    record["grid"] = [str(grid.row(i)) for i in range(grid.height)]
+    return record
+
+
+def run_batch(
+    sources: Iterable[tuple[str, Any]],
+    output: TextIO,
+    options: BatchOptions = BatchOptions(),
+    workers: int = 1,
+) -> dict[str, int]:
+    """Solves every source, writing one JSON line per puzzle to `output`.
+
+    With more than one worker, puzzles are fanned out over a process pool keeping a
+    bounded number in flight, so arbitrarily long input streams use constant memory.
+
+    Returns:
+        dict[str, int]: The number of puzzles per status.
+    """
+    counts: dict[str, int] = {}
+
+    def emit(record: dict[str, Any]) -> None:
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        _init_worker(options)
+        for source, data in sources:
+            emit(solve_record(source, data, options))
+        if isinstance(_line_solver, CachedLineSolver):
+            _line_solver.cache.flush()
+        return counts
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(options,)
+    ) as executor:
+        pending: set[Future[dict[str, Any]]] = set()
+        for source, data in sources:
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+            pending.add(executor.submit(solve_record, source, data, options))
+
+        for future in as_completed(pending):
+            emit(future.result())
+
+    return counts
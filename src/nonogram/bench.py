@@ -0,0 +1,218 @@
+"""
+Benchmarks for the propagation pipeline.
+
+Every puzzle (examples plus generated random puzzles of increasing size) is solved with
+the `make_line_solver` pipeline, and one result per puzzle is recorded:
+
+{
+    "name": <str>,
+    "width": <int>,
+    "height": <int>,
+    "status": "solved" | "stuck" | "contradiction",
+    "wall": <float>, # seconds, best of the repeats
+    "line_solves": <int>,
+    "rule_applications": <int>,
+    "cells": <int>, # cells deduced
+    "cells_per_second": <float>,
+    "peak_memory": <int> # bytes allocated at peak, from a separate traced run
+}
+
+Result files hold {"version", "python", "complete", "results": [...]} and can be passed
+back as a baseline to flag regressions.
+"""
+
+import gc
+import json
+import platform
+import random
+import time
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from nonogram.core import Cell, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.parser import parse_puzzle
+from nonogram.rules.simple_rules import black_runs
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+
+RESULT_VERSION = 1
+
+# Metrics where larger is worse, compared relative to the baseline
+COMPARED = ("wall", "line_solves", "rule_applications", "peak_memory")
+
+# Absolute changes too small to flag, whatever the relative change
+NOISE_FLOOR = {"wall": 0.005, "peak_memory": 16 * 1024}
+
+
+@dataclass
+class BenchResult:
+    name: str
+    width: int
+    height: int
+    status: str
+    wall: float
+    line_solves: int
+    rule_applications: int
+    cells: int
+    cells_per_second: float
+    peak_memory: int
+
+
+def generate_puzzle(size: int, density: float = 0.6, seed: int = 0) -> dict[str, Any]:
+    """Builds a square puzzle in the `parser` format from a random image.
+
+    Random images are not always uniquely solvable, so some may end up stuck.
+    """
+    rng = random.Random(f"{size}:{density}:{seed}")
+    image = [
+        LineState([Cell.BOX if rng.random() < density else Cell.CROSS for _ in range(size)])
+        for _ in range(size)
+    ]
+    columns = [LineState([row[j] for row in image]) for j in range(size)]
+    return {
+        "version": "1",
+        "meta": {"title": f"random-{size}x{size}"},
+        "width": size,
+        "height": size,
+        "rows": [_clues_of(row) for row in image],
+        "cols": [_clues_of(col) for col in columns],
+    }
+
+
+def _clues_of(line: LineState) -> list[int]:
+    return [length for _, length in black_runs(line)] or [0]
+
+
+def bench_puzzle(
+    name: str, data: dict[str, Any], complete: bool = False, repeat: int = 3
+) -> BenchResult:
+    """Solves a decoded puzzle `repeat` times after a warm-up run, keeping the fastest,
+    then once more under tracemalloc for its peak memory."""
+    _run(data, complete, trace=False)
+    best = None
+    for _ in range(repeat):
+        run = _run(data, complete, trace=False)
+        if best is None or run["wall"] < best["wall"]:
+            best = run
+    assert best is not None
+    peak = _run(data, complete, trace=True)["peak_memory"]
+
+    return BenchResult(
+        name=name,
+        width=int(data["width"]),
+        height=int(data["height"]),
+        status=best["status"],
+        wall=best["wall"],
+        line_solves=best["line_solves"],
+        rule_applications=best["rule_applications"],
+        cells=best["cells"],
+        cells_per_second=best["cells"] / best["wall"] if best["wall"] else 0.0,
+        peak_memory=peak,
+    )
+
+
+def _run(data: dict[str, Any], complete: bool, trace: bool) -> dict[str, Any]:
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+
+    puzzle = parse_puzzle(data)
+    line_solver = make_line_solver(complete=complete)
+    engine = PropagationEngine(line_solver)
+
+    start = time.perf_counter()
+    try:
+        engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+        status = "solved" if puzzle.grid.is_solved() else "stuck"
+    except Contradiction:
+        status = "contradiction"
+    wall = time.perf_counter() - start
+
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "status": status,
+        "wall": wall,
+        "line_solves": engine.stats.line_solves,
+        "rule_applications": sum(stats.calls for stats in line_solver.stats.values()),
+        "cells": engine.stats.cells_changed,
+        "peak_memory": peak,
+    }
+
+
+def run_bench(
+    puzzles: Iterable[tuple[str, dict[str, Any]]], complete: bool = False, repeat: int = 3
+) -> dict[str, Any]:
+    """Benchmarks every (name, decoded puzzle) pair, returning the result file contents."""
+    return {
+        "version": RESULT_VERSION,
+        "python": platform.python_version(),
+        "complete": complete,
+        "results": [asdict(bench_puzzle(name, data, complete, repeat)) for name, data in puzzles],
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.1) -> list[str]:
+    """Lists regressions of `current` against `baseline`, matching puzzles by name.
+
+    A metric regresses when it grew by more than `threshold` relative to the baseline (and
+    by more than its `NOISE_FLOOR`), and a puzzle regresses when it is no longer solved.
+    """
+    if current.get("complete") != baseline.get("complete"):
+        return ["Baseline was recorded with a different line solver (--complete)"]
+
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get(result["name"])
+        if base is None:
+            continue
+        if base["status"] == "solved" and result["status"] != "solved":
+            regressions.append(f"{result['name']}: {result['status']}, was solved")
+        for metric in COMPARED:
+            old, new = base[metric], result[metric]
+            if new - old <= NOISE_FLOOR.get(metric, 0):
+                continue
+            if old and new > old * (1 + threshold):
+                regressions.append(
+                    f"{result['name']}: {metric} {_format(metric, old)} -> "
+                    f"{_format(metric, new)} (+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _format(metric: str, value: float) -> str:
+    if metric == "wall":
+        return f"{value * 1000:.1f}ms"
+    if metric == "peak_memory":
+        return f"{value / 1024:.0f}KiB"
+    return str(value)
+
+
+def format_table(report: dict[str, Any]) -> str:
+    width = max([len("puzzle")] + [len(r["name"]) for r in report["results"]])
+    lines = [
+        f"{'puzzle':<{width}} {'size':>7} {'status':>8} {'wall ms':>9} {'solves':>8}"
+        f" {'rules':>9} {'cells/s':>10} {'peak KiB':>9}"
+    ]
+    for r in report["results"]:
+        lines.append(
+            f"{r['name']:<{width}} {r['width']:>3}x{r['height']:<3} {r['status']:>8}"
+            f" {r['wall'] * 1000:>9.1f} {r['line_solves']:>8} {r['rule_applications']:>9}"
+            f" {r['cells_per_second']:>10.0f} {r['peak_memory'] / 1024:>9.0f}"
+        )
+    return "\n".join(lines)
+
+
+def load_report(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        report: dict[str, Any] = json.load(f)
+    if report.get("version") != RESULT_VERSION:
+        raise ValueError(f"Unsupported benchmark result version in {path}")
+    return report
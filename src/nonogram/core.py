@@ -1,8 +1,13 @@
+from collections.abc import Iterable
 from enum import StrEnum
-from typing import Any
+from typing import Any, ClassVar
 
 from nonogram.exceptions import CellConflictContradiction, LineTooShortContradiction
 
+# Distinct clues kept interned before the table is cleared, so that streaming many
+# puzzles through one process does not grow it without bound
+_INTERN_LIMIT = 1 << 16
+
 
 class Cell(StrEnum):
     BOX = "#"
@@ -21,9 +26,36 @@ class Cell(StrEnum):
 
 
 class Clues(tuple[int]):
-    def __init__(self, base: Any) -> None:
+    """The clues of one line. Immutable, so equal clues are interned: repeated tuples
+    share one object, and `reversed` and `sliced` build new clues without re-checking
+    values that were checked when these were made.
+    """
+
+    _interned: ClassVar[dict[tuple[int, ...], "Clues"]] = {}
+
+    def __new__(cls, base: Any) -> "Clues":
+        if type(base) is cls:
+            return base
         if not isinstance(base, (tuple, list)) or not all(isinstance(x, int) for x in base):
             raise TypeError(f"Clues must be init as tuple[int] or list[int]: {base}")
+        return cls.trusted(tuple(base))
+
+    @classmethod
+    def trusted(cls, values: tuple[int, ...]) -> "Clues":
+        """The interned clues for `values`, which must already be valid clues."""
+        interned = cls._interned
+        clues = interned.get(values)
+        if clues is None:
+            if len(interned) >= _INTERN_LIMIT:
+                interned.clear()
+            clues = interned[values] = super().__new__(cls, values)
+        return clues
+
+    def reversed(self) -> "Clues":
+        return Clues.trusted(self[::-1])
+
+    def sliced(self, start: int | None = None, stop: int | None = None) -> "Clues":
+        return Clues.trusted(self[start:stop])
 
     def __str__(self) -> str:
         return " ".join(str(clue) for clue in self)
@@ -33,8 +65,15 @@ class Clues(tuple[int]):
 
 
 class LineState(list[Cell]):
+    """The cells of one line. Rules edit copies in place, so unlike `Clues` a line is
+    mutable and its hash is worked out on each call. Copying a `LineState`, or taking
+    `reversed` and `sliced` ones, skips the per-cell checks its cells already passed.
+    """
+
     def __init__(self, base: Any) -> None:
-        if isinstance(base, str):
+        if type(base) is LineState:
+            super().__init__(base)
+        elif isinstance(base, str):
             super().__init__([Cell.of(cell) for cell in base])
         elif not isinstance(base, (tuple, list)) or not all(isinstance(x, Cell) for x in base):
             raise TypeError(
@@ -43,33 +82,49 @@ class LineState(list[Cell]):
         else:
             super().__init__(base)
 
+    @classmethod
+    def trusted(cls, cells: Iterable[Cell]) -> "LineState":
+        """A line of `cells`, which must already all be `Cell`s."""
+        line = cls.__new__(cls)
+        list.__init__(line, cells)
+        return line
+
+    def reversed(self) -> "LineState":
+        return LineState.trusted(self[::-1])
+
+    def sliced(self, start: int | None = None, stop: int | None = None) -> "LineState":
+        return LineState.trusted(self[start:stop])
+
     def state(self) -> tuple[Cell, ...]:
         return tuple(self)
 
     def is_complete(self) -> bool:
-        return all(cell != Cell.UNKNOWN for cell in self)
+        return Cell.UNKNOWN not in self
 
     def __str__(self) -> str:
-        return "".join(str(cell) for cell in self)
+        # Cells are strs, so they join without a str() call each
+        return "".join(self)
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self})"
 
     def __hash__(self) -> int:  # type: ignore[override]
-        return hash(str(self))
+        return hash("".join(self))
 
 
 class Grid:
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
-        self.cells = [[Cell.UNKNOWN for _ in range(width)] for _ in range(height)]
+        self.cells = [[Cell.UNKNOWN] * width for _ in range(height)]
+        # (i, j, previous value) for every cell written since the first `mark()`
+        self.trail: list[tuple[int, int, Cell]] | None = None
 
     def row(self, i: int) -> LineState:
-        return LineState(self.cells[i])
+        return LineState.trusted(self.cells[i])
 
     def col(self, j: int) -> LineState:
-        return LineState([self.cells[i][j] for i in range(self.height)])
+        return LineState.trusted([self.cells[i][j] for i in range(self.height)])
 
     def apply_row(self, i: int, new_state: LineState) -> bool:
         if self.width != len(new_state):
@@ -82,6 +137,8 @@ class Grid:
             if cell == Cell.UNKNOWN and val != Cell.UNKNOWN:
                 self.cells[i][j] = val
                 changed = True
+                if self.trail is not None:
+                    self.trail.append((i, j, Cell.UNKNOWN))
             elif val != Cell.UNKNOWN and val != cell:
                 raise CellConflictContradiction(f"Cell {cell} being applied as {val}.")
 
@@ -98,11 +155,42 @@ class Grid:
             if cell == Cell.UNKNOWN and val != Cell.UNKNOWN:
                 self.cells[i][j] = val
                 changed = True
+                if self.trail is not None:
+                    self.trail.append((i, j, Cell.UNKNOWN))
             elif val != Cell.UNKNOWN and val != cell:
                 raise CellConflictContradiction(f"Cell {cell} being applied as {val}.")
 
         return changed
 
+    def get(self, i: int, j: int) -> Cell:
+        return self.cells[i][j]
+
+    def set(self, i: int, j: int, value: Cell) -> None:
+        """Overwrite a single cell, unlike `apply_row`/`apply_col` which only fill unknowns."""
+        if self.trail is not None:
+            self.trail.append((i, j, self.cells[i][j]))
+        self.cells[i][j] = value
+
+    def mark(self) -> int:
+        """Returns a point on the change trail to `rollback` to, starting the trail if needed."""
+        if self.trail is None:
+            self.trail = []
+        return len(self.trail)
+
+    def rollback(self, mark: int) -> int:
+        """Undoes every cell write made since `mark`. Returns the number of cells restored."""
+        trail = self.trail
+        if trail is None or mark > len(trail):
+            raise ValueError(f"Unknown trail mark {mark}")
+
+        restored = len(trail) - mark
+        self.trail = None
+        for i, j, previous in reversed(trail[mark:]):
+            self.set(i, j, previous)
+        del trail[mark:]
+        self.trail = trail
+        return restored
+
     def is_solved(self) -> bool:
         return all(cell != Cell.UNKNOWN for row in self.cells for cell in row)
 
@@ -110,3 +198,160 @@ class Grid:
         g = Grid(self.width, self.height)
         g.cells = [row[:] for row in self.cells]
         return g
+
+
+_BOX_BITS = str.maketrans({"#": "1", ".": "0", " ": "0"})
+_CROSS_BITS = str.maketrans({"#": "0", ".": "1", " ": "0"})
+_CELL_OF_BITS = {("0", "0"): Cell.UNKNOWN, ("1", "0"): Cell.BOX, ("0", "1"): Cell.CROSS}
+
+
+def encode_line(state: LineState) -> tuple[int, int]:
+    """Packs a line into (boxes, crosses) bitmasks, with bit `j` holding cell `j`."""
+    s = "".join(state)
+    if not s:
+        return 0, 0
+    return int(s.translate(_BOX_BITS)[::-1], 2), int(s.translate(_CROSS_BITS)[::-1], 2)
+
+
+def decode_line(boxes: int, crosses: int, length: int) -> LineState:
+    """Unpacks (boxes, crosses) bitmasks of the given length into a line."""
+    if not length:
+        return LineState([])
+    box_bits = format(boxes, f"0{length}b")[::-1]
+    cross_bits = format(crosses, f"0{length}b")[::-1]
+    return LineState([_CELL_OF_BITS[bits] for bits in zip(box_bits, cross_bits)])
+
+
+class BitGrid(Grid):
+    """Compact grid backend. Every row and column is held as a pair of integer bitmasks
+    (boxes, crosses), kept in sync on writes, so applying a line is a handful of bitwise
+    operations. `cells` is rebuilt on read and is a snapshot: write through `set`."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.row_boxes = [0] * height
+        self.row_crosses = [0] * height
+        self.col_boxes = [0] * width
+        self.col_crosses = [0] * width
+        self.trail: list[tuple[int, int, Cell]] | None = None
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "BitGrid":
+        g = cls(grid.width, grid.height)
+        for i in range(grid.height):
+            g.apply_row(i, grid.row(i))
+        return g
+
+    @property  # type: ignore[override]
+    def cells(self) -> list[LineState]:  # type: ignore[override]
+        return [self.row(i) for i in range(self.height)]
+
+    def row_bits(self, i: int) -> tuple[int, int]:
+        return self.row_boxes[i], self.row_crosses[i]
+
+    def col_bits(self, j: int) -> tuple[int, int]:
+        return self.col_boxes[j], self.col_crosses[j]
+
+    def row(self, i: int) -> LineState:
+        return decode_line(self.row_boxes[i], self.row_crosses[i], self.width)
+
+    def col(self, j: int) -> LineState:
+        return decode_line(self.col_boxes[j], self.col_crosses[j], self.height)
+
+    def apply_row(self, i: int, new_state: LineState) -> bool:
+        if self.width != len(new_state):
+            raise LineTooShortContradiction("Cannot apply states of different length")
+        return bool(self.apply_row_bits(i, *encode_line(new_state)))
+
+    def apply_col(self, j: int, new_state: LineState) -> bool:
+        if self.height != len(new_state):
+            raise LineTooShortContradiction("Cannot apply states of different length")
+        return bool(self.apply_col_bits(j, *encode_line(new_state)))
+
+    def apply_row_bits(self, i: int, boxes: int, crosses: int) -> int:
+        """Applies packed row masks. Returns the mask of cells that changed."""
+        added_boxes, added_crosses = _merge_bits(
+            self.row_boxes[i], self.row_crosses[i], boxes, crosses
+        )
+        self.row_boxes[i] |= added_boxes
+        self.row_crosses[i] |= added_crosses
+        _scatter(added_boxes, self.col_boxes, 1 << i)
+        _scatter(added_crosses, self.col_crosses, 1 << i)
+        changed = added_boxes | added_crosses
+        if self.trail is not None:
+            self.trail.extend((i, j, Cell.UNKNOWN) for j in _bits(changed))
+        return changed
+
+    def apply_col_bits(self, j: int, boxes: int, crosses: int) -> int:
+        """Applies packed column masks. Returns the mask of cells that changed."""
+        added_boxes, added_crosses = _merge_bits(
+            self.col_boxes[j], self.col_crosses[j], boxes, crosses
+        )
+        self.col_boxes[j] |= added_boxes
+        self.col_crosses[j] |= added_crosses
+        _scatter(added_boxes, self.row_boxes, 1 << j)
+        _scatter(added_crosses, self.row_crosses, 1 << j)
+        changed = added_boxes | added_crosses
+        if self.trail is not None:
+            self.trail.extend((i, j, Cell.UNKNOWN) for i in _bits(changed))
+        return changed
+
+    def get(self, i: int, j: int) -> Cell:
+        bit = 1 << j
+        if self.row_boxes[i] & bit:
+            return Cell.BOX
+        if self.row_crosses[i] & bit:
+            return Cell.CROSS
+        return Cell.UNKNOWN
+
+    def set(self, i: int, j: int, value: Cell) -> None:
+        if self.trail is not None:
+            self.trail.append((i, j, self.get(i, j)))
+        row_bit, col_bit = 1 << j, 1 << i
+        self.row_boxes[i] &= ~row_bit
+        self.row_crosses[i] &= ~row_bit
+        self.col_boxes[j] &= ~col_bit
+        self.col_crosses[j] &= ~col_bit
+        if value == Cell.BOX:
+            self.row_boxes[i] |= row_bit
+            self.col_boxes[j] |= col_bit
+        elif value == Cell.CROSS:
+            self.row_crosses[i] |= row_bit
+            self.col_crosses[j] |= col_bit
+
+    def is_solved(self) -> bool:
+        full = (1 << self.width) - 1
+        return all(b | c == full for b, c in zip(self.row_boxes, self.row_crosses))
+
+    def copy(self) -> "BitGrid":
+        g = BitGrid(self.width, self.height)
+        g.row_boxes = self.row_boxes[:]
+        g.row_crosses = self.row_crosses[:]
+        g.col_boxes = self.col_boxes[:]
+        g.col_crosses = self.col_crosses[:]
+        return g
+
+
+def _merge_bits(boxes: int, crosses: int, new_boxes: int, new_crosses: int) -> tuple[int, int]:
+    if (new_boxes & crosses) or (new_crosses & boxes):
+        conflict = (new_boxes & crosses) | (new_crosses & boxes)
+        j = (conflict & -conflict).bit_length() - 1
+        raise CellConflictContradiction(f"Cell {j} being applied with a conflicting value.")
+    return new_boxes & ~boxes, new_crosses & ~crosses
+
+
+def _scatter(mask: int, lines: list[int], bit: int) -> None:
+    """Sets `bit` in `lines[j]` for every set bit `j` of `mask`."""
+    for j in _bits(mask):
+        lines[j] |= bit
+
+
+def _bits(mask: int) -> list[int]:
+    """Indices of the set bits of `mask`, lowest first."""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
@@ -0,0 +1,340 @@
+"""
+Compact binary corpus of puzzles, read through a memory map.
+
+All integers are little-endian; "varint" is an unsigned LEB128 integer.
+
+Header (24 bytes):
+    magic        b"NGC1"
+    version      u16, currently 1
+    reserved     u16
+    count        u64, the number of puzzles
+    index        u64, offset of the index
+
+Records, one per puzzle, back to back from byte 24:
+    id           varint length + UTF-8, the source the puzzle was packed from
+    meta         varint length + compact JSON, empty when there is none
+    width        varint
+    height       varint
+    clues        for each row, then each column: varint count + that many varints
+    flags        u8, bit 0 set when a grid follows
+    grid         ceil(width * height / 4) bytes, row-major, 2 bits per cell
+                 (0 unknown, 1 box, 2 cross), first cell in the lowest bits
+
+Index, after the records:
+    offsets      count + 1 u64, the start of each record and the end of the last
+
+Puzzles are only decoded when asked for, by index or by id, so opening a corpus costs
+one header read however large it is, and processes reading the same file share its pages.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+from nonogram.core import Cell, Clues, Grid, LineState
+from nonogram.parser import ParseError, PuzzleInput, parse_puzzle
+
+MAGIC = b"NGC1"
+VERSION = 1
+SUFFIX = ".ngc"
+
+_HEADER = struct.Struct("<4sHHQQ")
+_OFFSET = struct.Struct("<Q")
+_HAS_GRID = 1
+_CODES = {Cell.UNKNOWN: 0, Cell.BOX: 1, Cell.CROSS: 2}
+_CELLS = (Cell.UNKNOWN, Cell.BOX, Cell.CROSS)  # indexed by code; 3 is unused
+# The four cells packed into each byte value, empty when any of them is invalid
+_QUADS: list[tuple[Cell, ...]] = [
+    tuple(_CELLS[code] for code in codes) if 3 not in codes else ()
+    for codes in ([(byte >> shift) & 3 for shift in (0, 2, 4, 6)] for byte in range(256))
+]
+
+
+@dataclass(frozen=True)
+class CorpusRef:
+    """A puzzle in a corpus file, cheap to send to another process."""
+
+    path: str
+    index: int
+
+
+def write_corpus(puzzles: Iterable[tuple[str, PuzzleInput]], path: str | Path) -> int:
+    """Packs puzzles into a corpus file, in order. The file is written under a temporary
+    name and renamed into place, so `path` never holds a partial corpus.
+
+    Args:
+        puzzles (Iterable[tuple[str, PuzzleInput]]): (id, puzzle) pairs
+        path (str | Path): The corpus file to write
+
+    Returns:
+        int: The number of puzzles written.
+    """
+    offsets: list[int] = []
+    partial = f"{path}.partial"
+    try:
+        with open(partial, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+            position = _HEADER.size
+            for source, puzzle in puzzles:
+                record = encode_puzzle(source, puzzle)
+                offsets.append(position)
+                f.write(record)
+                position += len(record)
+            offsets.append(position)
+
+            for offset in offsets:
+                f.write(_OFFSET.pack(offset))
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, len(offsets) - 1, position))
+    except BaseException:
+        Path(partial).unlink(missing_ok=True)
+        raise
+    os.replace(partial, path)
+    return len(offsets) - 1
+
+
+def pack_sources(sources: Iterable[tuple[str, Any]], path: str | Path) -> tuple[int, list[str]]:
+    """Packs decoded JSON puzzles (see `batch.iter_sources`) into a corpus, skipping any
+    that do not parse.
+
+    Returns:
+        tuple[int, list[str]]: The number of puzzles written and an error per skipped one.
+    """
+    errors: list[str] = []
+
+    def parsed() -> Iterator[tuple[str, PuzzleInput]]:
+        for source, data in sources:
+            try:
+                if not isinstance(data, dict):
+                    raise ParseError("Record is not a JSON object")
+                yield source, parse_puzzle(data)
+            except (ParseError, TypeError, ValueError) as exc:
+                errors.append(f"{source}: {exc}")
+
+    return write_corpus(parsed(), path), errors
+
+
+def encode_puzzle(source: str, puzzle: PuzzleInput) -> bytes:
+    """Encodes one puzzle as a corpus record."""
+    out = bytearray()
+    _write_bytes(out, source.encode())
+    _write_bytes(
+        out, json.dumps(puzzle.meta, separators=(",", ":")).encode() if puzzle.meta else b""
+    )
+    _write_varint(out, puzzle.width)
+    _write_varint(out, puzzle.height)
+    for clues in (*puzzle.row_clues, *puzzle.col_clues):
+        _write_varint(out, len(clues))
+        for clue in clues:
+            _write_varint(out, clue)
+
+    grid = puzzle.grid
+    rows = [grid.row(i) for i in range(grid.height)]
+    if all(cell == Cell.UNKNOWN for row in rows for cell in row):
+        out.append(0)
+        return bytes(out)
+
+    out.append(_HAS_GRID)
+    packed = bytearray((grid.width * grid.height + 3) // 4)
+    for k, cell in enumerate(cell for row in rows for cell in row):
+        packed[k >> 2] |= _CODES[cell] << ((k & 3) * 2)
+    out += packed
+    return bytes(out)
+
+
+class Corpus:
+    """A corpus file opened read-only through a memory map.
+
+    Puzzles are decoded on access: `corpus[i]` or `corpus.find(id)` for one puzzle, and
+    iteration for (id, puzzle) pairs in order. Ids are only decoded, all at once, the
+    first time one is looked up.
+    """
+
+    def __init__(self, path: str | Path, grid_cls: type[Grid] = Grid) -> None:
+        self.path = str(path)
+        self.grid_cls = grid_cls
+        with open(path, "rb") as f:
+            # An empty file cannot be mapped at all
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ParseError(f"{path} is too short to be a corpus")
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, index = _HEADER.unpack_from(self._data)
+        self._count: int = count
+        self._index: int = index
+        if magic != MAGIC:
+            raise ParseError(f"{path} is not a corpus")
+        if version != VERSION:
+            raise ParseError(f"Unsupported corpus version {version}")
+        if self._index + (self._count + 1) * _OFFSET.size > len(self._data):
+            raise ParseError(f"{path} is truncated")
+        self._ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> PuzzleInput:
+        return self.decode(index)[1]
+
+    def __iter__(self) -> Iterator[tuple[str, PuzzleInput]]:
+        for index in range(self._count):
+            yield self.decode(index)
+
+    def refs(self) -> Iterator[tuple[str, CorpusRef]]:
+        """(id, reference) for every puzzle, decoding only the ids.
+
+        Raises:
+            ParseError: When an id or the index is malformed
+        """
+        for index in range(self._count):
+            yield self.id(index), CorpusRef(self.path, index)
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def id(self, index: int) -> str:
+        """The id of the puzzle at `index`, without decoding the rest of it.
+
+        Raises:
+            ParseError: When the id runs past the end of its record
+        """
+        data = self._data
+        end = self._offset(index + 1, end=True)
+        try:
+            length, position = _read_varint(data, self._offset(index))
+            if position + length > end:
+                raise ParseError("id runs past the end of the record")
+            return data[position : position + length].decode()
+        except (ParseError, IndexError, UnicodeDecodeError) as exc:
+            raise ParseError(f"Corpus record {index} is malformed: {exc}") from None
+
+    def find(self, source: str) -> PuzzleInput:
+        """The puzzle packed with id `source`.
+
+        Raises:
+            KeyError: When no puzzle has that id
+        """
+        if self._ids is None:
+            self._ids = {self.id(index): index for index in range(self._count)}
+        return self[self._ids[source]]
+
+    def decode(self, index: int) -> tuple[str, PuzzleInput]:
+        """Decodes the puzzle at `index`, returning its id and the puzzle.
+
+        Raises:
+            ParseError: When the record is truncated or malformed
+        """
+        start = self._offset(index)
+        # One copy of the record out of the map; indexing bytes is cheaper than the map
+        data = self._data[start : self._offset(index + 1, end=True)]
+        try:
+            return self._decode_record(data)
+        except (ParseError, IndexError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ParseError(f"Corpus record {index} is malformed: {exc}") from None
+
+    def _decode_record(self, data: bytes) -> tuple[str, PuzzleInput]:
+        length, position = _read_varint(data, 0)
+        source = data[position : position + length].decode()
+        position += length
+        length, position = _read_varint(data, position)
+        meta = json.loads(data[position : position + length]) if length else {}
+        position += length
+
+        width, position = _read_varint(data, position)
+        height, position = _read_varint(data, position)
+        # Every line takes at least a byte, which bounds the grid before it is allocated
+        if width + height > len(data) - position:
+            raise ParseError("clues run past the end of the record")
+        lines: list[Clues] = []
+        for _ in range(height + width):
+            count = data[position]
+            if count < 0x80:
+                position += 1
+            else:
+                count, position = _read_varint(data, position)
+            chunk = data[position : position + count]
+            if len(chunk) < count:
+                raise ParseError("clues run past the end of the record")
+            if chunk.isascii():
+                # Every clue fits in one byte, as nearly all do. Varints are never
+                # negative, so they need no further checks
+                position += count
+                lines.append(Clues.trusted(tuple(chunk)))
+                continue
+            clues = []
+            for _ in range(count):
+                clue, position = _read_varint(data, position)
+                clues.append(clue)
+            lines.append(Clues.trusted(tuple(clues)))
+
+        has_grid = data[position] & _HAS_GRID
+        position += 1
+        size = (width * height + 3) // 4 if has_grid else 0
+        if position + size != len(data):
+            raise ParseError("record size does not match its contents")
+
+        grid = self.grid_cls(width, height)
+        if has_grid:
+            packed = data[position : position + size]
+            cells = list(chain.from_iterable([_QUADS[byte] for byte in packed]))
+            if len(cells) < 4 * size:
+                raise ParseError("grid holds an invalid cell")
+            for i in range(height):
+                row = cells[i * width : (i + 1) * width]
+                if row.count(Cell.UNKNOWN) < width:
+                    grid.apply_row(i, LineState.trusted(row))
+
+        return source, PuzzleInput(meta, width, height, lines[:height], lines[height:], grid)
+
+    def _offset(self, index: int, end: bool = False) -> int:
+        """Where record `index` starts or, with `end`, where record `index - 1` ends.
+
+        Raises:
+            IndexError: When there is no such record
+            ParseError: When the index holds an offset outside the records
+        """
+        if not 0 <= index < self._count + end:
+            raise IndexError(f"Corpus index {index} out of range")
+        offset: int = _OFFSET.unpack_from(self._data, self._index + index * _OFFSET.size)[0]
+        # Records lie between the header and the index
+        if not _HEADER.size <= offset <= self._index:
+            raise ParseError(f"Corpus index holds an invalid offset {offset} for record {index}")
+        return offset
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError(f"Cannot pack negative value {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_bytes(out: bytearray, value: bytes) -> None:
+    _write_varint(out, len(value))
+    out += value
+
+
+def _read_varint(data: bytes | mmap.mmap, position: int) -> tuple[int, int]:
+    """Reads a varint at `position`, returning it and the position after it."""
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
@@ -16,3 +16,19 @@ class LineTooShortContradiction(Contradiction):
 
 class EnumerationContradiction(Contradiction):
     pass
+
+
+class ClueMismatchContradiction(Contradiction):
+    pass
+
+
+class ReachabilityContradiction(Contradiction):
+    pass
+
+
+class CachedContradiction(Contradiction):
+    pass
+
+
+class ProbeContradiction(Contradiction):
+    pass
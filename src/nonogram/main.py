@@ -1,62 +1,354 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
 from argparse import ArgumentParser
+from collections.abc import Generator, Iterable
+from contextlib import ExitStack, closing
+from dataclasses import replace
 
-from rich.console import Console
-from rich.live import Live
-
-from nonogram.parser import parse_nonogram
-from nonogram.printer import RichObserver
-from nonogram.rules.edge_rules import GlueEdgeRule, MercuryEdgeRule
-from nonogram.rules.overlap_rules import (
-    ClueOrderingConstraintRule,
-    ForcedSeparationRule,
-    LockedRunsRule,
-    MinimumLengthExpansionRule,
-    NeverBlackRule,
-    OverlapRule,
-    RunCappingRule,
-    UniqueAssignmentRule,
-)
-from nonogram.rules.simple_rules import CompleteCluesRule, FirstClueGapRule, GapTooSmallRule
-from nonogram.rules.split_rules import CompleteEdgeSplitRule
+from nonogram.exceptions import Contradiction
+from nonogram.parser import ParseError, PuzzleInput, iter_records, parse_nonogram, write_puzzle
+from nonogram.plain import format_grid
+from nonogram.solver.cache import CachedLineSolver, LineCache
 from nonogram.solver.engine import PropagationEngine
-from nonogram.solver.split_line_solver import SplitLineSolver
-
-
-def make_line_solver() -> SplitLineSolver:
-    """Build the standard rule pipeline used by both terminal and UI solvers."""
-    return SplitLineSolver(
-        rules=[
-            CompleteCluesRule(),
-            OverlapRule(),
-            GlueEdgeRule(),
-            MercuryEdgeRule(),
-            FirstClueGapRule(),
-            MinimumLengthExpansionRule(),
-            RunCappingRule(),
-            ForcedSeparationRule(),
-            UniqueAssignmentRule(),
-            ClueOrderingConstraintRule(),
-            NeverBlackRule(),
-            GapTooSmallRule(),
-            LockedRunsRule(),
-            CompleteCluesRule(),
-        ],
-        split_rules=[
-            CompleteEdgeSplitRule(),
-        ],
-    )
-
-
-def solve_nonogram(path: str) -> None:
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import ProbeResult, ProbingEngine
+from nonogram.solver.profiling import Profiler, instrument
+from nonogram.solver.search import SearchEngine, SearchResult
+
+# Rate at which live progress is redrawn; rendering costs far more than solving
+REFRESH_PER_SECOND = 10
+
+# Puzzles parsed ahead of the one being solved
+_PREFETCH = 16
+
+
+def solve_nonogram(
+    path: str,
+    complete: bool = False,
+    search: bool = False,
+    cache: str | None = None,
+    headless: bool = False,
+    profile: bool = False,
+    profile_output: str | None = None,
+    vectorised: bool = False,
+    probe: bool = False,
+    probe_workers: int | None = None,
+) -> None:
+    """Solves a puzzle file, drawing progress live unless `headless`.
+
+    Headless runs attach no observer to the engine and print the grid once at the end.
+    With `profile` (or a `profile_output` JSON path) the rules are instrumented and a
+    per-rule and per-line-length report is shown afterwards. With `vectorised`, the
+    first sweeps over every row and column are batched through NumPy. With `probe`, a
+    stalled grid is probed (see `ProbingEngine`) before any search, over `probe_workers`
+    processes when given.
+    """
     puzzle = parse_nonogram(path)
 
-    line_solver = make_line_solver()
+    line_solver: LineSolver = make_line_solver(complete=complete)
+    profiler = None
+    if profile or profile_output is not None:
+        profiler = Profiler()
+        line_solver = instrument(line_solver, profiler)
+    line_cache = None
+    if cache is not None:
+        line_cache = LineCache(path=cache)
+        line_solver = CachedLineSolver(line_solver, line_cache)
 
-    Console()
-    with Live(None, refresh_per_second=10) as live:
-        observer = RichObserver(puzzle, live)
-        engine = PropagationEngine(line_solver=line_solver, observer=observer)
+    start = time.perf_counter()
+    if vectorised:
+        # numpy is optional, so only imported when asked for
+        try:
+            from nonogram.solver.vectorised import presolve
+        except ImportError:
+            sys.exit("--vectorised needs numpy: pip install 'nonogram[fast]'")
+
+        presolve(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+    if headless:
+        engine = PropagationEngine(line_solver=line_solver)
         engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+        probed = _probe(puzzle, line_solver, probe_workers, complete) if probe else None
+        result = _search(puzzle, line_solver) if search else None
+        elapsed = time.perf_counter() - start
+        print(format_grid(puzzle))
+        state = "Solved" if puzzle.grid.is_solved() else "Stuck"
+        print(f"{state} after {engine.stats.line_solves} line solves in {elapsed:.3f}s")
+    else:
+        # rich is only loaded for the live view
+        from rich.live import Live
+
+        from nonogram.printer import RichObserver
+
+        with Live(None, refresh_per_second=REFRESH_PER_SECOND) as live:
+            observer = RichObserver(puzzle, live, refresh_per_second=REFRESH_PER_SECOND)
+            engine = PropagationEngine(line_solver=line_solver, observer=observer)
+            engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+            probed = _probe(puzzle, line_solver, probe_workers, complete) if probe else None
+            if probed is not None:
+                observer.refresh_grid()
+            result = _search(puzzle, line_solver) if search else None
+            if (result is not None and result.grid is not None) or (
+                probed is not None and probed.status == "solved"
+            ):
+                observer.on_solved()
+            observer.flush()
+
+    if probed is not None:
+        print(
+            f"Probing {probed.status}: {probed.cells} cells from {probed.probes} probes"
+            f" in {probed.elapsed:.3f}s"
+        )
+    if result is not None:
+        print(f"Search {result.status}: {result.nodes} nodes in {result.elapsed:.3f}s")
+    if line_cache is not None:
+        line_cache.close()
+        stats = line_cache.stats
+        print(f"Line cache: {stats.hits} hits, {stats.disk_hits} disk hits, {stats.misses} misses")
+    if profiler is not None:
+        if profile:
+            from rich.console import Console
+
+            from nonogram.printer import render_profile
+
+            Console().print(render_profile(profiler))
+        if profile_output is not None:
+            profiler.write(profile_output)
+
+
+def _probe(
+    puzzle: PuzzleInput, line_solver: LineSolver, workers: int | None, complete: bool
+) -> ProbeResult | None:
+    """Probes a stalled puzzle in place, across `workers` processes when given."""
+    if puzzle.grid.is_solved():
+        return None
+    if workers is None:
+        probing = ProbingEngine(PropagationEngine(line_solver=line_solver))
+        return probing.probe(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+    from nonogram.solver.parallel_probing import ParallelProbingEngine
+
+    parallel = ParallelProbingEngine(workers, complete=complete)
+    return parallel.probe(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+
+def _search(puzzle: PuzzleInput, line_solver: LineSolver) -> SearchResult | None:
+    """Searches a stalled puzzle, copying any solution into its grid."""
+    if puzzle.grid.is_solved():
+        return None
+    searcher = SearchEngine(PropagationEngine(line_solver=line_solver))
+    result = searcher.solve(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+    if result.grid is not None:
+        for i in range(puzzle.height):
+            puzzle.grid.apply_row(i, result.grid.row(i))
+    return result
+
+
+def batch_solve(
+    inputs: list[str],
+    output: str | None = None,
+    workers: int = 1,
+    complete: bool = False,
+    search: bool = False,
+    cache: str | None = None,
+) -> None:
+    from nonogram.batch import BatchOptions, iter_sources, run_batch
+
+    options = BatchOptions(complete=complete, search=search, cache=cache)
+    start = time.perf_counter()
+    if output is None:
+        counts = run_batch(iter_sources(inputs), sys.stdout, options, workers)
+    else:
+        with open(output, "w") as f:
+            counts = run_batch(iter_sources(inputs), f, options, workers)
+
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(
+        f"{total} puzzles in {elapsed:.2f}s ({total / elapsed:.1f}/s): {summary}",
+        file=sys.stderr,
+    )
+
+
+def stream_solve(
+    input: str = "-", output: str | None = None, complete: bool = False, search: bool = False
+) -> bool:
+    """Solves JSON-lines puzzles from a file or stdin as they arrive, writing each back as
+    a JSON line with its final grid, in input order.
+
+    The next puzzles are parsed on a background thread while one is solved, and at most
+    `_PREFETCH` wait parsed, so memory stays constant however long the stream is. Invalid
+    lines are reported on stderr, counted as invalid and skipped.
+
+    Returns:
+        bool: False when the stream held an invalid puzzle.
+    """
+    line_solver = make_line_solver(complete=complete)
+    counts: dict[str, int] = {}
+    start = time.perf_counter()
+    # Both files are open before the prefetch thread starts, and everything is released
+    # however the loop ends
+    with ExitStack() as stack:
+        source = sys.stdin if input == "-" else stack.enter_context(open(input))
+        sink = sys.stdout if output is None else stack.enter_context(open(output, "w"))
+        puzzles = stack.enter_context(closing(_prefetch(iter_records(source), _PREFETCH)))
+        for puzzle in puzzles:
+            if isinstance(puzzle, ParseError):
+                print(f"Skipped invalid puzzle: {puzzle}", file=sys.stderr)
+                counts["invalid"] = counts.get("invalid", 0) + 1
+                continue
+            status = "solved"
+            try:
+                PropagationEngine(line_solver=line_solver).propagate(
+                    puzzle.grid, puzzle.row_clues, puzzle.col_clues
+                )
+                if search and (result := _search(puzzle, line_solver)) is not None:
+                    status = "contradiction" if result.status == "unsolvable" else status
+                if status == "solved" and not puzzle.grid.is_solved():
+                    status = "stuck"
+            except Contradiction:
+                status = "contradiction"
+            counts[status] = counts.get(status, 0) + 1
+            write_puzzle(sink, puzzle)
+
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{total} puzzles in {elapsed:.2f}s: {summary}", file=sys.stderr)
+    return "invalid" not in counts
+
+
+def _prefetch(
+    records: Iterable[PuzzleInput | ParseError], size: int
+) -> Generator[PuzzleInput | ParseError, None, None]:
+    """Iterates `records` on a background thread, keeping at most `size` ready. Exceptions
+    raised while reading are re-raised in the consumer."""
+    ready: queue.Queue[PuzzleInput | ParseError | None] = queue.Queue(maxsize=size)
+    failure: list[Exception] = []
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            for record in records:
+                if stopped.is_set():
+                    return
+                ready.put(record)
+        except Exception as exc:
+            failure.append(exc)
+        ready.put(None)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while (item := ready.get()) is not None:
+            yield item
+    finally:
+        # A consumer that stops early must unblock the thread, so it sees it should stop
+        stopped.set()
+        while thread.is_alive():
+            try:
+                ready.get(timeout=0.01)
+            except queue.Empty:
+                pass
+    if failure:
+        raise failure[0]
+
+
+def pack_corpus(inputs: list[str], output: str) -> None:
+    """Packs JSON puzzles into a binary corpus (see `nonogram.corpus`)."""
+    from nonogram.batch import iter_sources
+    from nonogram.corpus import pack_sources
+
+    start = time.perf_counter()
+    # The output may sit among the inputs, as `pack dir/all.ngc dir/` has it
+    count, errors = pack_sources(iter_sources(inputs, exclude=[output]), output)
+    for error in errors:
+        print(f"Skipped {error}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(output)
+    print(f"Packed {count} puzzles into {output} ({size} bytes) in {elapsed:.2f}s")
+
+
+def run_benchmarks(
+    inputs: list[str],
+    sizes: list[int],
+    complete: bool = False,
+    repeat: int = 3,
+    output: str | None = None,
+    baseline: str | None = None,
+    threshold: float = 0.1,
+) -> bool:
+    """Benchmarks the examples and generated puzzles, returning False on regressions."""
+    from nonogram.batch import iter_sources
+    from nonogram.bench import compare, format_table, generate_puzzle, load_report, run_bench
+
+    puzzles = [(source, data) for source, data in iter_sources(inputs) if isinstance(data, dict)]
+    puzzles += [(f"random-{size}x{size}", generate_puzzle(size)) for size in sizes]
+    report = run_bench(puzzles, complete=complete, repeat=repeat)
+    print(format_table(report))
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is None:
+        return True
+    regressions = compare(report, load_report(baseline), threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions against {baseline}", file=sys.stderr)
+    return not regressions
+
+
+def verify_nonogram(path: str, limit: int = 2, max_nodes: int = 1_000_000) -> bool:
+    """Counts the solutions of a puzzle file up to `limit`, printing each one found and
+    streaming progress to stderr on long runs. Returns whether the solution is unique."""
+    from rich.console import Console
+
+    from nonogram.printer import render_grid
+    from nonogram.solver.counting import CountProgress, SolutionCounter
+
+    puzzle = parse_nonogram(path)
+    console = Console()
+    errors = Console(stderr=True)
+
+    def progress(p: CountProgress) -> None:
+        errors.print(f"{p.elapsed:.0f}s: {p.nodes} nodes, {p.solutions} solutions, depth {p.depth}")
+
+    counter = SolutionCounter(limit=limit, max_nodes=max_nodes, progress=progress)
+    result = counter.count(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+    for n, solution in enumerate(result.solutions, start=1):
+        console.print(f"Solution {n}:")
+        console.print(render_grid(replace(puzzle, grid=solution)))
+
+    if result.count >= 2:
+        first, second = result.solutions[:2]
+        differ = sum(
+            a != b for i in range(puzzle.height) for a, b in zip(first.row(i), second.row(i))
+        )
+        console.print(f"Solutions 1 and 2 differ in {differ} cells")
+
+    summary = f"{result.nodes} nodes in {result.elapsed:.3f}s"
+    if result.status == "budget":
+        console.print(f"Gave up after {summary}, with {result.count} solutions found")
+    elif result.count == 0:
+        console.print(f"No solution ({summary})")
+    elif result.unique:
+        console.print(f"Unique solution ({summary})")
+    elif result.status == "limit":
+        console.print(f"At least {result.count} solutions ({summary})")
+    else:
+        console.print(f"{result.count} solutions ({summary})")
+    return result.unique
 
 
 def open_ui(input_path: str | None = None) -> None:
@@ -72,6 +364,95 @@ def main() -> None:
 
     solve_parser = subparsers.add_parser("solve", help="Solve a nonogram puzzle")
     solve_parser.add_argument("input", type=str, help="Input to solve")
+    solve_parser.add_argument(
+        "--complete", action="store_true", help="Use the exact line solver instead of the rules"
+    )
+    solve_parser.add_argument(
+        "--search", action="store_true", help="Branch on guesses when propagation stalls"
+    )
+    solve_parser.add_argument(
+        "--cache", type=str, default=None, help="sqlite file to share line solutions across runs"
+    )
+    solve_parser.add_argument(
+        "--headless", action="store_true", help="Skip live progress and print the result once"
+    )
+    solve_parser.add_argument(
+        "--profile", action="store_true", help="Show per-rule timings and line latencies"
+    )
+    solve_parser.add_argument(
+        "--profile-output", type=str, default=None, help="Write the profile to a JSON file"
+    )
+    solve_parser.add_argument(
+        "--vectorised",
+        action="store_true",
+        help="Batch the first sweeps with NumPy (needs the 'fast' extra)",
+    )
+    solve_parser.add_argument(
+        "--probe", action="store_true", help="Probe cells for contradictions when stalled"
+    )
+    solve_parser.add_argument(
+        "--probe-workers", type=int, default=None, help="Probe across this many processes"
+    )
+
+    batch_parser = subparsers.add_parser("batch", help="Solve many puzzles headlessly")
+    batch_parser.add_argument(
+        "inputs", nargs="+", help="Puzzle files, directories, globs, .jsonl files or - for stdin"
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes"
+    )
+    batch_parser.add_argument("--output", type=str, default=None, help="JSONL result file")
+    batch_parser.add_argument("--complete", action="store_true", help="Use the exact line solver")
+    batch_parser.add_argument("--search", action="store_true", help="Search stalled puzzles")
+    batch_parser.add_argument("--cache", type=str, default=None, help="Shared sqlite line cache")
+
+    stream_parser = subparsers.add_parser(
+        "stream", help="Solve JSON-lines puzzles as they arrive, writing them back solved"
+    )
+    stream_parser.add_argument(
+        "input", nargs="?", default="-", help="JSON-lines file, or - for stdin (default)"
+    )
+    stream_parser.add_argument("--output", type=str, default=None, help="JSON-lines output file")
+    stream_parser.add_argument("--complete", action="store_true", help="Use the exact line solver")
+    stream_parser.add_argument("--search", action="store_true", help="Search stalled puzzles")
+
+    pack_parser = subparsers.add_parser("pack", help="Pack puzzles into a binary corpus")
+    pack_parser.add_argument("output", type=str, help="Corpus file to write, e.g. puzzles.ngc")
+    pack_parser.add_argument(
+        "inputs", nargs="+", help="Puzzle files, directories, globs, .jsonl files or - for stdin"
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the solver pipeline")
+    bench_parser.add_argument(
+        "inputs", nargs="*", default=["examples"], help="Puzzles to time (default: examples)"
+    )
+    bench_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[10, 20, 30, 40],
+        help="Sizes of generated random puzzles",
+    )
+    bench_parser.add_argument("--complete", action="store_true", help="Use the exact line solver")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="Runs per puzzle, best kept")
+    bench_parser.add_argument("--output", type=str, default=None, help="JSON result file")
+    bench_parser.add_argument(
+        "--compare", type=str, default=None, help="Baseline result file to check for regressions"
+    )
+    bench_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed relative slowdown (default 0.1)"
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="Check that a puzzle has exactly one solution"
+    )
+    verify_parser.add_argument("input", type=str, help="Puzzle to verify")
+    verify_parser.add_argument(
+        "--limit", type=int, default=2, help="Stop counting at this many solutions (default 2)"
+    )
+    verify_parser.add_argument(
+        "--max-nodes", type=int, default=1_000_000, help="Give up after this many guesses"
+    )
 
     ui_parser = subparsers.add_parser("ui", help="Open interactive UI solver")
     ui_parser.add_argument(
@@ -81,7 +462,46 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "solve":
-        solve_nonogram(args.input)
+        solve_nonogram(
+            args.input,
+            complete=args.complete,
+            search=args.search,
+            cache=args.cache,
+            headless=args.headless,
+            profile=args.profile,
+            profile_output=args.profile_output,
+            vectorised=args.vectorised,
+            probe=args.probe or args.probe_workers is not None,
+            probe_workers=args.probe_workers,
+        )
+    elif args.command == "batch":
+        batch_solve(
+            args.inputs,
+            output=args.output,
+            workers=args.workers,
+            complete=args.complete,
+            search=args.search,
+            cache=args.cache,
+        )
+    elif args.command == "stream":
+        ok = stream_solve(args.input, args.output, complete=args.complete, search=args.search)
+        sys.exit(0 if ok else 1)
+    elif args.command == "pack":
+        pack_corpus(args.inputs, args.output)
+    elif args.command == "bench":
+        ok = run_benchmarks(
+            args.inputs,
+            args.sizes,
+            complete=args.complete,
+            repeat=args.repeat,
+            output=args.output,
+            baseline=args.compare,
+            threshold=args.threshold,
+        )
+        sys.exit(0 if ok else 1)
+    elif args.command == "verify":
+        unique = verify_nonogram(args.input, limit=args.limit, max_nodes=args.max_nodes)
+        sys.exit(0 if unique else 1)
     elif args.command == "ui":
         open_ui(getattr(args, "input", None))
 
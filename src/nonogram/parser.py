@@ -14,11 +14,14 @@ Parser for custom JSON format
     "cols": <list[list[int]]>, # top to bottom
     "grid": <list[str] | None>
 }
+
+Streams of puzzles use JSON lines: one puzzle in this format per line.
 """
 
 import json
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, TextIO
 
 from nonogram.core import Clues, Grid, LineState
 
@@ -37,18 +40,79 @@ class PuzzleInput:
     grid: Grid
 
 
-def parse_nonogram(path: str) -> PuzzleInput:
+def parse_nonogram(path: str, grid_cls: type[Grid] = Grid) -> PuzzleInput:
     with open(path) as f:
         data = json.load(f)
 
+    return parse_puzzle(data, grid_cls)
+
+
+def iter_puzzles(stream: TextIO, grid_cls: type[Grid] = Grid) -> Iterator[PuzzleInput]:
+    """Parses puzzles one JSON line at a time from any text stream, such as stdin.
+
+    Each line is decoded and checked only when the next puzzle is asked for, so memory
+    stays constant however long the stream is. Blank lines are skipped.
+
+    Raises:
+        ParseError: For the first line that is not valid JSON or not a valid puzzle,
+            with its line number
+    """
+    for record in iter_records(stream, grid_cls):
+        if isinstance(record, ParseError):
+            raise record
+        yield record
+
+
+def iter_records(stream: TextIO, grid_cls: type[Grid] = Grid) -> Iterator[PuzzleInput | ParseError]:
+    """Like `iter_puzzles`, but yields a `ParseError`, with its line number, in place of
+    each invalid line and carries on with the next."""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ParseError("Record is not a JSON object")
+            puzzle = parse_puzzle(data, grid_cls)
+        except (json.JSONDecodeError, ParseError, TypeError, ValueError) as exc:
+            error = ParseError(f"Line {number}: {exc}")
+            error.__cause__ = exc
+            yield error
+            continue
+        yield puzzle
+
+
+def puzzle_to_dict(puzzle: PuzzleInput, grid: Grid) -> dict[str, Any]:
+    """Serialises a puzzle and a grid state for it to the format above."""
+    return {
+        "version": "1",
+        "meta": puzzle.meta,
+        "width": puzzle.width,
+        "height": puzzle.height,
+        "rows": [list(clues) for clues in puzzle.row_clues],
+        "cols": [list(clues) for clues in puzzle.col_clues],
+        "grid": [str(grid.row(i)) for i in range(grid.height)],
+    }
+
+
+def write_puzzle(stream: TextIO, puzzle: PuzzleInput, grid: Grid | None = None) -> None:
+    """Writes a puzzle, with `grid` or else its own grid, as one JSON line and flushes it
+    so that readers downstream see it straight away."""
+    data = puzzle_to_dict(puzzle, puzzle.grid if grid is None else grid)
+    stream.write(json.dumps(data, separators=(",", ":")) + "\n")
+    stream.flush()
+
+
+def parse_puzzle(data: dict[str, Any], grid_cls: type[Grid] = Grid) -> PuzzleInput:
+    """Builds a puzzle from an already decoded JSON object in the format above."""
     try:
         width = int(data["width"])
         height = int(data["height"])
         row_clues = [Clues(row) for row in data["rows"]]
         col_clues = [Clues(col) for col in data["cols"]]
 
-        grid = Grid(width, height)
-        if "grid" in data:
+        grid = grid_cls(width, height)
+        if data.get("grid") is not None:
             if len(data["grid"]) != height:
                 raise ParseError("Provided grid height does not match height")
             if any(len(row) != width for row in data["grid"]):
@@ -0,0 +1,38 @@
+"""Plain-text rendering for headless output, laid out like `printer.render_grid` but
+needing no rich, so headless runs never import it."""
+
+from nonogram.core import Cell
+from nonogram.parser import PuzzleInput
+
+_CELLS = {Cell.BOX: "██", Cell.CROSS: "░░", Cell.UNKNOWN: "  "}
+
+
+def format_grid(puzzle: PuzzleInput) -> str:
+    """The grid with its clues: column clues on top, row clues on the left, and the
+    cells in blocks of 5."""
+    clue_w = max((len(str(clues)) for clues in puzzle.row_clues), default=0) + 2
+    full_blocks = puzzle.width // 5
+    lines = []
+
+    depth = max((len(clues) for clues in puzzle.col_clues), default=0)
+    for level in range(depth):
+        parts = [" " * clue_w]
+        for j, clues in enumerate(puzzle.col_clues, start=1):
+            index = level - (depth - len(clues))
+            parts.append(f"{clues[index]:>2}" if index >= 0 else "  ")
+            if j % 5 == 0:
+                parts.append(" ")
+        lines.append("".join(parts))
+
+    blank = " " * clue_w + ("-" * 10 + " ") * full_blocks
+    lines.append(blank)
+    for i, clues in enumerate(puzzle.row_clues):
+        row = puzzle.grid.row(i)
+        parts = [f"{str(clues) + ' |':>{clue_w}}"]
+        for start in range(0, len(row), 5):
+            parts.extend(_CELLS[cell] for cell in row[start : start + 5])
+            parts.append("|")
+        lines.append("".join(parts))
+        if (i + 1) % 5 == 0:
+            lines.append(blank)
+    return "\n".join(lines)
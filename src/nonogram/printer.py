@@ -2,6 +2,7 @@ import time
 from typing import Any
 
 from rich.align import Align
+from rich.console import Group
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
@@ -11,19 +12,38 @@ from rich.text import Text
 from nonogram.core import Cell, Clues, Grid, LineState
 from nonogram.parser import PuzzleInput
 from nonogram.solver.observer import EngineObserver
+from nonogram.solver.profiling import Profiler
 
 
 class RichObserver(EngineObserver):
-    def __init__(self, puzzle: PuzzleInput, live: Live, show_clues: bool = True) -> None:
+    """Draws solver progress into a rich `Live` display.
+
+    Engine callbacks only update counters; the grid and layout are rebuilt at most
+    `refresh_per_second` times a second, since rendering costs far more than a line
+    solve. Call `flush()` to draw the latest state regardless.
+    """
+
+    def __init__(
+        self,
+        puzzle: PuzzleInput,
+        live: Live,
+        show_clues: bool = True,
+        refresh_per_second: float = 10,
+    ) -> None:
         self.image_only = not show_clues
 
         self.start = time.time()
         self.rows = 0
         self.cols = 0
+        self.last_step: tuple[str, int] | None = None
 
         self.puzzle = puzzle
         self.live = live
 
+        self.interval = 1 / refresh_per_second
+        self._last_render = 0.0
+        self._grid_dirty = False
+
         self.layout = Layout()
         self.layout.split(
             Layout(name="header", size=3),
@@ -55,7 +75,15 @@ class RichObserver(EngineObserver):
         )
         self.live.update(self.layout)
 
+    def on_solved(self) -> None:
+        self._grid_dirty = True
+        self.flush()
+
     def on_line_update(self, kind: str, index: int, old: LineState, new: LineState) -> None:
+        self._grid_dirty = True
+        self._maybe_flush()
+
+    def refresh_grid(self) -> None:
         self.layout["grid"].update(
             Align(
                 render_grid(self.puzzle, image_only=self.image_only),
@@ -63,22 +91,36 @@ class RichObserver(EngineObserver):
                 vertical="middle",
             )
         )
-        self.on_update()
+        self._grid_dirty = False
 
     def on_step(self, kind: str, index: int) -> None:
         if kind == "row":
             self.rows += 1
         else:
             self.cols += 1
-        self.layout["footer"].update(
-            Panel(
-                Text(
-                    f"Processed: {self.rows} rows, {self.cols} "
-                    + f"columns. Looking at {kind} {index + 1}..."
+        self.last_step = (kind, index)
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        """Renders the current grid, counters and progress immediately."""
+        if self._grid_dirty:
+            self.refresh_grid()
+        if self.last_step is not None:
+            kind, index = self.last_step
+            self.layout["footer"].update(
+                Panel(
+                    Text(
+                        f"Processed: {self.rows} rows, {self.cols} "
+                        + f"columns. Looking at {kind} {index + 1}..."
+                    )
                 )
             )
-        )
         self.on_update()
+        self._last_render = time.perf_counter()
+
+    def _maybe_flush(self) -> None:
+        if time.perf_counter() - self._last_render >= self.interval:
+            self.flush()
 
 
 def render_cell(cell: Cell) -> Text:
@@ -159,3 +201,50 @@ def get_grid_stats(grid: Grid) -> tuple[int, int, float]:
     complete = sum(cell != Cell.UNKNOWN for row in grid.cells for cell in row)
     total = grid.width * grid.height
     return complete, total, round(complete / total * 100, 1)
+
+
+def render_profile(profiler: Profiler) -> Group:
+    """Per-rule timings (slowest first) and line-solve latencies by line length."""
+    rules = Table(title="Rules")
+    width = max((len(name) for name in profiler.rules), default=4)
+    rules.add_column("Rule", min_width=width, no_wrap=True)
+    for header in ("Calls", "Time ms", "% time", "us/call", "Cells", "Contra"):
+        rules.add_column(header, justify="right")
+
+    total = sum(profile.time for name, profile in profiler.rules.items() if "." not in name)
+    for name, profile in sorted(profiler.rules.items(), key=lambda item: -item[1].time):
+        share = f"{profile.time / total * 100:.1f}" if total and "." not in name else ""
+        per_call = profile.time / profile.calls * 1e6 if profile.calls else 0.0
+        rules.add_row(
+            name,
+            str(profile.calls),
+            f"{profile.time * 1000:.1f}",
+            share,
+            f"{per_call:.1f}",
+            str(profile.cells),
+            str(profile.contradictions),
+        )
+
+    lines = Table(title="Line solves")
+    for header in ("Length", "Solves", "Mean us", "Max us"):
+        lines.add_column(header, justify="right")
+    lines.add_column("Latency, 1us to 2^n us", no_wrap=True)
+    buckets = max((len(hist.buckets) for hist in profiler.lines.values()), default=0)
+    for length, hist in sorted(profiler.lines.items()):
+        lines.add_row(
+            str(length),
+            str(hist.count),
+            f"{hist.total / hist.count * 1e6:.0f}",
+            f"{hist.max * 1e6:.0f}",
+            _sparkline(hist.buckets).ljust(buckets),
+        )
+
+    return Group(rules, lines)
+
+
+def _sparkline(counts: list[int]) -> str:
+    bars = " ▁▂▃▄▅▆▇█"
+    peak = max(counts, default=0)
+    if not peak:
+        return ""
+    return "".join(bars[(count * (len(bars) - 1) + peak - 1) // peak] for count in counts)
@@ -1,9 +1,23 @@
 from nonogram.core import Clues, LineState
 
+# Rule costs, cheapest first
+COSTS = ("LOW", "MEDIUM", "HIGH")
+
 
 class Rule:
     cost = "MEDIUM"
 
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        """Cheap precondition checked before `apply`. False only when applying the rule
+        could not change the line.
+        """
+        return True
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         """Apply a rule that updates a line.
@@ -19,6 +33,10 @@ class Rule:
 
 
 class SplitRule:
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
     def split(self, clues: Clues, state: LineState) -> tuple[tuple[Clues, LineState], ...]:
         """Apply a splitting rule that reduces the state into segments
 
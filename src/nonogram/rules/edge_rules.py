@@ -9,8 +9,7 @@ def mirror_rule(
     rule: Callable[[Clues, LineState], LineState],
 ) -> Callable[[Clues, LineState], LineState]:
     def mirrored(clues: Clues, state: LineState) -> LineState:
-        new = rule(Clues(clues[::-1]), LineState(state[::-1]))
-        return LineState(new[::-1])
+        return rule(clues.reversed(), state.reversed()).reversed()
 
     return mirrored
 
@@ -59,9 +58,9 @@ class CompleteEdgeRule(EdgeRule):
             raise CellConflictContradiction()
         state[j + 1] = Cell.CROSS
 
-        return LineState(
+        return LineState.trusted(
             state[: j + 1]
-            + CompleteEdgeRule.apply_left_to_right(Clues(clues[1:]), LineState(state[j + 1 :]))
+            + CompleteEdgeRule.apply_left_to_right(clues.sliced(1), state.sliced(j + 1))
         )
 
 
@@ -105,8 +104,8 @@ class GlueEdgeRule(EdgeRule):
             return state
 
         state[i] = Cell.CROSS
-        return LineState(
-            state[:i] + GlueEdgeRule.apply_left_to_right(Clues(clues[1:]), LineState(state[i:]))
+        return LineState.trusted(
+            state[:i] + GlueEdgeRule.apply_left_to_right(clues.sliced(1), state.sliced(i))
         )
 
 
@@ -40,7 +40,7 @@ def enumerate_possibilities(clues: Clues, state: LineState) -> tuple[LineState,
         return (state,)
 
     options = []
-    clue, *rest = list(clues)
+    clue, rest = clues[0], clues.sliced(1)
     min_rest = sum(rest) + len(rest)
 
     for start in range(len(state) - clue - min_rest + 1):
@@ -51,8 +51,8 @@ def enumerate_possibilities(clues: Clues, state: LineState) -> tuple[LineState,
         if any(state[i] not in (Cell.UNKNOWN, prefix[i]) for i in range(len(prefix))):
             continue
 
-        for tail in enumerate_possibilities(Clues(rest), LineState(state[len(prefix) :])):
-            options.append(LineState(prefix + list(tail)))
+        for tail in enumerate_possibilities(rest, state.sliced(len(prefix))):
+            options.append(LineState.trusted(prefix + tail))
 
     return tuple(options)
 
@@ -61,7 +61,12 @@ def line_complexity(clues: Clues, length: int) -> float:
     k = len(clues)
     if k == 0:
         return 1
-    slack = length - (sum(clues) + k - 1)
+    slack = line_slack(clues, length)
     if slack < 0:
         return float("inf")
     return comb(slack + k, k)
+
+
+def line_slack(clues: Clues, length: int) -> int:
+    """Number of cells the clues can shift by when packed as tightly as possible."""
+    return length - (sum(clues) + len(clues) - 1)
@@ -1,7 +1,7 @@
 from nonogram.core import Cell, Clues, LineState
-from nonogram.exceptions import CellConflictContradiction, LineTooShortContradiction
+from nonogram.exceptions import CellConflictContradiction
 from nonogram.rules import Rule
-from nonogram.rules.simple_rules import black_runs
+from nonogram.rules.placement import analyse
 
 
 class OverlapRule(Rule):
@@ -13,8 +13,8 @@ class OverlapRule(Rule):
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
         new = LineState(state)
 
@@ -39,8 +39,8 @@ class NeverBlackRule(Rule):
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
         coverage = [False] * len(state)
 
@@ -64,6 +64,10 @@ class MinimumLengthExpansionRule(Rule):
     """For a black run bounded on one side, expands it to the minimum clue length
     that could own it. If only one clue can own it, places crosses at both endpoints."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return bool(analyse(clues, state).runs)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         n = len(state)
@@ -72,12 +76,10 @@ class MinimumLengthExpansionRule(Rule):
         if not clues or state.is_complete():
             return new_state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
-
-        runs = black_runs(state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
-        for run_start, run_len in runs:
+        for run_start, run_len in analysis.runs:
             left_bounded = run_start == 0 or state[run_start - 1] == Cell.CROSS
             right_end = run_start + run_len
             right_bounded = right_end == n or state[right_end] == Cell.CROSS
@@ -96,7 +98,11 @@ class MinimumLengthExpansionRule(Rule):
             if not possible_clues:
                 continue
 
-            required_length = min(clue for clue in possible_clues if clue >= run_len)
+            long_enough = [clue for clue in possible_clues if clue >= run_len]
+            if not long_enough:
+                raise CellConflictContradiction("Black run is longer than any owning clue")
+
+            required_length = min(long_enough)
             start = run_start if left_bounded else run_start + run_len - required_length
             for i in range(start, start + required_length):
                 if i >= n or new_state[i] == Cell.CROSS:
@@ -116,27 +122,23 @@ class RunCappingRule(Rule):
     """Caps a black run with crosses when it has reached the maximum length any owning clue
     could have. The adjacent cells on both sides cannot be black, so they become crosses."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return bool(analyse(clues, state).runs)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
 
         new = LineState(state)
         n = len(state)
 
-        for run_start, run_len in black_runs(state):
+        for (run_start, run_len), candidates in zip(analysis.runs, analysis.candidates):
             run_end = run_start + run_len
-
-            possible_clues = [
-                clues[i]
-                for i in range(len(clues))
-                if earliest[i] <= run_start
-                and latest[i] + clues[i] >= run_end
-                and clues[i] >= run_len
-            ]
+            possible_clues = [clues[i] for i in candidates]
 
             if not possible_clues:
                 continue
@@ -158,16 +160,20 @@ class ForcedSeparationRule(Rule):
     """When two BOX runs are separated by a single unknown that no clue can span across,
     that unknown must be a cross separating two distinct clues."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return len(analyse(clues, state).runs) >= 2
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
         new = LineState(state)
-        runs = black_runs(state)
+        runs = analysis.runs
 
         for (a_start, a_len), (b_start, b_len) in zip(runs, runs[1:]):
             gap_start = a_start + a_len
@@ -193,27 +199,23 @@ class UniqueAssignmentRule(Rule):
     tighten that clue's window and marks additional cells as black from the overlap.
     This is strictly stronger than OverlapRule for the uniquely-assigned clue."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return bool(analyse(clues, state).runs)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
         new = LineState(state)
 
-        for run_start, run_len in black_runs(state):
+        for (run_start, run_len), candidates in zip(analysis.runs, analysis.candidates):
             run_end = run_start + run_len
 
-            candidates = [
-                i
-                for i in range(len(clues))
-                if earliest[i] <= run_start
-                and latest[i] + clues[i] >= run_end
-                and clues[i] >= run_len
-            ]
-
             if len(candidates) != 1:
                 continue
 
@@ -238,28 +240,24 @@ class ClueOrderingConstraintRule(Rule):
     by ordering: clue k-1 must end before the run, and clue k+1 must start after it.
     Tightening these windows can expose additional overlap cells for the neighbours."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return bool(analyse(clues, state).runs)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
             return state
 
-        earliest = earliest_starts(clues, state)
-        latest = latest_starts(clues, state)
+        analysis = analyse(clues, state)
+        earliest, latest = analysis.earliest, analysis.latest
 
         new = LineState(state)
         n = len(state)
 
-        for run_start, run_len in black_runs(state):
+        for (run_start, run_len), candidates in zip(analysis.runs, analysis.candidates):
             run_end = run_start + run_len
 
-            candidates = [
-                i
-                for i in range(len(clues))
-                if earliest[i] <= run_start
-                and latest[i] + clues[i] >= run_end
-                and clues[i] >= run_len
-            ]
-
             if len(candidates) != 1:
                 continue
 
@@ -304,12 +302,16 @@ class LockedRunsRule(Rule):
     cells beyond the run in either direction, clipped to the run's segment (the region
     between the nearest confirmed crosses or line edges)."""
 
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return len(analyse(clues, state).runs) == len(clues)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
             return state
 
-        runs = black_runs(state)
+        runs = analyse(clues, state).runs
 
         if len(runs) != len(clues):
             return state
@@ -357,60 +359,3 @@ class LockedRunsRule(Rule):
                 new[j] = Cell.CROSS
 
         return new
-
-
-def earliest_starts(clues: Clues, state: LineState) -> list[int]:
-    """Returns the indices of the earliest start to each clue.
-    Ignores some aspects of current cells, other than completely impossible
-
-    Raises:
-        LineTooShortContradiction: When unable to find a place for all clues
-
-    Returns:
-        list[int]: A list of earliest indices for the left of each clue
-    """
-
-    starts = []
-    pos = 0
-
-    for clue in clues:
-        while True:
-            if pos + clue > len(state):
-                raise LineTooShortContradiction()
-
-            if (
-                any(state[i] == Cell.CROSS for i in range(pos, pos + clue))
-                or (pos > 0 and state[pos - 1] == Cell.BOX)
-                or (pos + clue < len(state) and state[pos + clue] == Cell.BOX)
-            ):
-                pos += 1
-                continue
-
-            # Accept placement
-            break
-
-        starts.append(pos)
-        pos += clue + 1
-
-    return starts
-
-
-def latest_starts(clues: Clues, state: LineState) -> list[int]:
-    """Returns the indices of the latest start to each clue.
-    Ignores some aspects of current cells, other than completely impossible
-
-    Raises:
-        LineTooShortContradiction: When unable to find a place for all clues
-
-    Returns:
-        list[int]: A list of latest indices for the left of each clue
-    """
-    n = len(state)
-
-    # Reverse everything
-    rev_state = LineState(state[::-1])
-    rev_clues = Clues(clues[::-1])
-    rev_starts = earliest_starts(rev_clues, rev_state)
-
-    # Map reversed starts back to original indices
-    return [n - (start + clue) for start, clue in zip(rev_starts, rev_clues)][::-1]
@@ -0,0 +1,204 @@
+from collections.abc import Sequence
+from contextvars import ContextVar, Token
+from functools import cached_property
+
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import LineTooShortContradiction
+
+
+class LineAnalysis:
+    """Facts about one (clues, line) pair that several rules need: the placement bounds
+    of each clue, the black runs and which clues could own each run.
+
+    Each fact is computed on first use, so a rule only pays for what it reads. Use
+    `analyse` to share one analysis between rules applied to an unchanged line.
+    """
+
+    def __init__(self, clues: Clues, state: LineState) -> None:
+        self.clues = clues
+        # A copy, so the facts still describe this line if the caller's is edited later
+        self.state = LineState.trusted(state)
+
+    @cached_property
+    def earliest(self) -> list[int]:
+        return earliest_starts(self.clues, self.state)
+
+    @cached_property
+    def latest(self) -> list[int]:
+        return latest_starts(self.clues, self.state)
+
+    @cached_property
+    def runs(self) -> list[tuple[int, int]]:
+        return black_runs(self.state)
+
+    @cached_property
+    def candidates(self) -> list[list[int]]:
+        """For each black run, the indices of the clues that could cover it entirely."""
+        clues, earliest, latest = self.clues, self.earliest, self.latest
+        return [
+            [
+                i
+                for i, clue in enumerate(clues)
+                if earliest[i] <= run_start
+                and latest[i] + clue >= run_start + run_len
+                and clue >= run_len
+            ]
+            for run_start, run_len in self.runs
+        ]
+
+
+class AnalysisCache:
+    """Keeps the most recent `LineAnalysis`, reusing it while neither the clues nor any
+    cell have changed since it was made.
+
+    Each line solver owns one and makes it current, with `with cache:`, while it applies
+    its rules, so `analyse` shares analyses between them. The current cache is held in a
+    context variable, so solvers in different threads never see each other's.
+    """
+
+    def __init__(self) -> None:
+        self.last: LineAnalysis | None = None
+        self._tokens: list[Token[AnalysisCache | None]] = []
+
+    def analyse(self, clues: Clues, state: LineState) -> LineAnalysis:
+        last = self.last
+        if (
+            last is not None
+            and (last.clues is clues or last.clues == clues)
+            and last.state == state
+        ):
+            return last
+
+        self.last = last = LineAnalysis(clues, state)
+        return last
+
+    def __enter__(self) -> "AnalysisCache":
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        _current.reset(self._tokens.pop())
+
+
+_current: ContextVar[AnalysisCache | None] = ContextVar("analysis_cache", default=None)
+
+_BOX = str(Cell.BOX)
+_CROSS = str(Cell.CROSS)
+
+
+def analyse(clues: Clues, state: LineState) -> LineAnalysis:
+    """Returns the analysis of a line, from the current `AnalysisCache` when a line solver
+    has made one current, and computed afresh otherwise."""
+    cache = _current.get()
+    if cache is None:
+        return LineAnalysis(clues, state)
+    return cache.analyse(clues, state)
+
+
+def black_runs(state: LineState) -> list[tuple[int, int]]:
+    """Returns a list of the sequences of black cells.
+
+    Args:
+        state (LineView): A given line state
+
+    Returns:
+        list[tuple[int, int]]: A list of (start index, length) pairs
+    """
+    runs = []
+    pos = 0
+    n = len(state)
+
+    while pos < n:
+        if state[pos] == Cell.BOX:
+            start = pos
+            while pos < n and state[pos] == Cell.BOX:
+                pos += 1
+            runs.append((start, pos - start))
+        else:
+            pos += 1
+
+    return runs
+
+
+def earliest_starts(clues: Clues, state: LineState) -> list[int]:
+    """Returns the index of the leftmost start of each clue over all valid placements,
+    where every clue avoids crosses and every box is covered by some clue.
+
+    Raises:
+        LineTooShortContradiction: When unable to find a valid placement of all clues
+
+    Returns:
+        list[int]: A list of earliest indices for the left of each clue
+    """
+    return _earliest(clues, "".join(state))
+
+
+def latest_starts(clues: Clues, state: LineState) -> list[int]:
+    """Returns the index of the rightmost start of each clue over all valid placements.
+
+    Raises:
+        LineTooShortContradiction: When unable to find a valid placement of all clues
+
+    Returns:
+        list[int]: A list of latest indices for the left of each clue
+    """
+    n = len(state)
+
+    # Place the reversed clues on the reversed line, then map the starts back
+    rev_clues = clues[::-1]
+    rev_starts = _earliest(rev_clues, "".join(state)[::-1])
+    return [n - (start + clue) for start, clue in zip(rev_starts, rev_clues)][::-1]
+
+
+def _earliest(clues: Sequence[int], line: str) -> list[int]:
+    """Packs the clues as far left as possible, then pulls earlier clues right whenever a
+    box would be left uncovered between (or after) them.
+
+    Starts only ever move right. A cross inside a clue's window is skipped in one jump to
+    just past it, and uncovered boxes are found with a single search of the gap, so a line
+    without stray boxes is placed in one left-to-right sweep.
+    """
+    n = len(line)
+    k = len(clues)
+    find, rfind = line.find, line.rfind
+
+    starts = [0] * k
+    j = 0
+    lower = 0
+    while j < k:
+        clue = clues[j]
+        pos = lower
+        while True:
+            end = pos + clue
+            if end > n:
+                raise LineTooShortContradiction()
+            cross = rfind(_CROSS, pos, end)
+            if cross >= 0:
+                pos = cross + 1
+            elif end < n and line[end] == _BOX:
+                pos += 1
+            else:
+                break
+
+        # A box between the previous clue and this one must belong to the previous clue
+        gap = starts[j - 1] + clues[j - 1] + 1 if j else 0
+        box = find(_BOX, gap, pos)
+        if box >= 0:
+            if j == 0:
+                raise LineTooShortContradiction()
+            j -= 1
+            lower = box - clues[j] + 1
+            continue
+
+        starts[j] = pos
+        j += 1
+        if j < k:
+            lower = max(starts[j], pos + clue + 1)
+        else:
+            # A box after the last clue: the last clue must reach it
+            box = find(_BOX, pos + clue)
+            if box >= 0:
+                j -= 1
+                lower = box - clue + 1
+
+    return starts
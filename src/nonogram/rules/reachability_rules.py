@@ -0,0 +1,118 @@
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import ReachabilityContradiction
+from nonogram.rules import Rule
+
+
+class ReachabilityRule(Rule):
+    """Complete line solver. Finds every cell that is black (or white) in all valid clue
+    placements, the same result as EnumerationRule, in O(n·k) without enumerating."""
+
+    @staticmethod
+    def apply(clues: Clues, state: LineState) -> LineState:
+        if state.is_complete():
+            return state
+        return reachability_solve(clues, state)
+
+
+def reachability_solve(clues: Clues, state: LineState) -> LineState:
+    """Solves a line exactly using forward/backward reachability tables.
+
+    `fwd[j][i]` is whether the first `i` cells can hold the first `j` clues, with cell
+    `i - 1` either a cross or the last cell of clue `j - 1`. `bwd[j][i]` is whether the
+    cells from `i` onwards can hold clues `j..k-1`. A cell can be white if some `j` splits
+    the line around it, and black if some placement of a clue covering it is reachable
+    from both sides.
+
+    Raises:
+        ReachabilityContradiction: When no valid placement of the clues exists
+
+    Returns:
+        LineState: The line with every forced cell filled in
+    """
+    blocks = [clue for clue in clues if clue]
+    n = len(state)
+    k = len(blocks)
+
+    not_box = [cell != Cell.BOX for cell in state]
+
+    # crosses[i] is the number of crosses in state[:i]
+    crosses = [0] * (n + 1)
+    for i, cell in enumerate(state):
+        crosses[i + 1] = crosses[i] + (cell == Cell.CROSS)
+
+    def fits(start: int, clue: int) -> bool:
+        return crosses[start + clue] == crosses[start]
+
+    fwd = [[False] * (n + 1) for _ in range(k + 1)]
+    fwd[0][0] = True
+    for i in range(1, n + 1):
+        fwd[0][i] = fwd[0][i - 1] and not_box[i - 1]
+    for j in range(1, k + 1):
+        clue = blocks[j - 1]
+        prev, row = fwd[j - 1], fwd[j]
+        for i in range(clue, n + 1):
+            if row[i - 1] and not_box[i - 1]:
+                row[i] = True
+                continue
+            start = i - clue
+            if not fits(start, clue):
+                continue
+            row[i] = prev[0] if start == 0 else prev[start - 1] and not_box[start - 1]
+
+    if not fwd[k][n]:
+        raise ReachabilityContradiction(f"Cannot place {clues} in '{state}'")
+
+    bwd = [[False] * (n + 1) for _ in range(k + 1)]
+    bwd[k][n] = True
+    for i in range(n - 1, -1, -1):
+        bwd[k][i] = bwd[k][i + 1] and not_box[i]
+    for j in range(k - 1, -1, -1):
+        clue = blocks[j]
+        nxt, row = bwd[j + 1], bwd[j]
+        for i in range(n - clue, -1, -1):
+            if row[i + 1] and not_box[i]:
+                row[i] = True
+                continue
+            end = i + clue
+            if not fits(i, clue):
+                continue
+            row[i] = nxt[n] if end == n else nxt[end + 1] and not_box[end]
+
+    can_cross = [False] * n
+    for i in range(n):
+        if not_box[i]:
+            can_cross[i] = any(fwd[j][i] and bwd[j][i + 1] for j in range(k + 1))
+
+    # Difference array of cells covered by at least one valid clue placement
+    cover = [0] * (n + 1)
+    for j, clue in enumerate(blocks):
+        before, after = fwd[j], bwd[j + 1]
+        for start in range(n - clue + 1):
+            end = start + clue
+            if not fits(start, clue):
+                continue
+            if start == 0:
+                if not before[0]:
+                    continue
+            elif not (not_box[start - 1] and before[start - 1]):
+                continue
+            if end == n:
+                if not after[n]:
+                    continue
+            elif not (not_box[end] and after[end + 1]):
+                continue
+            cover[start] += 1
+            cover[end] -= 1
+
+    new = LineState(state)
+    covered = 0
+    for i in range(n):
+        covered += cover[i]
+        if new[i] != Cell.UNKNOWN:
+            continue
+        if not covered:
+            new[i] = Cell.CROSS
+        elif not can_cross[i]:
+            new[i] = Cell.BOX
+
+    return new
@@ -1,11 +1,18 @@
 from nonogram.core import Cell, Clues, LineState
 from nonogram.rules import Rule
+from nonogram.rules.placement import analyse, black_runs
 
 
 class CompleteCluesRule(Rule):
     """If the existing black runs already match the clues exactly, fill all remaining
     unknowns with crosses. Early termination when all clues are successfully placed."""
 
+    cost = "LOW"
+
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return len(analyse(clues, state).runs) == len(clues)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         black = [length for _, length in black_runs(state)]
@@ -26,6 +33,12 @@ class FirstClueGapRule(Rule):
     If a black run matches the clue length with exactly one empty cell of space, that cell
     must be a cross."""
 
+    cost = "LOW"
+
+    @staticmethod
+    def applies(clues: Clues, state: LineState) -> bool:
+        return bool(analyse(clues, state).runs)
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         runs = black_runs(state)
@@ -54,6 +67,8 @@ class GapTooSmallRule(Rule):
     """Marks a contiguous gap of unknowns as crosses when it is too short to fit any clue.
     A gap bounded by crosses (or edges) that is smaller than the minimum clue must be empty."""
 
+    cost = "LOW"
+
     @staticmethod
     def apply(clues: Clues, state: LineState) -> LineState:
         if not clues or state.is_complete():
@@ -84,26 +99,6 @@ class GapTooSmallRule(Rule):
         return new
 
 
-def black_runs(state: LineState) -> list[tuple[int, int]]:
-    """Returns a list of the sequences of black cells.
-
-    Args:
-        state (LineView): A given line state
-
-    Returns:
-        list[tuple[int, int]]: A list of (start index, length) pairs
-    """
-    runs = []
-    pos = 0
-    n = len(state)
-
-    while pos < n:
-        if state[pos] == Cell.BOX:
-            start = pos
-            while pos < n and state[pos] == Cell.BOX:
-                pos += 1
-            runs.append((start, pos - start))
-        else:
-            pos += 1
-
-    return runs
+def line_matches(clues: Clues, state: LineState) -> bool:
+    """Whether the black runs of a line are exactly its (non-zero) clues."""
+    return [length for _, length in black_runs(state)] == [clue for clue in clues if clue]
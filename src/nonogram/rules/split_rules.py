@@ -1,6 +1,6 @@
 from nonogram.core import Cell, Clues, LineState
 from nonogram.rules import SplitRule
-from nonogram.rules.overlap_rules import black_runs, earliest_starts, latest_starts
+from nonogram.rules.placement import earliest_starts, latest_starts
 
 
 class CompleteEdgeSplitRule(SplitRule):
@@ -21,13 +21,13 @@ class CompleteEdgeSplitRule(SplitRule):
             splits.append((left_clues, left_state))
 
         right_clues, right_state, final_clues, final_state = consume_complete_prefix(
-            Clues(remaining_clues[::-1]), LineState(remaining_state[::-1])
+            remaining_clues.reversed(), remaining_state.reversed()
         )
 
-        splits.append((Clues(final_clues[::-1]), LineState(final_state[::-1])))
+        splits.append((final_clues.reversed(), final_state.reversed()))
 
         if right_state:
-            splits.append((Clues(right_clues[::-1]), LineState(right_state[::-1])))
+            splits.append((right_clues.reversed(), right_state.reversed()))
 
         return tuple(splits)
 
@@ -35,7 +35,7 @@ class CompleteEdgeSplitRule(SplitRule):
         merged: list[Cell] = []
         for segment in segments:
             merged.extend(segment)
-        return LineState(merged)
+        return LineState.trusted(merged)
 
 
 class CrossBoundedSplitRule(SplitRule):
@@ -71,21 +71,11 @@ class CrossBoundedSplitRule(SplitRule):
             if j + 1 < len(clues) and earliest[j + 1] <= p:
                 continue
 
-            # Guard: each side must have enough clues to cover its BOX runs.
-            # latest_starts can return positions that leave BOX cells uncovered,
-            # so a split where one side has more BOX runs than allocated clues is invalid.
-            left_state = LineState(state[: p + 1])
-            right_state = LineState(state[p + 1 :])
-            if len(black_runs(left_state)) > j + 1:
-                continue
-            if len(black_runs(right_state)) > len(clues) - j - 1:
-                continue
-
             # Clues 0..j go left (state[:p+1] includes the cross as a boundary),
             # clues j+1..n-1 go right.
             return (
-                (Clues(clues[: j + 1]), left_state),
-                (Clues(clues[j + 1 :]), right_state),
+                (clues.sliced(stop=j + 1), state.sliced(stop=p + 1)),
+                (clues.sliced(j + 1), state.sliced(p + 1)),
             )
 
         return ((clues, state),)
@@ -94,7 +84,7 @@ class CrossBoundedSplitRule(SplitRule):
         merged: list[Cell] = []
         for segment in segments:
             merged.extend(segment)
-        return LineState(merged)
+        return LineState.trusted(merged)
 
 
 def consume_complete_prefix(
@@ -108,10 +98,9 @@ def consume_complete_prefix(
     """
     i = 0
     n = len(state)
-    consumed_clues = []
-    remaining_clues = list(clues)
+    consumed = 0
 
-    while remaining_clues:
+    while consumed < len(clues):
         while i < n and state[i] == Cell.CROSS:
             i += 1
 
@@ -123,16 +112,16 @@ def consume_complete_prefix(
             i += 1
         black_length = i - black_start
 
-        if black_length != remaining_clues[0] or i >= n or state[i] != Cell.CROSS:
+        if black_length != clues[consumed] or i >= n or state[i] != Cell.CROSS:
             i = black_start
             break
 
-        consumed_clues.append(remaining_clues.pop(0))
+        consumed += 1
         i += 1
 
     return (
-        Clues(consumed_clues),
-        LineState(state[:i]),
-        Clues(remaining_clues),
-        LineState(state[i:]),
+        clues.sliced(stop=consumed),
+        state.sliced(stop=i),
+        clues.sliced(consumed),
+        state.sliced(i),
     )
@@ -0,0 +1,239 @@
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from nonogram.core import Clues, LineState, decode_line, encode_line
+from nonogram.exceptions import CachedContradiction, Contradiction
+from nonogram.solver.line_solver import LineSolver
+
+# Stored value for a line the wrapped solver rejected
+_CONTRADICTION = b""
+
+POLICIES = ("lru", "lfu")
+
+# Part of every default namespace. Bump it whenever a rule's deductions or the stored
+# format change, so results a persistent cache holds from older code are never reused
+CACHE_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+def line_key(clues: Clues, state: LineState) -> bytes:
+    """Compact key for a (clues, line) pair: varint clues and length, then the line's
+    box and cross bitmasks."""
+    n = len(state)
+    boxes, crosses = encode_line(state)
+    size = (n + 7) // 8
+    return (
+        _varints([len(clues), *clues, n])
+        + boxes.to_bytes(size, "little")
+        + crosses.to_bytes(size, "little")
+    )
+
+
+def _varints(values: list[int]) -> bytes:
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def _pack_line(state: LineState) -> bytes:
+    boxes, crosses = encode_line(state)
+    size = (len(state) + 7) // 8
+    return b"\x01" + boxes.to_bytes(size, "little") + crosses.to_bytes(size, "little")
+
+
+def _unpack_line(value: bytes, length: int) -> LineState:
+    size = (length + 7) // 8
+    boxes = int.from_bytes(value[1 : 1 + size], "little")
+    crosses = int.from_bytes(value[1 + size :], "little")
+    return decode_line(boxes, crosses, length)
+
+
+class LineCache:
+    """Bounded map from line keys to solved lines, optionally backed by a sqlite file.
+
+    The in-memory layer evicts by `policy` ("lru" or "lfu") once `max_entries` is
+    reached. With a `path`, misses fall through to the file, and new results are written
+    to it in batches of `flush_every`, so the file can be shared between runs and worker
+    processes. Call `close()` (or use it as a context manager) to flush pending writes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        policy: str = "lru",
+        path: str | None = None,
+        flush_every: int = 1_000,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy `{policy}`")
+        self.max_entries = max_entries
+        self.policy = policy
+        self.stats = CacheStats()
+
+        self._entries: dict[bytes, bytes] = {}
+        # lru: keys by recency, least recent first
+        self._recency: OrderedDict[bytes, None] = OrderedDict()
+        # lfu: use count per key, and keys per count (oldest first) for O(1) eviction
+        self._counts: dict[bytes, int] = {}
+        self._by_count: dict[int, OrderedDict[bytes, None]] = {}
+        self._min_count = 0
+
+        self._db: sqlite3.Connection | None = None
+        self._pending: list[tuple[bytes, bytes]] = []
+        self.flush_every = flush_every
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS lines (key BLOB PRIMARY KEY, value BLOB NOT NULL)"
+                " WITHOUT ROWID"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "LineCache":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def get(self, key: bytes) -> bytes | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            self._touch(key)
+            return value
+
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM lines WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                stored: bytes = row[0]
+                self.stats.disk_hits += 1
+                self._store(key, stored)
+                return stored
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._store(key, value)
+        if self._db is not None:
+            self._pending.append((key, value))
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._db is None or not self._pending:
+            return
+        self._db.executemany("INSERT OR IGNORE INTO lines VALUES (?, ?)", self._pending)
+        self._db.commit()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _store(self, key: bytes, value: bytes) -> None:
+        if key in self._entries:
+            self._entries[key] = value
+            self._touch(key)
+            return
+        if self.max_entries <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+
+        self._entries[key] = value
+        if self.policy == "lru":
+            self._recency[key] = None
+        else:
+            self._counts[key] = 1
+            self._by_count.setdefault(1, OrderedDict())[key] = None
+            self._min_count = 1
+
+    def _touch(self, key: bytes) -> None:
+        if self.policy == "lru":
+            self._recency.move_to_end(key)
+            return
+
+        count = self._counts[key]
+        bucket = self._by_count[count]
+        del bucket[key]
+        if not bucket:
+            del self._by_count[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._by_count.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _evict(self) -> None:
+        if self.policy == "lru":
+            key, _ = self._recency.popitem(last=False)
+        else:
+            bucket = self._by_count[self._min_count]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._by_count[self._min_count]
+            del self._counts[key]
+        del self._entries[key]
+        self.stats.evictions += 1
+
+
+class CachedLineSolver(LineSolver):
+    """Memoises another line solver's results, including contradictions, in a `LineCache`.
+
+    Keys are prefixed with `namespace` so that caches shared between differently
+    configured solvers do not mix; by default it is derived from `CACHE_VERSION` and
+    the wrapped solver's rules and split rules.
+    """
+
+    def __init__(
+        self, line_solver: LineSolver, cache: LineCache, namespace: str | None = None
+    ) -> None:
+        super().__init__(line_solver.rules)
+        self.line_solver = line_solver
+        self.cache = cache
+        if namespace is None:
+            split_rules = getattr(line_solver, "split_rules", [])
+            rules = ",".join(rule.name for rule in line_solver.rules)
+            splits = ",".join(rule.name for rule in split_rules)
+            namespace = f"v{CACHE_VERSION}:{rules}|{splits}"
+        self._prefix = _varints([len(namespace.encode())]) + namespace.encode()
+
+    def solve(self, clues: Clues, state: LineState) -> LineState:
+        key = self._prefix + line_key(clues, state)
+        value = self.cache.get(key)
+        if value is not None:
+            if value == _CONTRADICTION:
+                raise CachedContradiction(f"Cached contradiction for {clues}: '{state}'")
+            return _unpack_line(value, len(state))
+
+        try:
+            solved = self.line_solver.solve(clues, state)
+        except Contradiction:
+            self.cache.put(key, _CONTRADICTION)
+            raise
+
+        self.cache.put(key, _pack_line(solved))
+        return solved
@@ -0,0 +1,127 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.exceptions import Contradiction
+from nonogram.solver.cache import CachedLineSolver, LineCache
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.search import choose_cell, satisfies
+
+
+@dataclass
+class CountProgress:
+    nodes: int
+    solutions: int
+    depth: int  # guesses on the branch being explored
+    elapsed: float
+
+
+@dataclass
+class CountResult:
+    status: str  # "exhausted", "limit" or "budget"
+    solutions: list[Grid] = field(default_factory=list)
+    nodes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Solutions found: all of them when `exhausted`, otherwise a lower bound."""
+        return len(self.solutions)
+
+    @property
+    def unique(self) -> bool:
+        return self.status == "exhausted" and self.count == 1
+
+
+def memoised_propagation() -> PropagationEngine:
+    """Propagation with the exact line solver, memoising every line result. Sibling
+    branches share most of their lines, so a search revisits the same lines often."""
+    return PropagationEngine(CachedLineSolver(make_line_solver(complete=True), LineCache()))
+
+
+class SolutionCounter:
+    """Counts the solutions of a puzzle, up to `limit`, by propagation and branching.
+
+    Like `SearchEngine`, it branches on the first unknown of the tightest line and
+    propagates each guess, but it carries on after a solution until `limit` are found
+    or every branch is exhausted. A `limit` of 2 is enough to decide uniqueness.
+    `progress`, when given, is called with a `CountProgress` every `progress_every`
+    seconds.
+    """
+
+    def __init__(
+        self,
+        propagation: PropagationEngine | None = None,
+        limit: int = 2,
+        max_nodes: int = 1_000_000,
+        progress: Callable[[CountProgress], None] | None = None,
+        progress_every: float = 1.0,
+    ) -> None:
+        self.propagation = propagation or memoised_propagation()
+        self.limit = limit
+        self.max_nodes = max_nodes
+        self.progress = progress
+        self.progress_every = progress_every
+
+    def count(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> CountResult:
+        """Counts solutions reachable from the grid, leaving it untouched.
+
+        Args:
+            grid (Grid): The starting grid
+            row_clues (list[LineClue]): The clues of each row
+            col_clues (list[LineClue]): The clues of each column
+
+        Returns:
+            CountResult: The outcome, with every solution found.
+        """
+        start = time.perf_counter()
+        result = CountResult("exhausted")
+        next_report = start + self.progress_every
+
+        root = grid.copy()
+        try:
+            self.propagation.propagate(root, row_clues, col_clues)
+        except Contradiction:
+            result.elapsed = time.perf_counter() - start
+            return result
+
+        stack = [(root, 0)]
+        while stack:
+            current, depth = stack.pop()
+            if current.is_solved():
+                if satisfies(current, row_clues, col_clues):
+                    result.solutions.append(current)
+                    if result.count >= self.limit:
+                        result.status = "limit"
+                        break
+                continue
+
+            if result.nodes >= self.max_nodes:
+                result.status = "budget"
+                break
+            if self.progress is not None and time.perf_counter() >= next_report:
+                now = time.perf_counter()
+                next_report = now + self.progress_every
+                self.progress(CountProgress(result.nodes, result.count, depth, now - start))
+
+            i, j = choose_cell(current)
+            children = []
+            for value in (Cell.BOX, Cell.CROSS):
+                result.nodes += 1
+                child = current.copy()
+                child.set(i, j, value)
+                try:
+                    self.propagation.propagate(
+                        child, row_clues, col_clues, lines=[("row", i), ("col", j)]
+                    )
+                except Contradiction:
+                    continue
+                children.append((child, depth + 1))
+
+            # Push in reverse so the BOX branch is explored first
+            stack.extend(reversed(children))
+
+        result.elapsed = time.perf_counter() - start
+        return result
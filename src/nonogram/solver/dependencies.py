@@ -0,0 +1,75 @@
+from collections.abc import Iterable
+
+Position = tuple[int, int]
+
+_NONE: frozenset[Position] = frozenset()
+
+
+class DependencyRecord:
+    """Remembers which user-set cells each deduction relies on, so that changing one
+    retracts only the deductions that followed from it.
+
+    Every known cell carries a label: the user-set cells it follows from. A user-set
+    cell is labelled with itself, and a deduction with the union of the labels of the
+    cells it was deduced from. Deductions with an empty label follow from the clues
+    alone, so no edit ever needs to retract them. Changes are logged like the grid's
+    trail, so `rollback` undoes them alongside it.
+    """
+
+    def __init__(self) -> None:
+        self.labels: dict[Position, frozenset[Position]] = {}
+        # User-set cell -> cells labelled with it. Only ever added to; entries that no
+        # longer match `labels` are filtered out when read
+        self.dependents: dict[Position, set[Position]] = {}
+        self._log: list[tuple[Position, frozenset[Position] | None]] = []
+
+    def label(self, cells: Iterable[Position]) -> frozenset[Position]:
+        """The user-set cells that any of `cells` relies on."""
+        labels = self.labels
+        found: set[Position] = set()
+        for cell in cells:
+            found.update(labels.get(cell, _NONE))
+        return frozenset(found) if found else _NONE
+
+    def record(self, cells: Iterable[Position], antecedents: Iterable[Position]) -> None:
+        """Records that `cells` were deduced from the known `antecedents`."""
+        label = self.label(antecedents)
+        cells = list(cells)
+        for cell in cells:
+            self._set(cell, label)
+        for assumption in label:
+            self.dependents.setdefault(assumption, set()).update(cells)
+
+    def assume(self, cell: Position) -> None:
+        """Records a value set by the user."""
+        self._set(cell, frozenset([cell]))
+
+    def affected(self, cell: Position) -> set[Position]:
+        """Every deduction that relies on the user-set `cell`."""
+        labels = self.labels
+        return {
+            dependent
+            for dependent in self.dependents.get(cell, ())
+            if dependent != cell and cell in labels.get(dependent, _NONE)
+        }
+
+    def mark(self) -> int:
+        return len(self._log)
+
+    def rollback(self, mark: int) -> None:
+        """Restores the labels recorded before `mark`."""
+        for cell, previous in reversed(self._log[mark:]):
+            if previous is None:
+                del self.labels[cell]
+            else:
+                self.labels[cell] = previous
+        del self._log[mark:]
+
+    def clear(self) -> None:
+        self.labels.clear()
+        self.dependents.clear()
+        self._log.clear()
+
+    def _set(self, cell: Position, label: frozenset[Position]) -> None:
+        self._log.append((cell, self.labels.get(cell)))
+        self.labels[cell] = label
@@ -1,42 +1,83 @@
-from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from nonogram.core import Clues, Grid
+from nonogram.exceptions import ClueMismatchContradiction
+from nonogram.rules.simple_rules import line_matches
 from nonogram.solver.line_solver import LineSolver
 from nonogram.solver.observer import EngineObserver
+from nonogram.solver.priority import LinePriority
+from nonogram.solver.scheduler import Line, LineScheduler, all_lines
+
+
+@dataclass
+class EngineStats:
+    line_solves: int = 0
+    line_updates: int = 0
+    cells_changed: int = 0
 
 
 class PropagationEngine:
-    def __init__(self, line_solver: LineSolver, observer: EngineObserver | None = None) -> None:
+    def __init__(
+        self,
+        line_solver: LineSolver,
+        observer: EngineObserver | None = None,
+        strategy: str = "lifo",
+    ) -> None:
         self.line_solver = line_solver
         self.observer = observer
+        self.strategy = strategy
+        self.stats = EngineStats()
 
-    def propagate(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> bool:
+    def propagate(
+        self,
+        grid: Grid,
+        row_clues: list[Clues],
+        col_clues: list[Clues],
+        lines: Iterable[Line] | None = None,
+    ) -> bool:
         """Propagates a grid as far as possible using the engine's line solver.
+        Counters for the run are left in `self.stats`.
 
         Args:
             grid (Grid): The current grid
             row_clues (list[LineClue]): The clues of each row
             col_clues (list[LineClue]): The clues of each column
+            lines (Iterable[Line] | None): Lines to start from, all lines when omitted.
 
         Returns:
             bool: Whether or not the grid was successfully updated.
         """
-        queue = deque(
-            [("row", i) for i in range(grid.height)] + [("col", j) for j in range(grid.width)]
-        )
+        self.stats = stats = EngineStats()
+        start = all_lines(grid.height, grid.width) if lines is None else list(lines)
+        queue = LineScheduler(self.strategy)
+        priority = None
+        if self.strategy == "priority":
+            priority = LinePriority(grid, row_clues, col_clues)
+            for pending in start:
+                queue.push(pending, priority.seed(pending))
+        else:
+            queue.extend(start)
 
         changed = False
+        observer = self.observer
+        solve = self.line_solver.solve
 
         while queue:
-            kind, index = queue.popleft()
+            kind, index = queue.pop()
 
             clues = row_clues[index] if kind == "row" else col_clues[index]
             line = grid.row(index) if kind == "row" else grid.col(index)
 
-            if self.observer:
-                self.observer.on_step(kind, index)
+            if observer is not None:
+                observer.on_step(kind, index)
 
-            new_line = self.line_solver.solve(clues, line)
+            stats.line_solves += 1
+            new_line = solve(clues, line)
+            if new_line.is_complete() and not line_matches(clues, new_line):
+                raise ClueMismatchContradiction(
+                    f"{kind} {index} '{new_line}' does not match {clues}"
+                )
             if (
                 grid.apply_row(index, new_line)
                 if kind == "row"
@@ -46,16 +87,19 @@ class PropagationEngine:
                 updated_indices = [
                     i for i, (old, new) in enumerate(zip(line, new_line)) if old != new
                 ]
+                stats.line_updates += 1
+                stats.cells_changed += len(updated_indices)
+                if priority:
+                    priority.solved((kind, index), len(updated_indices))
                 for updated_i in updated_indices:
                     new_kind = "col" if kind == "row" else "row"
-                    if (new_kind, updated_i) in queue:
-                        queue.remove((new_kind, updated_i))
-                    queue.appendleft((new_kind, updated_i))
+                    crossing = (new_kind, updated_i)
+                    queue.push(crossing, priority.crossed(crossing) if priority else 1.0)
 
-                if self.observer:
-                    self.observer.on_line_update(kind, index, line, new_line)
+                if observer is not None:
+                    observer.on_line_update(kind, index, line, new_line)
 
-        if grid.is_solved() and self.observer:
-            self.observer.on_solved()
+        if observer is not None and grid.is_solved():
+            observer.on_solved()
 
         return changed
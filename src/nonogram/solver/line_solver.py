@@ -1,10 +1,35 @@
-from nonogram.core import Clues, LineState
-from nonogram.rules import Rule
+from dataclasses import dataclass
+
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import ClueMismatchContradiction
+from nonogram.rules import COSTS, Rule
+from nonogram.rules.placement import AnalysisCache
+from nonogram.rules.simple_rules import line_matches
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    fires: int = 0  # calls that changed the line
+    skips: int = 0  # times the rule's precondition ruled it out
 
 
 class LineSolver:
+    """Applies rules to a line until none of them can deduce anything more.
+
+    Rules run cheapest first, following `Rule.cost`. Rules other than "HIGH" cost are
+    cycled until every one has seen the current line without changing it, and only then
+    are the "HIGH" cost rules tried, dropping back to the cheap ones after any change.
+    Per-rule counters, keyed by rule name, are kept in `stats`. Rules share line
+    analyses through the solver's own `AnalysisCache`.
+    """
+
     def __init__(self, rules: list[Rule]):
         self.rules = rules
+        self.stats: dict[str, RuleStats] = {}
+        self._scheduled: list[Rule] = []
+        self._tiers: list[list[tuple[Rule, RuleStats]]] = []
+        self._analyses = AnalysisCache()
 
     def solve(self, clues: Clues, state: LineState) -> LineState:
         """Solves as much of the given state as possible with the clues.
@@ -16,12 +41,71 @@ class LineSolver:
         Returns:
             LineView: The (potentially) updated line state.
         """
-        prev: LineState | None = None
+        tiers = self._schedule()
         curr = LineState(state)
 
-        while curr != prev:
-            prev = curr
-            for rule in self.rules:
-                curr = rule.apply(clues, curr)
+        level = 0
+        with self._analyses:
+            while level < len(tiers) and Cell.UNKNOWN in curr:
+                curr, changed = _fixpoint(tiers[level], clues, curr)
+                level = 0 if changed and level else level + 1
 
         return curr
+
+    def _schedule(self) -> list[list[tuple[Rule, RuleStats]]]:
+        # Rebuilt whenever the rule list is replaced or edited in place
+        if self._scheduled != self.rules:
+            self._scheduled = list(self.rules)
+            ordered = sorted(self.rules, key=lambda rule: COSTS.index(rule.cost))
+            entries = [(rule, self.stats.setdefault(rule.name, RuleStats())) for rule in ordered]
+            cheap = [entry for entry in entries if entry[0].cost != "HIGH"]
+            expensive = [entry for entry in entries if entry[0].cost == "HIGH"]
+            self._tiers = [tier for tier in (cheap, expensive) if tier]
+        return self._tiers
+
+
+def _fixpoint(
+    rules: list[tuple[Rule, RuleStats]], clues: Clues, curr: LineState
+) -> tuple[LineState, bool]:
+    """Cycles through the rules until each has seen the line without changing it.
+
+    Rules read the whole line rather than declaring the cells they depend on, so any
+    change can enable any rule: after one, every rule runs again. A rule that completes
+    the line ends the cycle, once the line is checked against the clues, since later
+    rules would otherwise have been the ones to reject it.
+
+    Raises:
+        ClueMismatchContradiction: When a rule completes the line and it breaks the clues
+
+    Returns:
+        tuple[LineState, bool]: The updated line, and whether any rule changed it.
+    """
+    changed = False
+    unchanged = 0
+    i = 0
+    while unchanged < len(rules):
+        rule, stats = rules[i]
+        i = (i + 1) % len(rules)
+
+        if not rule.applies(clues, curr):
+            stats.skips += 1
+            unchanged += 1
+            continue
+
+        stats.calls += 1
+        new = rule.apply(clues, curr)
+        if new is curr or new == curr:
+            unchanged += 1
+            continue
+
+        stats.fires += 1
+        curr = new
+        changed = True
+        if Cell.UNKNOWN not in curr:
+            if not line_matches(clues, curr):
+                raise ClueMismatchContradiction(f"'{curr}' does not match {clues}")
+            break
+        # Every rule, including this one, has to see the new line
+        unchanged = 0
+
+    return curr, changed
@@ -0,0 +1,169 @@
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.exceptions import ProbeContradiction
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import (
+    Consequences,
+    ProbeResult,
+    forced_values,
+    keep,
+    probe_order,
+    try_value,
+)
+
+Snapshot = list[str]  # one string of cell characters per row
+
+
+class ParallelProbingEngine:
+    """Failed-literal probing (see `ProbingEngine`) fanned out over worker processes.
+
+    Cells are probed in waves of two per worker, in probe order, all against the same
+    snapshot of the grid: each worker receives the snapshot as one string per row, builds
+    a grid from it once, and probes its share of the wave on that grid's trail. Every
+    value the wave proves follows from the snapshot, so once the whole wave is back they
+    are merged, in probe order, written and propagated once. The next wave starts from
+    the new grid, or from the same one when nothing was proved.
+
+    The grid reached is the same for any worker count, and the same as `ProbingEngine`'s,
+    as long as the time budget is not hit. With one worker, cells are probed on the grid
+    itself.
+    """
+
+    def __init__(
+        self, workers: int, complete: bool = False, time_budget: float | None = 5.0
+    ) -> None:
+        self.workers = workers
+        self.complete = complete
+        self.time_budget = time_budget
+        self.wave = 2 * workers
+
+    def probe(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> ProbeResult:
+        """Probes the grid in place, keeping every value it can prove.
+
+        Raises:
+            ProbeContradiction: When both values of some cell lead to a contradiction, or
+                two cells of a wave prove opposite values
+
+        Returns:
+            ProbeResult: The outcome, with the number of cells fixed.
+        """
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        propagation = PropagationEngine(make_line_solver(complete=self.complete))
+        unknown = _unknown(grid)
+        untrailed = grid.trail is None
+        probes = 0
+        status = "stuck"
+
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(row_clues, col_clues, self.complete),
+            )
+        try:
+            progress = True
+            while progress and not grid.is_solved():
+                progress = False
+                cells = probe_order(grid)
+                snapshot = None if pool is None else [str(grid.row(i)) for i in range(grid.height)]
+                for at in range(0, len(cells), self.wave):
+                    if deadline is not None and time.perf_counter() > deadline:
+                        status = "budget"
+                        break
+                    wave = cells[at : at + self.wave]
+                    if pool is None:
+                        results = _probe_cells(propagation, row_clues, col_clues, grid, wave)
+                    else:
+                        assert snapshot is not None
+                        results = _probe_wave(pool, self.workers, snapshot, wave)
+                    probes += 2 * len(wave)
+
+                    merged = merge(results)
+                    if merged:
+                        keep(propagation, grid, row_clues, col_clues, merged)
+                        progress = True
+                        break
+                if status == "budget":
+                    break
+
+            if grid.is_solved():
+                status = "solved"
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if untrailed:
+                grid.trail = None
+
+        return ProbeResult(status, unknown - _unknown(grid), probes, time.perf_counter() - start)
+
+
+def merge(results: list[Consequences]) -> Consequences:
+    """Merges the values proved by probes of the same grid, in probe order.
+
+    Raises:
+        ProbeContradiction: When two probes prove opposite values for a cell
+    """
+    merged: Consequences = {}
+    for kept in results:
+        for cell, value in kept.items():
+            if merged.setdefault(cell, value) != value:
+                raise ProbeContradiction(f"Cell {cell} is proved both box and cross")
+    return merged
+
+
+def _probe_wave(
+    pool: Executor, workers: int, snapshot: Snapshot, wave: list[tuple[int, int]]
+) -> list[Consequences]:
+    """Probes the cells of a wave on the pool, one share per worker, returning what each
+    cell proves in probe order."""
+    shares = [wave[k::workers] for k in range(workers) if wave[k::workers]]
+    futures = [pool.submit(_probe_worker, snapshot, share) for share in shares]
+    done = [future.result() for future in futures]
+    # Undo the interleaving of the shares
+    results: list[Consequences] = [{}] * len(wave)
+    for k, share_results in enumerate(done):
+        results[k :: len(shares)] = share_results
+    return results
+
+
+def _unknown(grid: Grid) -> int:
+    return sum(grid.row(i).count(Cell.UNKNOWN) for i in range(grid.height))
+
+
+def _probe_cells(
+    propagation: PropagationEngine,
+    row_clues: list[Clues],
+    col_clues: list[Clues],
+    grid: Grid,
+    cells: list[tuple[int, int]],
+) -> list[Consequences]:
+    """Probes each cell on the grid's trail, leaving the grid as it was, and returns the
+    values each proves."""
+    results = []
+    for i, j in cells:
+        box = try_value(propagation, grid, row_clues, col_clues, i, j, Cell.BOX)
+        cross = try_value(propagation, grid, row_clues, col_clues, i, j, Cell.CROSS)
+        results.append(forced_values(i, j, box, cross))
+    return results
+
+
+_worker: tuple[PropagationEngine, list[Clues], list[Clues]] | None = None
+
+
+def _init_worker(row_clues: list[Clues], col_clues: list[Clues], complete: bool) -> None:
+    """Receives the clues and builds the line solver once per process, not per wave."""
+    global _worker
+    _worker = (PropagationEngine(make_line_solver(complete=complete)), row_clues, col_clues)
+
+
+def _probe_worker(snapshot: Snapshot, cells: list[tuple[int, int]]) -> list[Consequences]:
+    assert _worker is not None
+    propagation, row_clues, col_clues = _worker
+    grid = Grid(len(snapshot[0]), len(snapshot))
+    grid.cells = [[Cell(c) for c in row] for row in snapshot]
+    return _probe_cells(propagation, row_clues, col_clues, grid, cells)
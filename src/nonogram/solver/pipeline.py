@@ -0,0 +1,50 @@
+"""The standard line-solving pipeline, with no dependencies outside the package, so
+headless solving, batch workers and the UI all build it without loading rich or textual."""
+
+from nonogram.rules.edge_rules import GlueEdgeRule, MercuryEdgeRule
+from nonogram.rules.overlap_rules import (
+    ClueOrderingConstraintRule,
+    ForcedSeparationRule,
+    LockedRunsRule,
+    MinimumLengthExpansionRule,
+    NeverBlackRule,
+    OverlapRule,
+    RunCappingRule,
+    UniqueAssignmentRule,
+)
+from nonogram.rules.reachability_rules import ReachabilityRule
+from nonogram.rules.simple_rules import CompleteCluesRule, FirstClueGapRule, GapTooSmallRule
+from nonogram.rules.split_rules import CompleteEdgeSplitRule
+from nonogram.solver.split_line_solver import SplitLineSolver
+
+
+def make_line_solver(complete: bool = False) -> SplitLineSolver:
+    """Build the standard rule pipeline used by both terminal and UI solvers.
+
+    With `complete`, the heuristic rules are replaced by the exact reachability solver,
+    which deduces everything a line allows in a single O(n·k) pass.
+    """
+    if complete:
+        return SplitLineSolver(rules=[ReachabilityRule()], split_rules=[])
+
+    return SplitLineSolver(
+        rules=[
+            CompleteCluesRule(),
+            OverlapRule(),
+            GlueEdgeRule(),
+            MercuryEdgeRule(),
+            FirstClueGapRule(),
+            MinimumLengthExpansionRule(),
+            RunCappingRule(),
+            ForcedSeparationRule(),
+            UniqueAssignmentRule(),
+            ClueOrderingConstraintRule(),
+            NeverBlackRule(),
+            GapTooSmallRule(),
+            LockedRunsRule(),
+            CompleteCluesRule(),
+        ],
+        split_rules=[
+            CompleteEdgeSplitRule(),
+        ],
+    )
@@ -0,0 +1,47 @@
+from nonogram.core import Cell, Clues, Grid
+from nonogram.rules.enumeration_rules import line_slack
+from nonogram.solver.scheduler import Line, all_lines
+
+
+class LinePriority:
+    """Scores lines for the `priority` scheduling strategy.
+
+    A line starts with its expected overlap yield: the fraction of its cells that the
+    overlap technique alone would fix on an empty line. Each cell later fixed by a
+    crossing line adds `1 / ((slack + 1) * (unknown + 1))`, so new information counts
+    most on tight lines and on lines that are nearly finished. Scores are only updated
+    when a line is pushed, the scheduler keeps the rest lazily.
+    """
+
+    def __init__(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> None:
+        self.slack: dict[Line, int] = {}
+        self.unknown: dict[Line, int] = {}
+        self.yields: dict[Line, float] = {}
+
+        for kind, index in all_lines(grid.height, grid.width):
+            clues = row_clues[index] if kind == "row" else col_clues[index]
+            line = grid.row(index) if kind == "row" else grid.col(index)
+            blocks = Clues([clue for clue in clues if clue])
+            # Clues too long for the line give a negative slack; the line solver reports
+            # the contradiction, and the weights below must stay positive until it does
+            slack = max(line_slack(blocks, len(line)), 0) if blocks else 0
+
+            self.slack[(kind, index)] = slack
+            self.unknown[(kind, index)] = line.count(Cell.UNKNOWN)
+            if not blocks:
+                self.yields[(kind, index)] = 1.0
+            else:
+                fixed = sum(max(0, clue - slack) for clue in blocks)
+                self.yields[(kind, index)] = fixed / len(line) if len(line) else 0.0
+
+    def seed(self, line: Line) -> float:
+        return self.yields[line]
+
+    def solved(self, line: Line, changed: int) -> None:
+        """Records that solving `line` itself fixed `changed` of its cells."""
+        self.unknown[line] -= changed
+
+    def crossed(self, line: Line) -> float:
+        """Records one cell of `line` fixed from a crossing line, returning its push weight."""
+        self.unknown[line] -= 1
+        return 1 / ((self.slack[line] + 1) * (self.unknown[line] + 1))
@@ -0,0 +1,186 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.exceptions import Contradiction, ProbeContradiction
+from nonogram.solver.engine import PropagationEngine
+
+Probe = tuple[int, int, Cell]
+Consequences = dict[tuple[int, int], Cell]
+
+
+@dataclass
+class ProbeResult:
+    status: str  # "solved", "stuck", "budget" or "stopped"
+    cells: int  # cells fixed by probing, including what they propagated to
+    probes: int  # tentative values propagated
+    elapsed: float
+
+
+class ProbingEngine:
+    """Failed-literal probing for grids that propagation alone leaves stuck.
+
+    Each unknown cell is tentatively set to BOX and to CROSS and propagated on the grid's
+    change trail, then rolled back. When one value ends in a `Contradiction` the other is
+    kept, and cells that both values agree on are kept too; every kept value is then
+    propagated for real. Cells on the tightest lines (fewest unknowns across their row and
+    column) are probed first.
+
+    While the grid is unchanged, a value implied by an earlier probe that held is not
+    probed itself: its consequences are a subset of that probe's, so it cannot fail.
+    Passes over the unknown cells repeat until one deduces nothing or `time_budget`
+    seconds run out. `should_stop`, when given, is checked before each cell, and ends
+    probing early once it returns True; values already proved are kept.
+    """
+
+    def __init__(
+        self,
+        propagation: PropagationEngine,
+        time_budget: float | None = 5.0,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> None:
+        self.propagation = propagation
+        self.time_budget = time_budget
+        self.should_stop = should_stop
+
+    def probe(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> ProbeResult:
+        """Probes the grid in place, keeping every value it can prove.
+
+        Args:
+            grid (Grid): A grid, usually one propagation has stalled on
+            row_clues (list[LineClue]): The clues of each row
+            col_clues (list[LineClue]): The clues of each column
+
+        Raises:
+            ProbeContradiction: When both values of some cell lead to a contradiction
+
+        Returns:
+            ProbeResult: The outcome, with the number of cells fixed.
+        """
+        start = time.perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        untrailed = grid.trail is None
+        origin = grid.mark()
+        probes = 0
+
+        def result(status: str) -> ProbeResult:
+            assert grid.trail is not None
+            cells = len(grid.trail) - origin
+            return ProbeResult(status, cells, probes, time.perf_counter() - start)
+
+        try:
+            progress = True
+            while progress:
+                progress = False
+                # Values known to hold without a contradiction on the current grid
+                implied: set[Probe] = set()
+
+                for i, j in probe_order(grid):
+                    if grid.get(i, j) != Cell.UNKNOWN:
+                        continue
+                    if deadline is not None and time.perf_counter() > deadline:
+                        return result("budget")
+                    if self.should_stop is not None and self.should_stop():
+                        return result("stopped")
+
+                    outcomes: list[Consequences | None] = []
+                    for value in (Cell.BOX, Cell.CROSS):
+                        if (i, j, value) in implied:
+                            outcomes.append({})
+                            continue
+                        probes += 1
+                        consequences = try_value(
+                            self.propagation, grid, row_clues, col_clues, i, j, value
+                        )
+                        if consequences is not None:
+                            implied.update((ci, cj, v) for (ci, cj), v in consequences.items())
+                        outcomes.append(consequences)
+
+                    kept = forced_values(i, j, *outcomes)
+                    if not kept:
+                        continue
+
+                    keep(self.propagation, grid, row_clues, col_clues, kept)
+                    progress = True
+                    implied.clear()
+                    if grid.is_solved():
+                        return result("solved")
+
+            return result("solved" if grid.is_solved() else "stuck")
+        finally:
+            # Even after a contradiction, a grid that came in untrailed leaves untrailed
+            if untrailed:
+                grid.trail = None
+
+
+def try_value(
+    propagation: PropagationEngine,
+    grid: Grid,
+    row_clues: list[Clues],
+    col_clues: list[Clues],
+    i: int,
+    j: int,
+    value: Cell,
+) -> Consequences | None:
+    """Propagates one tentative value on the grid's trail and rolls it back.
+
+    Returns:
+        Consequences | None: Every cell the value fixed, or None when it led to a
+        contradiction.
+    """
+    mark = grid.mark()
+    try:
+        grid.set(i, j, value)
+        propagation.propagate(grid, row_clues, col_clues, lines=[("row", i), ("col", j)])
+        assert grid.trail is not None
+        return {(ci, cj): grid.get(ci, cj) for ci, cj, _ in grid.trail[mark:]}
+    except Contradiction:
+        return None
+    finally:
+        grid.rollback(mark)
+
+
+def forced_values(
+    i: int, j: int, box: Consequences | None, cross: Consequences | None
+) -> Consequences:
+    """What the two probes of cell (i, j) prove: the value whose opposite failed, or else
+    the cells both values agree on.
+
+    Raises:
+        ProbeContradiction: When both values failed
+    """
+    if box is None and cross is None:
+        raise ProbeContradiction(f"Cell ({i}, {j}) can be neither box nor cross")
+    if box is None:
+        return {(i, j): Cell.CROSS}
+    if cross is None:
+        return {(i, j): Cell.BOX}
+    return {cell: value for cell, value in box.items() if cross.get(cell) == value}
+
+
+def keep(
+    propagation: PropagationEngine,
+    grid: Grid,
+    row_clues: list[Clues],
+    col_clues: list[Clues],
+    kept: Consequences,
+) -> None:
+    """Writes proven values into the grid and propagates from their lines."""
+    for (i, j), value in kept.items():
+        grid.set(i, j, value)
+    lines = {("row", i) for i, _ in kept} | {("col", j) for _, j in kept}
+    propagation.propagate(grid, row_clues, col_clues, lines=sorted(lines))
+
+
+def probe_order(grid: Grid) -> list[tuple[int, int]]:
+    """Unknown cells, those whose row and column have the fewest unknowns left first."""
+    rows = [grid.row(i).count(Cell.UNKNOWN) for i in range(grid.height)]
+    cols = [grid.col(j).count(Cell.UNKNOWN) for j in range(grid.width)]
+    cells = [
+        (i, j)
+        for i in range(grid.height)
+        for j in range(grid.width)
+        if grid.get(i, j) == Cell.UNKNOWN
+    ]
+    return sorted(cells, key=lambda cell: rows[cell[0]] + cols[cell[1]])
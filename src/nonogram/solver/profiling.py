@@ -0,0 +1,165 @@
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from nonogram.core import Clues, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.rules import Rule, SplitRule
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.split_line_solver import SplitLineSolver
+
+
+@dataclass
+class RuleProfile:
+    calls: int = 0
+    time: float = 0.0  # seconds
+    cells: int = 0  # cells deduced
+    contradictions: int = 0
+
+
+@dataclass
+class LatencyHistogram:
+    """Line-solve latencies, bucketed by powers of two microseconds: bucket `b` counts
+    solves that took less than 2**b microseconds (and at least half that)."""
+
+    count: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0  # seconds
+    buckets: list[int] = field(default_factory=list)
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        bucket = int(elapsed * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+
+class Profiler:
+    """Collects per-rule and per-line-length timings from an instrumented line solver.
+
+    Nothing is recorded unless a solver is wrapped with `instrument`, so an unprofiled
+    solve runs exactly the same code as before.
+    """
+
+    def __init__(self) -> None:
+        self.rules: dict[str, RuleProfile] = {}
+        self.lines: dict[int, LatencyHistogram] = {}
+
+    def rule(self, name: str) -> RuleProfile:
+        return self.rules.setdefault(name, RuleProfile())
+
+    def line(self, length: int) -> LatencyHistogram:
+        return self.lines.setdefault(length, LatencyHistogram())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rules": {name: asdict(profile) for name, profile in self.rules.items()},
+            "lines": {str(length): asdict(hist) for length, hist in sorted(self.lines.items())},
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class ProfiledRule(Rule):
+    """Times another rule and counts the cells it deduces and contradictions it raises."""
+
+    def __init__(self, rule: Rule, profile: RuleProfile) -> None:
+        self.rule = rule
+        self.profile = profile
+        self.cost = rule.cost
+
+    @property
+    def name(self) -> str:
+        return self.rule.name
+
+    def applies(self, clues: Clues, state: LineState) -> bool:  # type: ignore[override]
+        return self.rule.applies(clues, state)
+
+    def apply(self, clues: Clues, state: LineState) -> LineState:  # type: ignore[override]
+        profile = self.profile
+        profile.calls += 1
+        start = time.perf_counter()
+        try:
+            new = self.rule.apply(clues, state)
+        except Contradiction:
+            profile.contradictions += 1
+            raise
+        finally:
+            profile.time += time.perf_counter() - start
+
+        if new is not state:
+            profile.cells += sum(old != cell for old, cell in zip(state, new))
+        return new
+
+
+class ProfiledSplitRule(SplitRule):
+    """Times the split and merge of another split rule, as `<name>.split`/`.merge`."""
+
+    def __init__(self, rule: SplitRule, profiler: Profiler) -> None:
+        self.rule = rule
+        self.profiler = profiler
+
+    @property
+    def name(self) -> str:
+        return self.rule.name
+
+    def new(self) -> "ProfiledSplitRule":  # type: ignore[override]
+        return ProfiledSplitRule(self.rule.new(), self.profiler)
+
+    def split(self, clues: Clues, state: LineState) -> tuple[tuple[Clues, LineState], ...]:
+        profile = self.profiler.rule(f"{self.name}.split")
+        profile.calls += 1
+        start = time.perf_counter()
+        try:
+            return self.rule.split(clues, state)
+        except Contradiction:
+            profile.contradictions += 1
+            raise
+        finally:
+            profile.time += time.perf_counter() - start
+
+    def merge(self, segments: tuple[LineState, ...]) -> LineState:
+        profile = self.profiler.rule(f"{self.name}.merge")
+        profile.calls += 1
+        start = time.perf_counter()
+        try:
+            return self.rule.merge(segments)
+        except Contradiction:
+            profile.contradictions += 1
+            raise
+        finally:
+            profile.time += time.perf_counter() - start
+
+
+class ProfiledLineSolver(LineSolver):
+    """Records the latency of each top-level line solve by line length."""
+
+    def __init__(self, line_solver: LineSolver, profiler: Profiler) -> None:
+        super().__init__(line_solver.rules)
+        self.line_solver = line_solver
+        self.profiler = profiler
+
+    def solve(self, clues: Clues, state: LineState) -> LineState:
+        histogram = self.profiler.line(len(state))
+        start = time.perf_counter()
+        try:
+            return self.line_solver.solve(clues, state)
+        finally:
+            histogram.add(time.perf_counter() - start)
+
+
+def instrument(line_solver: LineSolver, profiler: Profiler) -> ProfiledLineSolver:
+    """Wraps the solver's rules (and split rules) in place and returns a solver that
+    also records line latencies, all reporting to `profiler`."""
+    line_solver.rules = [ProfiledRule(rule, profiler.rule(rule.name)) for rule in line_solver.rules]
+    if isinstance(line_solver, SplitLineSolver):
+        line_solver.split_rules = [
+            ProfiledSplitRule(rule, profiler) for rule in line_solver.split_rules
+        ]
+    return ProfiledLineSolver(line_solver, profiler)
@@ -0,0 +1,104 @@
+import heapq
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from itertools import count
+
+Line = tuple[str, int]
+
+STRATEGIES = ("lifo", "fifo", "priority")
+
+
+def all_lines(height: int, width: int) -> list[Line]:
+    """Every row then every column, the order a fresh propagation pass starts from."""
+    return [("row", i) for i in range(height)] + [("col", j) for j in range(width)]
+
+
+class LineScheduler:
+    """Work-list of lines waiting to be solved, with O(1) membership.
+
+    Strategies:
+        lifo: A pushed line jumps to the front, even if already queued (depth-first).
+        fifo: A pushed line joins the back, or keeps its place if already queued.
+        priority: Each push adds its weight to the line's score; highest score pops first,
+            ties in push order.
+    """
+
+    def __init__(self, strategy: str = "lifo", lines: Iterable[Line] = ()) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown scheduling strategy `{strategy}`")
+        self.strategy = strategy
+        # lifo/fifo: keys in pop order, with the front at the end for lifo
+        self._order: OrderedDict[Line, None] = OrderedDict()
+        # priority: current score per queued line plus a lazily cleaned heap
+        self._scores: dict[Line, float] = {}
+        self._heap: list[tuple[float, int, Line]] = []
+        self._seq = count()
+        self.extend(lines)
+
+    def extend(self, lines: Iterable[Line]) -> None:
+        """Queue lines behind everything already queued, keeping their relative order."""
+        if self.strategy == "lifo":
+            for line in lines:
+                if line not in self._order:
+                    self._order[line] = None
+                    self._order.move_to_end(line, last=False)
+        else:
+            for line in lines:
+                if line not in self:
+                    self.push(line, weight=0.0)
+
+    def push(self, line: Line, weight: float = 1.0) -> None:
+        if self.strategy == "lifo":
+            self._order[line] = None
+            self._order.move_to_end(line)
+        elif self.strategy == "fifo":
+            self._order.setdefault(line, None)
+        else:
+            score = self._scores.get(line, 0.0) + weight
+            self._scores[line] = score
+            heapq.heappush(self._heap, (-score, next(self._seq), line))
+
+    def pop(self) -> Line:
+        if self.strategy == "lifo":
+            return self._order.popitem(last=True)[0]
+        if self.strategy == "fifo":
+            return self._order.popitem(last=False)[0]
+
+        while self._heap:
+            neg_score, _, line = heapq.heappop(self._heap)
+            if self._scores.get(line) == -neg_score:
+                del self._scores[line]
+                return line
+        raise IndexError("pop from an empty LineScheduler")
+
+    def discard(self, line: Line) -> None:
+        self._order.pop(line, None)
+        self._scores.pop(line, None)
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._scores.clear()
+        self._heap.clear()
+
+    def copy(self) -> "LineScheduler":
+        other = LineScheduler(self.strategy)
+        other._order = self._order.copy()
+        other._scores = self._scores.copy()
+        other._heap = self._heap[:]
+        other._seq = count(next(self._seq))
+        return other
+
+    def __contains__(self, line: object) -> bool:
+        return line in self._order or line in self._scores
+
+    def __len__(self) -> int:
+        return len(self._order) + len(self._scores)
+
+    def __iter__(self) -> Iterator[Line]:
+        """Queued lines in the order they would be popped."""
+        if self.strategy == "lifo":
+            return reversed(self._order)
+        if self.strategy == "fifo":
+            return iter(self._order)
+        current = (entry for entry in self._heap if self._scores.get(entry[2]) == -entry[0])
+        return iter([line for _, _, line in sorted(current)])
@@ -0,0 +1,118 @@
+import time
+from dataclasses import dataclass
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.exceptions import Contradiction
+from nonogram.rules.simple_rules import line_matches
+from nonogram.solver.engine import PropagationEngine
+
+
+@dataclass
+class SearchResult:
+    status: str  # "solved", "unsolvable" or "budget"
+    grid: Grid | None
+    nodes: int
+    elapsed: float
+    line_solves: int = 0  # over every propagation of the search, pruned ones included
+
+
+class SearchEngine:
+    """Depth-first search over cell guesses, propagating after every guess.
+
+    A `Contradiction` while propagating a guess prunes that branch. The branching cell is
+    the first unknown of the line with the fewest unknowns left, guessed BOX then CROSS.
+    """
+
+    def __init__(self, propagation: PropagationEngine, max_nodes: int = 100_000) -> None:
+        self.propagation = propagation
+        self.max_nodes = max_nodes
+
+    def solve(self, grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> SearchResult:
+        """Searches for a solution, leaving the given grid untouched.
+
+        Args:
+            grid (Grid): The starting grid
+            row_clues (list[LineClue]): The clues of each row
+            col_clues (list[LineClue]): The clues of each column
+
+        Returns:
+            SearchResult: The outcome, with the solved grid when one was found.
+        """
+        start = time.perf_counter()
+        nodes = 0
+        line_solves = 0
+        propagation = self.propagation
+
+        def result(status: str, solution: Grid | None = None) -> SearchResult:
+            elapsed = time.perf_counter() - start
+            return SearchResult(status, solution, nodes, elapsed, line_solves)
+
+        root = grid.copy()
+        try:
+            propagation.propagate(root, row_clues, col_clues)
+        except Contradiction:
+            return result("unsolvable")
+        finally:
+            # Each propagation starts its stats afresh
+            line_solves += propagation.stats.line_solves
+
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            if current.is_solved():
+                if satisfies(current, row_clues, col_clues):
+                    return result("solved", current)
+                continue
+
+            if nodes >= self.max_nodes:
+                return result("budget")
+
+            i, j = choose_cell(current)
+            children = []
+            for value in (Cell.BOX, Cell.CROSS):
+                nodes += 1
+                child = current.copy()
+                child.set(i, j, value)
+                try:
+                    propagation.propagate(
+                        child, row_clues, col_clues, lines=[("row", i), ("col", j)]
+                    )
+                except Contradiction:
+                    continue
+                finally:
+                    line_solves += propagation.stats.line_solves
+                children.append(child)
+
+            # Push in reverse so the BOX branch is explored first
+            stack.extend(reversed(children))
+
+        return result("unsolvable")
+
+
+def choose_cell(grid: Grid) -> tuple[int, int]:
+    """Returns the first unknown cell of the row or column with the fewest unknowns."""
+    best: tuple[int, int] | None = None
+    best_unknown = max(grid.width, grid.height) + 1
+
+    for i in range(grid.height):
+        row = grid.row(i)
+        unknown = row.count(Cell.UNKNOWN)
+        if 0 < unknown < best_unknown:
+            best, best_unknown = (i, row.index(Cell.UNKNOWN)), unknown
+
+    for j in range(grid.width):
+        col = grid.col(j)
+        unknown = col.count(Cell.UNKNOWN)
+        if 0 < unknown < best_unknown:
+            best, best_unknown = (col.index(Cell.UNKNOWN), j), unknown
+
+    if best is None:
+        raise ValueError("Cannot choose a cell on a solved grid")
+    return best
+
+
+def satisfies(grid: Grid, row_clues: list[Clues], col_clues: list[Clues]) -> bool:
+    """Whether a fully known grid matches every row and column clue."""
+    return all(line_matches(clues, grid.row(i)) for i, clues in enumerate(row_clues)) and all(
+        line_matches(clues, grid.col(j)) for j, clues in enumerate(col_clues)
+    )
@@ -1,16 +1,20 @@
-from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 
-from nonogram.core import Cell, Clues, Grid
+from nonogram.core import Cell, Clues, LineState
 from nonogram.exceptions import Contradiction
-from nonogram.main import make_line_solver
 from nonogram.parser import PuzzleInput
 from nonogram.rules.enumeration_rules import EnumerationRule
+from nonogram.solver.dependencies import DependencyRecord, Position
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import ProbingEngine
+from nonogram.solver.scheduler import LineScheduler, all_lines
 
 
 @dataclass
 class StepResult:
-    kind: str  # "row", "col", or "repopulate"
+    kind: str  # "row", "col", "repopulate" or "probe"
     index: int  # -1 when kind == "repopulate"
     changed: bool
     is_done: bool
@@ -20,14 +24,30 @@ class StepResult:
 
 
 class StepwiseSolver:
-    def __init__(self, puzzle: PuzzleInput) -> None:
+    """Solves a puzzle one line at a time. Once a full pass changes nothing, one probing
+    step (see `ProbingEngine`) is tried, unless `probe_budget` is None, before the solver
+    reports itself stuck.
+
+    A `DependencyRecord` tracks which cells set by the user (or given in the puzzle) each
+    deduction relies on, so changing or clearing one of them only retracts, and re-queues,
+    the deductions that followed from it.
+    """
+
+    def __init__(
+        self, puzzle: PuzzleInput, strategy: str = "lifo", probe_budget: float | None = 5.0
+    ) -> None:
         self.puzzle = puzzle
+        self.probe_budget = probe_budget
         self.grid = puzzle.grid.copy()
         self._line_solver = make_line_solver()
-        self.queue: deque[tuple[str, int]] = deque(
-            [("row", i) for i in range(puzzle.height)] + [("col", j) for j in range(puzzle.width)]
-        )
-        self._history: deque[tuple[Grid, deque[tuple[str, int]]]] = deque(maxlen=50)
+        self.queue = LineScheduler(strategy, all_lines(puzzle.height, puzzle.width))
+        self.dependencies = DependencyRecord()
+        for i in range(puzzle.height):
+            for j in range(puzzle.width):
+                if self.grid.get(i, j) != Cell.UNKNOWN:
+                    self.dependencies.assume((i, j))
+        # (grid trail mark, dependency mark, queue) before each step; undo rolls back to them
+        self._history: list[tuple[int, int, LineScheduler]] = []
         self._changed_since_repopulation: bool = False
         self._stuck = False
 
@@ -47,8 +67,12 @@ class StepwiseSolver:
     def queue_length(self) -> int:
         return len(self.queue)
 
-    def step(self) -> StepResult | None:
-        """Process one queue item. Returns None if stuck (no progress possible)."""
+    def step(self, should_stop: Callable[[], bool] | None = None) -> StepResult | None:
+        """Process one queue item. Returns None if stuck (no progress possible).
+
+        `should_stop` is polled during a probing step, which can otherwise run for up to
+        `probe_budget` seconds, and ends it early keeping what it proved so far.
+        """
         if self._stuck:
             return None
 
@@ -57,23 +81,22 @@ class StepwiseSolver:
             if self.grid.is_solved():
                 return None
             if not self._changed_since_repopulation:
-                self._stuck = True
-                return None
+                result = self._probe(should_stop) if self.probe_budget is not None else None
+                if result is None:
+                    self._stuck = True
+                return result
             # Repopulate with all rows and cols
-            self._history.append((self.grid.copy(), deque(self.queue)))
-            self.queue = deque(
-                [("row", i) for i in range(self.puzzle.height)]
-                + [("col", j) for j in range(self.puzzle.width)]
-            )
+            self._save()
+            self.queue.extend(all_lines(self.puzzle.height, self.puzzle.width))
             self._changed_since_repopulation = False
             return StepResult(
                 kind="repopulate", index=-1, changed=False, is_done=False, is_stuck=False
             )
 
         # Save state for undo before processing
-        self._history.append((self.grid.copy(), deque(self.queue)))
+        self._save()
 
-        kind, index = self.queue.popleft()
+        kind, index = self.queue.pop()
         clues: Clues = (
             self.puzzle.row_clues[index] if kind == "row" else self.puzzle.col_clues[index]
         )
@@ -97,6 +120,7 @@ class StepwiseSolver:
                 error=f"Contradiction on {kind} {index}: {exc}",
             )
 
+        self._record(kind, index, clues, line, new_line)
         updated_cells: set[tuple[int, int]] = set()
         if changed:
             self._changed_since_repopulation = True
@@ -107,9 +131,7 @@ class StepwiseSolver:
                 else:
                     updated_cells.add((updated_i, index))
                 new_kind = "col" if kind == "row" else "row"
-                if (new_kind, updated_i) in self.queue:
-                    self.queue.remove((new_kind, updated_i))
-                self.queue.appendleft((new_kind, updated_i))
+                self.queue.push((new_kind, updated_i))
 
         return StepResult(
             kind=kind,
@@ -120,22 +142,108 @@ class StepwiseSolver:
             updated_cells=updated_cells if updated_cells else None,
         )
 
+    def _record(
+        self, kind: str, index: int, clues: Clues, line: LineState, new_line: LineState
+    ) -> None:
+        """Records what the cells of a solved line follow from: the clues and whatever the
+        line already held. Cells the line still fixes with every user-dependent cell hidden
+        follow from the clues alone, including known ones, which keeps retractions small."""
+        cells = [(index, k) if kind == "row" else (k, index) for k in range(len(line))]
+        known = [cell for cell, old in zip(cells, line) if old != Cell.UNKNOWN]
+        new = [k for k, (old, value) in enumerate(zip(line, new_line)) if old != value]
+        labels = self.dependencies.labels
+
+        if any(labels.get(cell) for cell in known):
+            hidden = LineState(
+                [Cell.UNKNOWN if labels.get(cell) else old for cell, old in zip(cells, line)]
+            )
+            try:
+                bare = self._line_solver.solve(clues, hidden)
+            except Contradiction:
+                bare = hidden
+            free = [
+                k
+                for k, value in enumerate(bare)
+                if value != hidden[k]
+                and value == new_line[k]
+                and (line[k] == Cell.UNKNOWN or labels.get(cells[k]))
+            ]
+            self.dependencies.record([cells[k] for k in free], [])
+            new = [k for k in new if bare[k] != new_line[k]]
+
+        if new:
+            self.dependencies.record([cells[k] for k in new], known)
+
+    def _probe(self, should_stop: Callable[[], bool] | None = None) -> StepResult | None:
+        """Probes the stalled grid. Returns None when probing proves nothing new, unless
+        it was stopped first."""
+        mark = self.grid.mark()
+        known = [
+            (i, j)
+            for i in range(self.puzzle.height)
+            for j in range(self.puzzle.width)
+            if self.grid.get(i, j) != Cell.UNKNOWN
+        ]
+        self._save()
+        probing = ProbingEngine(
+            PropagationEngine(self._line_solver), self.probe_budget, should_stop
+        )
+        try:
+            result = probing.probe(self.grid, self.puzzle.row_clues, self.puzzle.col_clues)
+        except Contradiction as exc:
+            self._stuck = True
+            return StepResult(
+                kind="probe",
+                index=-1,
+                changed=False,
+                is_done=False,
+                is_stuck=True,
+                error=f"Contradiction while probing: {exc}",
+            )
+
+        if not result.cells:
+            self._history.pop()
+            if result.status == "stopped":
+                # Not stuck, only interrupted: the next step probes again
+                return StepResult(
+                    kind="probe", index=-1, changed=False, is_done=False, is_stuck=False
+                )
+            return None
+
+        assert self.grid.trail is not None
+        self._changed_since_repopulation = True
+        updated_cells = {(i, j) for i, j, _ in self.grid.trail[mark:]}
+        # Probes draw on the whole grid
+        self.dependencies.record(updated_cells, known)
+        return StepResult(
+            kind="probe",
+            index=-1,
+            changed=True,
+            is_done=self.grid.is_solved(),
+            is_stuck=False,
+            updated_cells=updated_cells,
+        )
+
+    def _save(self) -> None:
+        self._history.append((self.grid.mark(), self.dependencies.mark(), self.queue.copy()))
+
     def undo(self) -> bool:
         """Restore the state before the last step. Returns False if nothing to undo."""
         if not self._history:
             return False
-        self.grid, self.queue = self._history.pop()
+        mark, dependency_mark, self.queue = self._history.pop()
+        self.grid.rollback(mark)
+        self.dependencies.rollback(dependency_mark)
         self._stuck = False
         return True
 
     def reset(self) -> None:
         """Clear the grid to all-unknown and restart the queue."""
-        self.grid = Grid(self.puzzle.width, self.puzzle.height)
-        self.queue = deque(
-            [("row", i) for i in range(self.puzzle.height)]
-            + [("col", j) for j in range(self.puzzle.width)]
-        )
+        self.grid = type(self.grid)(self.puzzle.width, self.puzzle.height)
+        self.queue.clear()
+        self.queue.extend(all_lines(self.puzzle.height, self.puzzle.width))
         self._history.clear()
+        self.dependencies.clear()
         self._changed_since_repopulation = False
         self._stuck = False
 
@@ -151,16 +259,46 @@ class StepwiseSolver:
             return False
         else:
             self._stuck = False
-            self._changed_since_repopulation = True
             rules.append(EnumerationRule())
+            # Only lines with unknowns left can gain anything from the new rule
+            self.queue.extend(
+                line
+                for line in all_lines(self.puzzle.height, self.puzzle.width)
+                if Cell.UNKNOWN in self._line(line)
+            )
             return True
 
-    def set_cell(self, row: int, col: int, value: Cell) -> None:
-        """Manually set a cell and re-queue the affected row and column."""
-        self.grid.cells[row][col] = value
+    def set_cell(self, row: int, col: int, value: Cell) -> set[Position]:
+        """Manually set (or clear, with `Cell.UNKNOWN`) a cell.
+
+        Changing a cell the user set earlier first retracts every deduction that relied
+        on it; deductions that follow from the clues alone are kept. The cell's row and
+        column, and those of every retracted cell, are re-queued.
+
+        Returns:
+            set[Position]: The retracted cells, now unknown again.
+        """
+        retracted: set[Position] = set()
+        previous = self.grid.get(row, col)
+        if previous != Cell.UNKNOWN and previous != value:
+            retracted = {
+                (i, j)
+                for i, j in self.dependencies.affected((row, col))
+                if self.grid.get(i, j) != Cell.UNKNOWN
+            }
+            for i, j in retracted:
+                self.grid.set(i, j, Cell.UNKNOWN)
+
+        self.grid.set(row, col, value)
+        if value != Cell.UNKNOWN:
+            self.dependencies.assume((row, col))
         self._stuck = False
-        self._changed_since_repopulation = True
-        if ("row", row) not in self.queue:
-            self.queue.append(("row", row))
-        if ("col", col) not in self.queue:
-            self.queue.append(("col", col))
+        lines = {("row", row), ("col", col)}
+        lines.update(("row", i) for i, _ in retracted)
+        lines.update(("col", j) for _, j in retracted)
+        self.queue.extend(sorted(lines))
+        return retracted
+
+    def _line(self, line: tuple[str, int]) -> list[Cell]:
+        kind, index = line
+        return self.grid.row(index) if kind == "row" else self.grid.col(index)
@@ -0,0 +1,263 @@
+"""Batch line solving with NumPy: the overlap and never-black deductions for every row
+(or every column) of a grid at once.
+
+Placement bounds are found for all lines together, one clue index at a time, by packing
+the clues as far left (and, on the mirrored lines, as far right) as the crosses allow.
+Boxes are ignored while packing, so on lines with boxes the bounds are looser than the
+rules' exact ones and the deductions a subset of `OverlapRule` and `NeverBlackRule`;
+on lines without boxes the two agree exactly.
+
+NumPy is an optional dependency (`pip install nonogram[fast]`), only imported when this
+module is.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from nonogram.core import Cell, Clues, Grid, LineState
+from nonogram.exceptions import CellConflictContradiction, LineTooShortContradiction
+
+UNKNOWN, BOX, CROSS = 0, 1, 2
+
+_CODES = {Cell.UNKNOWN: UNKNOWN, Cell.BOX: BOX, Cell.CROSS: CROSS}
+_CELLS = (Cell.UNKNOWN, Cell.BOX, Cell.CROSS)
+
+
+class ArrayGrid(Grid):
+    """Grid backend holding every cell in one (height, width) int8 array of
+    `UNKNOWN`/`BOX`/`CROSS` codes, so whole batches of lines can be read and written
+    with array operations. `cells` is rebuilt on read and is a snapshot."""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.values = np.zeros((height, width), dtype=np.int8)
+        self.trail: list[tuple[int, int, Cell]] | None = None
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "ArrayGrid":
+        g = cls(grid.width, grid.height)
+        g.values[:] = to_array(grid)
+        return g
+
+    @property  # type: ignore[override]
+    def cells(self) -> list[LineState]:  # type: ignore[override]
+        return [self.row(i) for i in range(self.height)]
+
+    def row(self, i: int) -> LineState:
+        return LineState([_CELLS[v] for v in self.values[i].tolist()])
+
+    def col(self, j: int) -> LineState:
+        return LineState([_CELLS[v] for v in self.values[:, j].tolist()])
+
+    def apply_row(self, i: int, new_state: LineState) -> bool:
+        if self.width != len(new_state):
+            raise LineTooShortContradiction("Cannot apply states of different length")
+        return bool(self.apply(_encode(new_state)[None, :], rows=slice(i, i + 1)).any())
+
+    def apply_col(self, j: int, new_state: LineState) -> bool:
+        if self.height != len(new_state):
+            raise LineTooShortContradiction("Cannot apply states of different length")
+        return bool(self.apply(_encode(new_state)[:, None], cols=slice(j, j + 1)).any())
+
+    def apply(
+        self, new: np.ndarray, rows: slice = slice(None), cols: slice = slice(None)
+    ) -> np.ndarray:
+        """Writes the known codes of `new` into the unknown cells of `values[rows, cols]`
+        in one masked write.
+
+        Raises:
+            CellConflictContradiction: When `new` disagrees with a known cell
+
+        Returns:
+            np.ndarray: Mask of the cells that changed
+        """
+        view = self.values[rows, cols]
+        known = new != UNKNOWN
+        conflict = known & (view != UNKNOWN) & (view != new)
+        if conflict.any():
+            i, j = np.argwhere(conflict)[0]
+            raise CellConflictContradiction(f"Cell ({i}, {j}) being applied as {new[i, j]}.")
+
+        changed: np.ndarray = known & (view == UNKNOWN)
+        if self.trail is not None:
+            i0 = rows.start or 0
+            j0 = cols.start or 0
+            self.trail.extend((i0 + i, j0 + j, Cell.UNKNOWN) for i, j in np.argwhere(changed))
+        view[changed] = new[changed]
+        return changed
+
+    def get(self, i: int, j: int) -> Cell:
+        return _CELLS[self.values[i, j]]
+
+    def set(self, i: int, j: int, value: Cell) -> None:
+        if self.trail is not None:
+            self.trail.append((i, j, self.get(i, j)))
+        self.values[i, j] = _CODES[value]
+
+    def is_solved(self) -> bool:
+        return not (self.values == UNKNOWN).any()
+
+    def copy(self) -> "ArrayGrid":
+        g = ArrayGrid(self.width, self.height)
+        g.values = self.values.copy()
+        return g
+
+
+def to_array(grid: Grid) -> np.ndarray:
+    """Returns a (height, width) int8 array of the grid's cell codes."""
+    if isinstance(grid, ArrayGrid):
+        return grid.values.copy()
+    return np.array(
+        [[_CODES[cell] for cell in grid.row(i)] for i in range(grid.height)], dtype=np.int8
+    ).reshape(grid.height, grid.width)
+
+
+def pad_clues(clues: Sequence[Clues]) -> tuple[np.ndarray, np.ndarray]:
+    """Packs the clues of many lines into one array.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: A (lines, most clues) array of clue lengths, zero
+        padded on the right, and the number of clues of each line. A `[0]` clue counts
+        as no clues.
+    """
+    lists = [[clue for clue in line if clue] for line in clues]
+    counts = np.array([len(line) for line in lists], dtype=np.intp)
+    lengths = np.zeros((len(lists), max(counts, default=0)), dtype=np.intp)
+    for i, line in enumerate(lists):
+        lengths[i, : len(line)] = line
+    return lengths, counts
+
+
+def solve_lines(values: np.ndarray, lengths: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Deduces what overlap and never-black can for a batch of equal length lines.
+
+    Args:
+        values (np.ndarray): (lines, length) cell codes, one line per row
+        lengths (np.ndarray): Padded clue lengths, from `pad_clues`
+        counts (np.ndarray): Number of clues of each line
+
+    Raises:
+        LineTooShortContradiction: When the clues of a line cannot be placed
+        CellConflictContradiction: When a known box can never be covered
+
+    Returns:
+        np.ndarray: (lines, length) codes of the deduced cells, `UNKNOWN` elsewhere
+    """
+    m, n = values.shape
+    k = lengths.shape[1]
+    active = np.arange(k) < counts[:, None]
+
+    earliest = _earliest(values, lengths, counts)
+    # The latest starts are the earliest of the reversed clues on the mirrored lines
+    rev_index = np.clip(counts[:, None] - 1 - np.arange(k), 0, None)
+    rev_lengths = np.where(active, np.take_along_axis(lengths, rev_index, axis=1), 0)
+    rev_earliest = _earliest(values[:, ::-1], rev_lengths, counts)
+    latest = n - np.take_along_axis(rev_earliest, rev_index, axis=1) - lengths
+
+    # Every placement covers [latest, earliest + clue), and none reaches past
+    # [earliest, latest + clue)
+    boxes = _cover(m, n, latest, earliest + lengths, active)
+    reach = _cover(m, n, earliest, latest + lengths, active)
+
+    if (~reach & (values == BOX)).any():
+        line = int(np.argwhere(~reach & (values == BOX))[0, 0])
+        raise CellConflictContradiction(f"Line {line} has a box no clue can reach")
+
+    new = np.zeros_like(values)
+    new[boxes] = BOX
+    new[~reach] = CROSS
+    return new
+
+
+def sweep(grid: ArrayGrid, lengths: np.ndarray, counts: np.ndarray, axis: str) -> np.ndarray:
+    """Solves every row (`axis="row"`) or column (`"col"`) of the grid as one batch,
+    with the clues of those lines as padded by `pad_clues`.
+
+    Returns:
+        np.ndarray: Mask of the cells that changed, as (lines, length)
+    """
+    if axis == "row":
+        return grid.apply(solve_lines(grid.values, lengths, counts))
+    return grid.apply(solve_lines(grid.values.T, lengths, counts).T).T
+
+
+def presolve(grid: Grid, row_clues: Sequence[Clues], col_clues: Sequence[Clues]) -> int:
+    """Alternates row and column sweeps until one deduces nothing, writing the result
+    into `grid`. A plain `Grid` is copied into an array and only its changed rows are
+    written back; an `ArrayGrid` is updated in place.
+
+    Returns:
+        int: The number of cells deduced
+    """
+    array_grid = grid if isinstance(grid, ArrayGrid) else ArrayGrid.from_grid(grid)
+    before = array_grid.values.copy()
+    batches = [(pad_clues(row_clues), "row"), (pad_clues(col_clues), "col")]
+
+    deduced = 0
+    turn = 0
+    while True:
+        (lengths, counts), axis = batches[turn % 2]
+        changed = int(sweep(array_grid, lengths, counts, axis).sum())
+        deduced += changed
+        # Once the first pair has run, a quiet sweep leaves the other axis nothing new
+        if not changed and turn:
+            break
+        turn += 1
+
+    if array_grid is not grid:
+        for i in np.flatnonzero((before != array_grid.values).any(axis=1)).tolist():
+            grid.apply_row(i, array_grid.row(i))
+    return deduced
+
+
+def _encode(state: LineState) -> np.ndarray:
+    return np.array([_CODES[cell] for cell in state], dtype=np.int8)
+
+
+def _earliest(values: np.ndarray, lengths: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Leftmost start of every clue of every line, packing the clues left past crosses.
+
+    Each step places clue `j` of all lines at once, starting just after clue `j - 1` and
+    jumping lines whose window would hold a cross to just past that cross, so the work
+    per clue is a few array operations over the lines rather than over every cell.
+    """
+    m, n = values.shape
+    k = lengths.shape[1]
+    idx = np.arange(n + 1)
+    cross = np.concatenate([values == CROSS, np.ones((m, 1), dtype=bool)], axis=1)
+    # Index of the nearest cross at or after each cell (n past the end), and the number
+    # of cells free of crosses from there
+    next_cross = np.minimum.accumulate(np.where(cross, idx, n)[:, ::-1], axis=1)[:, ::-1]
+    free = next_cross - idx
+    rows = np.arange(m)
+
+    starts = np.zeros((m, k), dtype=np.intp)
+    pos = np.zeros(m, dtype=np.intp)
+    for j in range(k):
+        clue = lengths[:, j]
+        active = j < counts
+        blocked = active & (free[rows, pos] < clue)
+        while blocked.any():
+            pos = np.where(blocked, np.minimum(next_cross[rows, pos] + 1, n), pos)
+            blocked &= (pos < n) & (free[rows, pos] < clue)
+
+        if (active & (pos + clue > n)).any():
+            line = int(np.flatnonzero(active & (pos + clue > n))[0])
+            raise LineTooShortContradiction(f"Line {line} is too short for its clues")
+        starts[:, j] = np.where(active, pos, 0)
+        pos = np.where(active, np.minimum(pos + clue + 1, n), pos)
+
+    return starts
+
+
+def _cover(m: int, n: int, lo: np.ndarray, hi: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Mask of the cells inside any of the ranges [lo, hi) selected by `mask`."""
+    mask = mask & (lo < hi)
+    rows = np.broadcast_to(np.arange(m)[:, None], lo.shape)[mask]
+    size = m * (n + 1)
+    diff = np.bincount(rows * (n + 1) + lo[mask], minlength=size) - np.bincount(
+        rows * (n + 1) + hi[mask], minlength=size
+    )
+    return np.cumsum(diff.reshape(m, n + 1)[:, :n], axis=1) > 0
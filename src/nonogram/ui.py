@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
+from collections.abc import Iterable
 from pathlib import Path
 
-from rich.text import Text
+from rich.segment import Segment
+from rich.style import Style
 from textual import on
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, ScrollableContainer, Vertical
+from textual.geometry import Region, Size
+from textual.message import Message
 from textual.reactive import reactive
 from textual.screen import ModalScreen, Screen
-from textual.timer import Timer
+from textual.strip import Strip
 from textual.widget import Widget
 from textual.widgets import Button, DirectoryTree, Input, Label, Static
+from textual.worker import Worker, get_current_worker
 
 from nonogram.core import Cell, Clues, Grid
-from nonogram.parser import ParseError, PuzzleInput, parse_nonogram
+from nonogram.parser import ParseError, PuzzleInput, parse_nonogram, puzzle_to_dict
 from nonogram.solver.ui_solver import StepResult, StepwiseSolver
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -25,6 +31,20 @@ from nonogram.solver.ui_solver import StepResult, StepwiseSolver
 
 CELL_CYCLE = [Cell.UNKNOWN, Cell.BOX, Cell.CROSS]
 
+_CELL_TEXT = {Cell.BOX: "██", Cell.CROSS: "░░", Cell.UNKNOWN: "  "}
+_CURSOR_STYLES = {
+    Cell.BOX: Style(bold=True),
+    Cell.CROSS: Style(reverse=True),
+    Cell.UNKNOWN: Style(reverse=True),
+}
+_HIGHLIGHT_STYLES = {
+    Cell.BOX: Style(color="green"),
+    Cell.CROSS: Style(color="bright_green"),
+    Cell.UNKNOWN: Style(bgcolor="green"),
+}
+
+FRAME_INTERVAL = 1 / 30  # seconds between grid redraws while running
+
 
 class GridWidget(Widget):
     """Renders the nonogram grid with clues; supports cursor and edit mode."""
@@ -45,7 +65,10 @@ class GridWidget(Widget):
         super().__init__()
         self.puzzle = puzzle
         self.solver = solver
-        self.highlighted_cells: set[tuple[int, int]] = set()
+        self._highlighted: set[tuple[int, int]] = set()
+        self._header = self._header_lines()
+        # Row index -> its rendered strip, dropped whenever the row has to be redrawn
+        self._rows: dict[int, Strip] = {}
 
     # ── Layout helpers ──────────────────────────────────────────────────────
 
@@ -72,20 +95,13 @@ class GridWidget(Widget):
 
     # ── Rendering ───────────────────────────────────────────────────────────
 
-    def render(self) -> Text:
-        grid = self.solver.grid
-        row_clues = self.puzzle.row_clues
+    def _header_lines(self) -> list[str]:
+        """The column clues and the separator under them, which never change."""
         col_clues = self.puzzle.col_clues
-        width = self.puzzle.width
-        height = self.puzzle.height
-
         clue_w = self._max_row_clue_width()
         col_clue_rows = self._num_col_clue_rows()
-        cur_row, cur_col = self.cursor
 
         lines: list[str] = []
-
-        # ── Column clue header ───────────────────────────────────────────
         for clue_row in range(col_clue_rows):
             parts: list[str] = [" " * (clue_w + 3)]  # indent to align with grid
             for j, clues in enumerate(col_clues):
@@ -99,46 +115,79 @@ class GridWidget(Widget):
                     parts.append(" ")
             lines.append("".join(parts))
 
-        # Blank separator
-        sep = " " * (clue_w + 3) + ("--" * min(5, width) + " ") * (width // 5) + "--" * (width % 5)
-        lines.append(sep)
-
-        # ── Grid rows ────────────────────────────────────────────────────
-        for i, (clues, row_cells) in enumerate(zip(row_clues, grid.cells)):
-            clue_str = str(clues)
-            line_parts: list[str] = [f"{clue_str:>{clue_w}} | "]
-            for j, cell in enumerate(row_cells):
-                is_cursor = self.edit_mode and (i == cur_row) and (j == cur_col)
-                is_highlighted = (i, j) in self.highlighted_cells
-                if cell == Cell.BOX:
-                    if is_cursor:
-                        line_parts.append("\x1b[1m██\x1b[0m")
-                    elif is_highlighted:
-                        line_parts.append("\x1b[32m██\x1b[0m")
-                    else:
-                        line_parts.append("██")
-                elif cell == Cell.CROSS:
-                    if is_cursor:
-                        line_parts.append("\x1b[7m░░\x1b[0m")
-                    elif is_highlighted:
-                        line_parts.append("\x1b[92m░░\x1b[0m")
-                    else:
-                        line_parts.append("░░")
-                else:  # UNKNOWN
-                    if is_cursor:
-                        line_parts.append("\x1b[7m  \x1b[0m")
-                    elif is_highlighted:
-                        line_parts.append("\x1b[42m  \x1b[0m")
-                    else:
-                        line_parts.append("  ")
-                if (j + 1) % 5 == 0 and j + 1 < width:
-                    line_parts.append("|")
-            lines.append("".join(line_parts))
-            if (i + 1) % 5 == 0 and i + 1 < height:
-                lines.append(sep)
-
-        text = Text.from_ansi("\n".join(lines))
-        return text
+        lines.append(self._separator())
+        return lines
+
+    def _separator(self) -> str:
+        width = self.puzzle.width
+        blocks = ("--" * min(5, width) + " ") * (width // 5) + "--" * (width % 5)
+        return " " * (self._max_row_clue_width() + 3) + blocks
+
+    def _row_strip(self, i: int) -> Strip:
+        """Segments of grid row `i`, as it stands now."""
+        clue_w = self._max_row_clue_width()
+        width = self.puzzle.width
+        cur_row, cur_col = self.cursor
+        row = self.solver.grid.row(i)
+
+        segments = [Segment(f"{str(self.puzzle.row_clues[i]):>{clue_w}} | ")]
+        for j, cell in enumerate(row):
+            if self.edit_mode and i == cur_row and j == cur_col:
+                style = _CURSOR_STYLES[cell]
+            elif (i, j) in self.highlighted_cells:
+                style = _HIGHLIGHT_STYLES[cell]
+            else:
+                style = None
+            segments.append(Segment(_CELL_TEXT[cell], style))
+            if (j + 1) % 5 == 0 and j + 1 < width:
+                segments.append(Segment("|"))
+        return Strip(segments).simplify()
+
+    def get_content_width(self, container: Size, viewport: Size) -> int:
+        return max(len(line) for line in self._header) if self._header else 0
+
+    def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
+        height = self.puzzle.height
+        return len(self._header) + height + max(height - 1, 0) // 5
+
+    def render_line(self, y: int) -> Strip:
+        """Renders one line of the widget. Textual only asks for the lines in view, and
+        grid rows are kept in `_rows` until one of their cells, the cursor or the
+        highlight moves."""
+        if y < len(self._header):
+            return Strip([Segment(self._header[y])])
+        slot = y - len(self._header)
+        if slot % 6 == 5:  # a separator after every 5 rows
+            return Strip([Segment(self._header[-1])])
+
+        i = slot - slot // 6
+        if i >= self.puzzle.height:
+            return Strip.blank(0)
+        strip = self._rows.get(i)
+        if strip is None:
+            strip = self._rows[i] = self._row_strip(i)
+        return strip
+
+    def invalidate_rows(self, rows: Iterable[int]) -> None:
+        """Redraws grid rows whose cells changed."""
+        for i in set(rows):
+            if self._rows.pop(i, None) is not None:
+                self.refresh(Region(0, self._cell_char_y(i), self.size.width, 1))
+
+    def invalidate(self) -> None:
+        """Redraws every grid row, e.g. after the whole grid was rolled back."""
+        self._rows.clear()
+        self.refresh()
+
+    @property
+    def highlighted_cells(self) -> set[tuple[int, int]]:
+        return self._highlighted
+
+    @highlighted_cells.setter
+    def highlighted_cells(self, cells: set[tuple[int, int]]) -> None:
+        rows = {i for i, _ in self._highlighted} | {i for i, _ in cells}
+        self._highlighted = cells
+        self.invalidate_rows(rows)
 
     # ── Mouse events ────────────────────────────────────────────────────────
 
@@ -197,19 +246,24 @@ class GridWidget(Widget):
             event.stop()
 
     def _cycle_cell(self, row: int, col: int) -> None:
-        current = self.solver.grid.cells[row][col]
+        if isinstance(self.screen, SolverScreen):
+            # A run must not step the solver while the edit lands
+            self.screen.action_stop()
+        current = self.solver.grid.get(row, col)
         idx = CELL_CYCLE.index(current)
         next_cell = CELL_CYCLE[(idx + 1) % len(CELL_CYCLE)]
-        self.solver.set_cell(row, col, next_cell)
-        self.refresh()
+        retracted = self.solver.set_cell(row, col, next_cell)
+        if retracted:
+            self.notify(f"Retracted {len(retracted)} deductions that relied on this cell")
+        self.invalidate_rows([row, *(i for i, _ in retracted)])
         if isinstance(self.screen, SolverScreen):
             self.screen.refresh_status()
 
-    def watch_cursor(self, _: tuple[int, int]) -> None:
-        self.refresh()
+    def watch_cursor(self, old: tuple[int, int], new: tuple[int, int]) -> None:
+        self.invalidate_rows([old[0], new[0]])
 
     def watch_edit_mode(self, _: bool) -> None:
-        self.refresh()
+        self.invalidate_rows([self.cursor[0]])
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -477,21 +531,6 @@ class ManualCluesScreen(Screen):
 # ──────────────────────────────────────────────────────────────────────────────
 
 
-def _puzzle_to_dict(puzzle: PuzzleInput, grid: Grid) -> dict:
-    """Serialize puzzle + current grid state to the JSON format."""
-    grid_data = ["".join(str(cell) for cell in row) for row in grid.cells]
-    data: dict = {
-        "version": "1",
-        "meta": puzzle.meta,
-        "width": puzzle.width,
-        "height": puzzle.height,
-        "rows": [list(clues) for clues in puzzle.row_clues],
-        "cols": [list(clues) for clues in puzzle.col_clues],
-        "grid": grid_data,
-    }
-    return data
-
-
 class SaveScreen(ModalScreen[str | None]):
     """Modal dialog for saving the puzzle to a JSON file."""
 
@@ -576,7 +615,7 @@ class SaveScreen(ModalScreen[str | None]):
 
         save_path = self._selected_dir / filename
         try:
-            data = _puzzle_to_dict(self._puzzle, self._grid)
+            data = puzzle_to_dict(self._puzzle, self._grid)
             save_path.write_text(json.dumps(data, indent=2) + "\n")
         except Exception as exc:
             error.update(f"Error: {exc}")
@@ -647,11 +686,31 @@ class SolverScreen(Screen):
     }
     """
 
+    class Frame(Message):
+        """Progress from a background run or step: every cell updated since the last
+        frame and the most recent step, posted at most once every `FRAME_INTERVAL`
+        seconds."""
+
+        def __init__(
+            self,
+            worker: Worker[None],
+            result: StepResult | None,
+            updated_cells: set[tuple[int, int]],
+            finished: bool,
+        ) -> None:
+            super().__init__()
+            self.worker = worker
+            self.result = result
+            self.updated_cells = updated_cells
+            self.finished = finished
+
     def __init__(self, puzzle: PuzzleInput) -> None:
         super().__init__()
         self.puzzle = puzzle
         self.solver = StepwiseSolver(puzzle)
-        self._run_timer: Timer | None = None
+        self._run_worker: Worker[None] | None = None
+        # Held by the run worker for each step, so the solver is never touched mid-step
+        self._solver_lock = threading.Lock()
         self._start_time = time.time()
         self._is_editing = False
 
@@ -717,33 +776,37 @@ class SolverScreen(Screen):
 
     def action_step(self) -> None:
         self.action_stop()
-        # Advance until a line actually changes, a repopulation occurs, or we finish/get stuck
-        result = None
-        while True:
-            result = self.solver.step()
-            if result is None or result.changed or result.kind == "repopulate" or result.is_done:
-                break
-        self._after_step(result)
+        # A probing step can take seconds, so it runs off the UI thread like a run does
+        self._run_worker = self.run_worker(self._step, group="run", thread=True)
 
     def action_undo(self) -> None:
         self.action_stop()
         if self.solver.undo():
-            self.query_one(GridWidget).highlighted_cells = set()
-            self._refresh_grid()
+            grid_widget = self.query_one(GridWidget)
+            grid_widget.highlighted_cells = set()
+            grid_widget.invalidate()
             self.refresh_status("Undone.")
         else:
             self.refresh_status("Nothing to undo.")
 
     def action_run(self) -> None:
-        if self._run_timer is not None:
+        if self._run_worker is not None:
             return
-        self._run_timer = self.set_interval(0.03, self._run_tick)
+        if self._is_editing:
+            self.refresh_status("Leave edit mode (e) before running.")
+            return
+        self._run_worker = self.run_worker(self._run, group="run", thread=True)
         self.refresh_status("Running...")
 
     def action_stop(self) -> None:
-        if self._run_timer is not None:
-            self._run_timer.stop()
-            self._run_timer = None
+        if self._run_worker is not None:
+            self._run_worker.cancel()
+            # Waits out the step in progress, which is short: probing steps check for
+            # cancellation between cells, and the worker checks before every step
+            with self._solver_lock:
+                self._run_worker = None
+            # Cells stepped since the run's last frame never reach the row cache
+            self.query_one(GridWidget).invalidate()
 
     def action_reset(self) -> None:
         self.action_stop()
@@ -755,7 +818,7 @@ class SolverScreen(Screen):
         grid_widget.cursor = (0, 0)
         self._is_editing = False
         self.query_one("#btn-edit", Button).variant = "default"
-        self._refresh_grid()
+        grid_widget.invalidate()
         self.refresh_status("Puzzle reset.")
 
     def action_toggle_edit(self) -> None:
@@ -785,7 +848,8 @@ class SolverScreen(Screen):
         self.app.push_screen(SaveScreen(self.puzzle, self.solver.grid), on_save_result)
 
     def action_toggle_enum(self) -> None:
-        enabled = self.solver.toggle_enumeration()
+        with self._solver_lock:
+            enabled = self.solver.toggle_enumeration()
         btn = self.query_one("#btn-enum", Button)
         if enabled:
             btn.variant = "warning"
@@ -797,22 +861,64 @@ class SolverScreen(Screen):
     def action_quit_app(self) -> None:
         self.app.exit()
 
-    # ── Timer tick ───────────────────────────────────────────────────────────
+    # ── Background run ───────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        """Steps the solver at full speed in a worker thread, posting a `Frame` at most
+        once every `FRAME_INTERVAL` seconds and once more when it finishes."""
+        worker = get_current_worker()
+        updated_cells: set[tuple[int, int]] = set()
+        next_frame = time.perf_counter() + FRAME_INTERVAL
+        while True:
+            with self._solver_lock:
+                if worker.is_cancelled:
+                    return
+                result = self.solver.step(lambda: worker.is_cancelled)
+            if result is not None and result.updated_cells:
+                updated_cells |= result.updated_cells
+
+            finished = result is None or result.is_done or result.is_stuck
+            if finished or time.perf_counter() >= next_frame:
+                self.post_message(self.Frame(worker, result, updated_cells, finished))
+                if finished:
+                    return
+                updated_cells = set()
+                next_frame = time.perf_counter() + FRAME_INTERVAL
+
+    def _step(self) -> None:
+        """Steps the solver in a worker thread until a line actually changes, a
+        repopulation occurs, or it finishes or gets stuck, then posts a `Frame`."""
+        worker = get_current_worker()
+        updated_cells: set[tuple[int, int]] = set()
+        while True:
+            with self._solver_lock:
+                if worker.is_cancelled:
+                    return
+                result = self.solver.step(lambda: worker.is_cancelled)
+            if result is not None and result.updated_cells:
+                updated_cells |= result.updated_cells
+            if result is None or result.changed or result.kind == "repopulate" or result.is_done:
+                break
+        self.post_message(self.Frame(worker, result, updated_cells, True))
 
-    def _run_tick(self) -> None:
-        result = self.solver.step()
-        self._after_step(result)
-        if result is None or result.is_done or result.is_stuck:
-            self.action_stop()
+    def on_solver_screen_frame(self, frame: Frame) -> None:
+        # Frames still queued from a stopped run would undo a newer run's bookkeeping
+        if frame.worker is not self._run_worker:
+            return
+        if frame.finished:
+            self._run_worker = None
+        self._after_step(frame.result, frame.updated_cells)
 
     # ── Helpers ──────────────────────────────────────────────────────────────
 
-    def _after_step(self, result: StepResult | None) -> None:
+    def _after_step(
+        self, result: StepResult | None, highlighted: set[tuple[int, int]] | None = None
+    ) -> None:
         grid_widget = self.query_one(GridWidget)
-        grid_widget.highlighted_cells = (
-            result.updated_cells if result and result.updated_cells else set()
-        )
-        self._refresh_grid()
+        if highlighted is None:
+            highlighted = result.updated_cells if result and result.updated_cells else set()
+        # Only the rows of updated cells need redrawing, and they are all highlighted
+        grid_widget.highlighted_cells = highlighted
         if result is None:
             if self.solver.is_done:
                 self.refresh_status("Puzzle solved!")
@@ -830,6 +936,8 @@ class SolverScreen(Screen):
             return
         elif result.kind == "repopulate":
             msg = f"Queue exhausted, restarting pass... ({complete}/{total} complete)"
+        elif result.kind == "probe" and not result.is_done:
+            msg = f"Probing fixed {len(result.updated_cells or ())} cells — {complete}/{total}"
         elif result.is_done:
             elapsed = time.time() - self._start_time
             msg = f"Puzzle solved! {complete}/{total} in {elapsed:.1f}s"
@@ -841,9 +949,6 @@ class SolverScreen(Screen):
         self.refresh_status(msg)
         self._update_progress(complete, total)
 
-    def _refresh_grid(self) -> None:
-        self.query_one(GridWidget).refresh()
-
     def _update_progress(self, complete: int, total: int) -> None:
         pct = round(complete / total * 100, 1) if total else 0
         elapsed = time.time() - self._start_time
@@ -2,12 +2,8 @@ import pytest
 
 from nonogram.core import Clues, LineState
 from nonogram.exceptions import Contradiction
-from nonogram.rules.overlap_rules import (
-    LockedRunsRule,
-    MinimumLengthExpansionRule,
-    earliest_starts,
-    latest_starts,
-)
+from nonogram.rules.overlap_rules import LockedRunsRule, MinimumLengthExpansionRule
+from nonogram.rules.placement import earliest_starts, latest_starts
 from tst.nonogram.utils import RuleTester
 
 
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import LineTooShortContradiction
+from nonogram.rules.enumeration_rules import enumerate_possibilities
+from nonogram.rules.placement import (
+    AnalysisCache,
+    LineAnalysis,
+    analyse,
+    earliest_starts,
+    latest_starts,
+)
+from nonogram.rules.simple_rules import black_runs
+
+
+def random_lines(count, seed=0):
+    """Random partially known lines with the clues of a random solution."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(1, 14)
+        solution = "".join(rng.choice("#.") for _ in range(n))
+        clues = [length for _, length in black_runs(LineState(solution))]
+        line = "".join(cell if rng.random() < 0.4 else " " for cell in solution)
+        yield Clues(clues), LineState(line)
+
+
+class TestExactPlacement:
+    @pytest.mark.parametrize(
+        "clues, line, earliest, latest",
+        [
+            ((1, 1), "   #", [0, 3], [1, 3]),
+            ((2, 1), " #   # ", [0, 5], [1, 5]),
+            ((1, 1), "# #    ", [0, 2], [0, 2]),
+            ((4,), " #  #  ", [1], [1]),
+        ],
+    )
+    def test_stray_boxes_are_covered(self, clues, line, earliest, latest):
+        assert earliest_starts(Clues(clues), LineState(line)) == earliest
+        assert latest_starts(Clues(clues), LineState(line)) == latest
+
+    @pytest.mark.parametrize(
+        "clues, line",
+        [((1, 1), "#  #  #"), ((1,), "#.#"), ((3,), " # .#  "), ((2,), "#  #")],
+    )
+    def test_uncoverable_boxes(self, clues, line):
+        with pytest.raises(LineTooShortContradiction):
+            earliest_starts(Clues(clues), LineState(line))
+        with pytest.raises(LineTooShortContradiction):
+            latest_starts(Clues(clues), LineState(line))
+
+    def test_matches_enumeration(self):
+        for clues, line in random_lines(300):
+            if not clues:
+                continue
+            placements = enumerate_possibilities(clues, line)
+            starts = [[start for start, _ in black_runs(p)] for p in placements]
+            assert earliest_starts(clues, line) == [min(s) for s in zip(*starts)]
+            assert latest_starts(clues, line) == [max(s) for s in zip(*starts)]
+
+
+class TestLineAnalysis:
+    def test_facts(self):
+        analysis = LineAnalysis(Clues((3, 1)), LineState(" ##   # "))
+        assert analysis.earliest == [0, 6]
+        assert analysis.latest == [1, 6]
+        assert analysis.runs == [(1, 2), (6, 1)]
+        assert analysis.candidates == [[0], [1]]
+
+    def test_ambiguous_run(self):
+        analysis = LineAnalysis(Clues((2, 2)), LineState("   #   "))
+        assert analysis.candidates == [[0, 1]]
+
+    def test_contradiction_is_raised_on_use(self):
+        analysis = LineAnalysis(Clues((3, 3)), LineState("      "))
+        assert analysis.runs == []
+        with pytest.raises(LineTooShortContradiction):
+            _ = analysis.earliest
+
+
+class TestAnalyse:
+    def test_reused_while_line_is_unchanged(self):
+        clues = Clues((2,))
+        with AnalysisCache():
+            first = analyse(clues, LineState(" #  "))
+            assert analyse(Clues((2,)), LineState(" #  ")) is first
+
+    def test_invalidated_when_a_cell_changes(self):
+        clues = Clues((2,))
+        with AnalysisCache():
+            first = analyse(clues, LineState(" #  "))
+            second = analyse(clues, LineState(" #. "))
+        assert second is not first
+        assert second.latest == [0]
+
+    def test_invalidated_when_clues_change(self):
+        state = LineState("    ")
+        with AnalysisCache():
+            assert analyse(Clues((2,)), state) is not analyse(Clues((3,)), state)
+
+    def test_snapshot_ignores_later_mutation(self):
+        state = LineState("    ")
+        with AnalysisCache():
+            first = analyse(Clues((1,)), state)
+            state[0] = Cell.BOX
+            assert analyse(Clues((1,)), state) is not first
+        # The facts still describe the line as it was analysed
+        assert first.runs == []
+        assert first.latest == [3]
+
+    def test_not_shared_without_a_cache(self):
+        state = LineState("    ")
+        assert analyse(Clues((1,)), state) is not analyse(Clues((1,)), state)
+        cache = AnalysisCache()
+        with cache:
+            with cache:
+                first = analyse(Clues((1,)), state)
+            assert analyse(Clues((1,)), state) is first
+        assert analyse(Clues((1,)), state) is not first
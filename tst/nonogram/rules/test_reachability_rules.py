@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.rules.enumeration_rules import EnumerationRule
+from nonogram.rules.reachability_rules import ReachabilityRule, reachability_solve
+from tst.nonogram.utils import RuleTester
+
+
+class TestReachabilityRule:
+    tester = RuleTester(ReachabilityRule)
+
+    @pytest.mark.parametrize(
+        "clues, state, expected",
+        [
+            ((), "   ", "..."),
+            ((0,), "   ", "..."),
+            ((3,), "   ", "###"),
+            ((1,), " # ", ".#."),
+            ((4, 1, 3), "            ", "  ##     #  "),
+            ((2,), ". #  ", ". # ."),
+            ((1, 1), "#   #", "#...#"),
+        ],
+    )
+    def test_apply(self, clues, state, expected):
+        self.tester.assert_apply(clues, state, expected)
+
+    @pytest.mark.parametrize(
+        "clues, state, expected",
+        [
+            ((5, 1, 8, 1), "                     #   #   .", "                   ###   #   ."),
+            (
+                (2, 2, 2, 1, 2, 3),
+                "    .##..##..# ..#  .##.###...",
+                ".....##..##..##..#...##.###...",
+            ),
+            ((2, 2, 2, 2, 5), "   .#  .#  .# ..##.   .#####..", "....##..##..##..##.....#####.."),
+        ],
+    )
+    def test_real_examples(self, clues, state, expected):
+        self.tester.assert_apply(clues, state, expected)
+
+    @pytest.mark.parametrize(
+        "clues, state",
+        [
+            ((1,), ""),
+            ((2,), " . "),
+            ((1, 1), "  "),
+            ((), " # "),
+            ((1,), "## "),
+            ((2,), "#.#"),
+        ],
+    )
+    def test_contradictions(self, clues, state):
+        with pytest.raises(Contradiction):
+            reachability_solve(Clues(clues), LineState(state))
+
+    def test_matches_enumeration(self):
+        """Cross-check against brute-force enumeration on random partially filled lines."""
+        rng = random.Random(0)
+        for _ in range(500):
+            n = rng.randint(1, 14)
+            solution = [rng.choice([Cell.BOX, Cell.CROSS]) for _ in range(n)]
+            clues = Clues([len(run) for run in "".join(solution).split(".") if run])
+            state = LineState([cell if rng.random() < 0.3 else Cell.UNKNOWN for cell in solution])
+            assert reachability_solve(clues, state) == EnumerationRule.apply(clues, state)
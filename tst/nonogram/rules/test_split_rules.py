@@ -53,7 +53,7 @@ class TestCrossBoundedSplitRule:
             (
                 (2, 1),
                 "                 #             .... #.. ",
-                (((2, 1), "                 #             .... #.. "),),
+                (((2,), "                 #             ."), ((1,), "... #.. ")),
             ),
         ],
     )
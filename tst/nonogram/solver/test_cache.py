@@ -0,0 +1,114 @@
+import pytest
+
+from nonogram.core import Clues, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.solver import cache as cache_module
+from nonogram.solver.cache import CachedLineSolver, LineCache, line_key
+from nonogram.solver.pipeline import make_line_solver
+
+
+class CountingSolver:
+    def __init__(self):
+        self.inner = make_line_solver(complete=True)
+        self.rules = self.inner.rules
+        self.calls = 0
+
+    def solve(self, clues, state):
+        self.calls += 1
+        return self.inner.solve(clues, state)
+
+
+class TestLineKey:
+    def test_distinguishes_lines(self):
+        keys = {
+            line_key(Clues(c), LineState(s))
+            for c, s in [((1,), "  "), ((1,), " #"), ((1,), ". "), ((2,), "  "), ((1,), "   ")]
+        }
+        assert len(keys) == 5
+
+    def test_compact(self):
+        assert len(line_key(Clues([3, 1, 2]), LineState(" " * 30))) == 5 + 2 * 4
+
+
+class TestLineCache:
+    @pytest.mark.parametrize(
+        "policy, survivor, evicted",
+        [("lru", b"b", b"a"), ("lfu", b"a", b"b")],
+    )
+    def test_eviction(self, policy, survivor, evicted):
+        cache = LineCache(max_entries=2, policy=policy)
+        cache.put(b"a", b"1")
+        cache.get(b"a")
+        cache.get(b"a")
+        cache.put(b"b", b"2")
+        cache.get(b"b")
+        if policy == "lru":
+            cache.get(b"a")
+            cache.get(b"b")
+        cache.put(b"c", b"3")
+
+        assert cache.get(survivor) is not None
+        assert cache.get(evicted) is None
+        assert cache.stats.evictions == 1
+        assert len(cache) == 2
+
+    def test_disk_store_shared(self, tmp_path):
+        path = str(tmp_path / "lines.sqlite")
+        with LineCache(path=path) as cache:
+            cache.put(b"key", b"value")
+
+        with LineCache(path=path) as cache:
+            assert cache.get(b"key") == b"value"
+            assert cache.get(b"key") == b"value"
+            assert cache.stats.disk_hits == 1
+            assert cache.stats.hits == 1
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            LineCache(policy="random")
+
+
+class TestCachedLineSolver:
+    def test_hits(self):
+        inner = CountingSolver()
+        solver = CachedLineSolver(inner, LineCache())
+        clues, state = Clues([3]), LineState("    ")
+
+        first = solver.solve(clues, state)
+        assert solver.solve(clues, state) == first == LineState(" ## ")
+        assert inner.calls == 1
+        assert solver.cache.stats.hits == 1
+        assert solver.cache.stats.hit_rate == 0.5
+
+    def test_contradictions_cached(self):
+        inner = CountingSolver()
+        solver = CachedLineSolver(inner, LineCache())
+        for _ in range(2):
+            with pytest.raises(Contradiction):
+                solver.solve(Clues([3]), LineState(" . "))
+        assert inner.calls == 1
+
+    def test_namespaces(self):
+        cache = LineCache()
+        clues, state = Clues([1]), LineState("# ")
+        CachedLineSolver(make_line_solver(complete=True), cache).solve(clues, state)
+        CachedLineSolver(make_line_solver(), cache).solve(clues, state)
+        assert cache.stats.misses == 2
+
+    def test_namespace_includes_split_rules(self):
+        cache = LineCache()
+        clues, state = Clues([1]), LineState("# ")
+        with_splits = make_line_solver()
+        without_splits = make_line_solver()
+        without_splits.split_rules = []
+        CachedLineSolver(with_splits, cache).solve(clues, state)
+        CachedLineSolver(without_splits, cache).solve(clues, state)
+        assert cache.stats.misses == 2
+
+    def test_namespace_includes_version(self, monkeypatch):
+        cache = LineCache()
+        clues, state = Clues([1]), LineState("# ")
+        CachedLineSolver(make_line_solver(), cache).solve(clues, state)
+        monkeypatch.setattr(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1)
+        CachedLineSolver(make_line_solver(), cache).solve(clues, state)
+        assert cache.stats.misses == 2
@@ -0,0 +1,48 @@
+from nonogram.core import Clues, Grid
+from nonogram.solver.counting import SolutionCounter
+from nonogram.solver.search import satisfies
+
+
+def clues(*lines: list[int]) -> list[Clues]:
+    return [Clues(line) for line in lines]
+
+
+class TestSolutionCounter:
+    def test_unique(self):
+        # Propagation stalls here, so uniqueness needs branching
+        rows = clues([1, 2], [1, 1], [1, 1], [1, 2], [2])
+        cols = clues([1, 2], [1], [1, 2], [1, 2], [1, 1])
+        grid = Grid(5, 5)
+        result = SolutionCounter().count(grid, rows, cols)
+        assert result.unique
+        assert result.nodes > 0
+        assert satisfies(result.solutions[0], rows, cols)
+        assert grid.cells == Grid(5, 5).cells
+
+    def test_stops_at_limit(self):
+        rows = cols = clues([1], [1])
+        result = SolutionCounter(limit=2).count(Grid(2, 2), rows, cols)
+        assert result.status == "limit"
+        assert result.count == 2
+        assert not result.unique
+        assert result.solutions[0].cells != result.solutions[1].cells
+
+    def test_counts_all_below_limit(self):
+        rows = cols = clues([1], [1])
+        result = SolutionCounter(limit=3).count(Grid(2, 2), rows, cols)
+        assert result.status == "exhausted"
+        assert result.count == 2
+
+    def test_no_solution(self):
+        result = SolutionCounter().count(Grid(2, 2), clues([1, 1], [0]), clues([1], [1]))
+        assert result.status == "exhausted"
+        assert result.count == 0
+
+    def test_budget_and_progress(self):
+        reports = []
+        counter = SolutionCounter(limit=10, max_nodes=4, progress=reports.append, progress_every=0)
+        rows = cols = clues([1], [1], [1])
+        result = counter.count(Grid(3, 3), rows, cols)
+        assert result.status == "budget"
+        assert reports
+        assert reports[-1].nodes <= 4
@@ -0,0 +1,31 @@
+from nonogram.solver.dependencies import DependencyRecord
+
+
+class TestDependencyRecord:
+    def test_labels_follow_assumptions(self):
+        record = DependencyRecord()
+        record.record([(0, 0)], [])
+        record.assume((1, 1))
+        record.record([(1, 2), (1, 3)], [(0, 0), (1, 1)])
+        record.record([(2, 3)], [(1, 3)])
+        assert record.labels[(0, 0)] == frozenset()
+        assert record.labels[(2, 3)] == {(1, 1)}
+        assert record.affected((1, 1)) == {(1, 2), (1, 3), (2, 3)}
+        assert record.affected((0, 0)) == set()
+
+    def test_relabelled_cells_are_not_affected(self):
+        record = DependencyRecord()
+        record.assume((0, 0))
+        record.record([(0, 1)], [(0, 0)])
+        record.record([(0, 1)], [])
+        assert record.affected((0, 0)) == set()
+
+    def test_rollback(self):
+        record = DependencyRecord()
+        record.assume((0, 0))
+        mark = record.mark()
+        record.record([(0, 1)], [(0, 0)])
+        record.assume((0, 1))
+        record.rollback(mark)
+        assert record.labels == {(0, 0): {(0, 0)}}
+        assert record.affected((0, 0)) == set()
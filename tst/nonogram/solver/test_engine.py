@@ -0,0 +1,55 @@
+import pytest
+
+from nonogram.core import Clues, Grid
+from nonogram.exceptions import Contradiction
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.priority import LinePriority
+
+
+class TestPropagationEngine:
+    @pytest.mark.parametrize("strategy", ["lifo", "fifo", "priority"])
+    def test_strategies_solve(self, strategy):
+        grid = Grid(5, 5)
+        rows = [Clues(c) for c in ([5], [1], [0], [0], [0])]
+        cols = [Clues(c) for c in ([1], [2], [1], [1], [1])]
+
+        engine = PropagationEngine(make_line_solver(complete=True), strategy=strategy)
+        assert engine.propagate(grid, rows, cols)
+        assert grid.is_solved()
+        assert [str(grid.row(i)) for i in range(2)] == ["#####", ".#..."]
+
+    def test_stats(self):
+        grid = Grid(3, 1)
+        engine = PropagationEngine(make_line_solver(complete=True))
+        engine.propagate(grid, [Clues([3])], [Clues([1])] * 3)
+        assert engine.stats.line_solves == 4
+        assert engine.stats.line_updates == 1
+        assert engine.stats.cells_changed == 3
+
+
+class TestLinePriority:
+    def test_seed_prefers_tight_lines(self):
+        grid = Grid(5, 3)
+        rows = [Clues(c) for c in ([5], [1], [0])]
+        cols = [Clues([1, 1])] * 5
+        priority = LinePriority(grid, rows, cols)
+        assert priority.seed(("row", 0)) == 1.0
+        assert priority.seed(("row", 2)) == 1.0
+        assert priority.seed(("row", 1)) == 0.0
+
+    def test_crossed_weight_grows_as_line_fills(self):
+        priority = LinePriority(Grid(4, 1), [Clues([1])], [Clues([0])] * 4)
+        weights = [priority.crossed(("row", 0)) for _ in range(4)]
+        assert weights == sorted(weights)
+
+    @pytest.mark.parametrize("clue", [4, 5])
+    def test_overlong_clues(self, clue):
+        priority = LinePriority(Grid(3, 1), [Clues([clue])], [Clues([1])] * 3)
+        weights = [priority.crossed(("row", 0)) for _ in range(3)]
+        assert all(weight > 0 for weight in weights)
+        assert weights == sorted(weights)
+
+        engine = PropagationEngine(make_line_solver(), strategy="priority")
+        with pytest.raises(Contradiction):
+            engine.propagate(Grid(3, 3), [Clues([clue])] + [Clues([1])] * 2, [Clues([1])] * 3)
@@ -0,0 +1,78 @@
+import pytest
+
+from nonogram.core import Cell, Clues, LineState
+from nonogram.exceptions import ClueMismatchContradiction
+from nonogram.rules import Rule
+from nonogram.rules.enumeration_rules import EnumerationRule
+from nonogram.rules.overlap_rules import OverlapRule
+from nonogram.rules.simple_rules import CompleteCluesRule
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.pipeline import make_line_solver
+
+
+class RecordingRule(Rule):
+    def __init__(self, rule, log):
+        self.rule = rule
+        self.cost = rule.cost
+        self.log = log
+
+    def applies(self, clues, state):
+        return self.rule.applies(clues, state)
+
+    def apply(self, clues, state):
+        self.log.append(type(self.rule).__name__)
+        return self.rule.apply(clues, state)
+
+
+class FillRule(Rule):
+    """Boxes every unknown, right or not."""
+
+    @staticmethod
+    def apply(clues, state):
+        return LineState([Cell.BOX if cell == Cell.UNKNOWN else cell for cell in state])
+
+
+class TestLineSolver:
+    def test_cheap_rules_run_first(self):
+        log = []
+        solver = LineSolver([RecordingRule(r, log) for r in (EnumerationRule(), OverlapRule())])
+        assert solver.solve(Clues((3,)), LineState("    ")) == LineState(" ## ")
+        assert log[0] == "OverlapRule"
+
+    def test_expensive_rules_only_when_stalled(self):
+        log = []
+        solver = LineSolver([RecordingRule(r, log) for r in (EnumerationRule(), OverlapRule())])
+        # Overlap alone finishes the line, so enumeration never runs
+        assert solver.solve(Clues((4,)), LineState("    ")) == LineState("####")
+        assert "EnumerationRule" not in log
+
+        log.clear()
+        # Overlap deduces nothing here; enumeration crosses the unreachable end
+        assert solver.solve(Clues((1, 1)), LineState("#  . ")) == LineState("#. . ")
+        assert log.index("EnumerationRule") > 0
+
+    def test_stats(self):
+        solver = LineSolver([CompleteCluesRule(), OverlapRule()])
+        solver.solve(Clues((3,)), LineState("     "))
+        stats = solver.stats
+        # No runs at first, so CompleteClues is skipped until Overlap finds one
+        assert stats["CompleteCluesRule"].skips == 1
+        assert stats["OverlapRule"].fires == 1
+        assert stats["OverlapRule"].calls == 2
+
+    def test_rules_can_be_edited(self):
+        solver = LineSolver([OverlapRule()])
+        assert solver.solve(Clues((1, 1)), LineState("#  . ")) == LineState("#  . ")
+        solver.rules.append(EnumerationRule())
+        assert solver.solve(Clues((1, 1)), LineState("#  . ")) == LineState("#. . ")
+
+    def test_complete_lines_are_not_reworked(self):
+        solver = make_line_solver()
+        solver.solve(Clues((1,)), LineState("#.."))
+        assert all(stats.calls == 0 for stats in solver.stats.values())
+
+    def test_completed_line_is_checked(self):
+        # The fill completes the line before CompleteClues could reject it
+        solver = LineSolver([FillRule(), CompleteCluesRule()])
+        with pytest.raises(ClueMismatchContradiction):
+            solver.solve(Clues((1,)), LineState("   "))
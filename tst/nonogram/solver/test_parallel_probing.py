@@ -0,0 +1,72 @@
+import pytest
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.exceptions import ProbeContradiction
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.parallel_probing import ParallelProbingEngine, merge
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import ProbingEngine
+from nonogram.solver.search import satisfies
+
+
+def clues(*lines: list[int]) -> list[Clues]:
+    return [Clues(line) for line in lines]
+
+
+ROWS = clues([1, 2], [1, 1], [1, 1], [1, 2], [2])
+COLS = clues([1, 2], [1], [1, 2], [1, 2], [1, 1])
+
+
+def stalled() -> Grid:
+    grid = Grid(5, 5)
+    PropagationEngine(make_line_solver()).propagate(grid, ROWS, COLS)
+    assert not grid.is_solved()
+    return grid
+
+
+class TestParallelProbingEngine:
+    @pytest.mark.parametrize("workers", [1, 2, 3])
+    def test_same_result_for_any_worker_count(self, workers):
+        grid = stalled()
+        result = ParallelProbingEngine(workers).probe(grid, ROWS, COLS)
+        assert result.status == "solved"
+        assert satisfies(grid, ROWS, COLS)
+
+        serial = stalled()
+        expected = ParallelProbingEngine(1).probe(serial, ROWS, COLS)
+        assert grid.cells == serial.cells
+        assert result.cells == expected.cells
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_same_result_as_serial_engine(self, workers):
+        grid = stalled()
+        result = ParallelProbingEngine(workers, time_budget=None).probe(grid, ROWS, COLS)
+
+        serial = stalled()
+        engine = ProbingEngine(PropagationEngine(make_line_solver()), time_budget=None)
+        expected = engine.probe(serial, ROWS, COLS)
+        assert grid.cells == serial.cells
+        assert result.status == expected.status
+        assert result.cells == expected.cells
+        assert grid.trail is None
+
+    def test_stuck(self):
+        grid = Grid(2, 2)
+        result = ParallelProbingEngine(2).probe(grid, clues([1], [1]), clues([1], [1]))
+        assert result.status == "stuck"
+        assert result.cells == 0
+
+    def test_contradiction(self):
+        with pytest.raises(ProbeContradiction):
+            ParallelProbingEngine(2).probe(Grid(2, 2), clues([1, 1], [0]), clues([1], [1]))
+
+
+class TestMerge:
+    def test_in_probe_order(self):
+        merged = merge([{(0, 1): Cell.BOX}, {}, {(2, 0): Cell.CROSS, (0, 1): Cell.BOX}])
+        assert merged == {(0, 1): Cell.BOX, (2, 0): Cell.CROSS}
+        assert list(merged) == [(0, 1), (2, 0)]
+
+    def test_conflict(self):
+        with pytest.raises(ProbeContradiction):
+            merge([{(0, 1): Cell.BOX}, {(0, 1): Cell.CROSS}])
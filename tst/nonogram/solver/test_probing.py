@@ -0,0 +1,74 @@
+import pytest
+
+from nonogram.core import Cell, Clues, Grid, LineState
+from nonogram.exceptions import ProbeContradiction
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.probing import ProbingEngine, probe_order
+from nonogram.solver.search import satisfies
+
+
+def clues(*lines: list[int]) -> list[Clues]:
+    return [Clues(line) for line in lines]
+
+
+# Propagation alone stalls on this puzzle, but it has a single solution
+ROWS = clues([1, 2], [1, 1], [1, 1], [1, 2], [2])
+COLS = clues([1, 2], [1], [1, 2], [1, 2], [1, 1])
+
+
+class TestProbingEngine:
+    probing = ProbingEngine(PropagationEngine(make_line_solver(complete=True)))
+
+    def test_solves_stalled_puzzle(self):
+        grid = Grid(5, 5)
+        self.probing.propagation.propagate(grid, ROWS, COLS)
+        unknown = sum(row.count(Cell.UNKNOWN) for row in grid.cells)
+        assert unknown
+
+        result = self.probing.probe(grid, ROWS, COLS)
+
+        assert result.status == "solved"
+        assert result.cells == unknown
+        assert satisfies(grid, ROWS, COLS)
+        assert grid.trail is None
+
+    def test_keeps_only_forced_values(self):
+        # Two diagonal solutions, so no cell is forced
+        grid = Grid(2, 2)
+        result = ProbingEngine(self.probing.propagation).probe(
+            grid, clues([1], [1]), clues([1], [1])
+        )
+        assert result.status == "stuck"
+        assert result.cells == 0
+        assert grid.cells == Grid(2, 2).cells
+        # Each value of the first cell decides the rest, so no other cell is probed
+        assert result.probes == 2
+
+    def test_contradiction(self):
+        grid = Grid(2, 2)
+        with pytest.raises(ProbeContradiction):
+            self.probing.probe(grid, clues([1, 1], [0]), clues([1], [1]))
+        assert grid.trail is None
+
+    def test_budget(self):
+        probing = ProbingEngine(self.probing.propagation, time_budget=0)
+        grid = Grid(5, 5)
+        probing.propagation.propagate(grid, ROWS, COLS)
+        result = probing.probe(grid, ROWS, COLS)
+        assert result.status == "budget"
+        assert result.probes == 0
+
+    def test_should_stop(self):
+        probing = ProbingEngine(self.probing.propagation, should_stop=lambda: True)
+        grid = Grid(5, 5)
+        probing.propagation.propagate(grid, ROWS, COLS)
+        result = probing.probe(grid, ROWS, COLS)
+        assert result.status == "stopped"
+        assert result.probes == 0
+
+
+def test_probe_order():
+    grid = Grid(3, 2)
+    grid.apply_row(0, LineState("#. "))
+    assert probe_order(grid) == [(0, 2), (1, 0), (1, 1), (1, 2)]
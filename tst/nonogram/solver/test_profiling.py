@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from nonogram.core import Clues, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.parser import parse_puzzle
+from nonogram.printer import render_profile
+from nonogram.rules.overlap_rules import OverlapRule
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.line_solver import LineSolver
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.profiling import LatencyHistogram, Profiler, instrument
+
+SMALL = {
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+
+
+class TestLatencyHistogram:
+    def test_buckets_by_power_of_two(self):
+        hist = LatencyHistogram()
+        for elapsed in (0.0000005, 0.000003, 0.000003, 0.0001):
+            hist.add(elapsed)
+        assert hist.count == 4
+        assert hist.max == 0.0001
+        assert hist.buckets == [1, 0, 2, 0, 0, 0, 0, 1]
+
+
+class TestProfiler:
+    def test_records_rules_and_lines(self):
+        profiler = Profiler()
+        puzzle = parse_puzzle(SMALL)
+        line_solver = instrument(make_line_solver(), profiler)
+        engine = PropagationEngine(line_solver)
+        engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+
+        assert puzzle.grid.is_solved()
+        # Split rules can also fill cells, so rules account for most but not all of them
+        assert 0 < sum(profile.cells for profile in profiler.rules.values()) <= 25
+        assert profiler.rules["OverlapRule"].calls > 0
+        assert set(profiler.lines) == {5}
+        assert profiler.lines[5].count == engine.stats.line_solves
+
+    def test_split_rules(self):
+        profiler = Profiler()
+        instrument(make_line_solver(), profiler).solve(Clues((1, 1)), LineState("#.   "))
+        assert profiler.rules["CompleteEdgeSplitRule.split"].calls >= 1
+        assert profiler.rules["CompleteEdgeSplitRule.merge"].calls == 1
+
+    def test_rule_names_are_kept(self):
+        solver = LineSolver([OverlapRule()])
+        instrument(solver, Profiler())
+        solver.solve(Clues((3,)), LineState("    "))
+        assert list(solver.stats) == ["OverlapRule"]
+
+    def test_contradictions(self):
+        profiler = Profiler()
+        solver = instrument(LineSolver([OverlapRule()]), profiler)
+        with pytest.raises(Contradiction):
+            solver.solve(Clues((3,)), LineState(" . "))
+        assert profiler.rules["OverlapRule"].contradictions == 1
+        assert profiler.lines[3].count == 1
+
+    def test_export(self, tmp_path):
+        profiler = Profiler()
+        instrument(LineSolver([OverlapRule()]), profiler).solve(Clues((2,)), LineState("   "))
+        path = tmp_path / "profile.json"
+        profiler.write(str(path))
+
+        data = json.loads(path.read_text())
+        assert data["rules"]["OverlapRule"]["cells"] == 1
+        assert data["lines"]["3"]["count"] == 1
+        assert render_profile(profiler) is not None
@@ -0,0 +1,51 @@
+import pytest
+
+from nonogram.solver.scheduler import LineScheduler, all_lines
+
+
+def drain(queue: LineScheduler) -> list[tuple[str, int]]:
+    return [queue.pop() for _ in range(len(queue))]
+
+
+class TestLineScheduler:
+    def test_all_lines(self):
+        assert all_lines(2, 1) == [("row", 0), ("row", 1), ("col", 0)]
+
+    def test_lifo_promotes(self):
+        queue = LineScheduler("lifo", all_lines(2, 2))
+        queue.push(("col", 1))
+        queue.push(("row", 5))
+        assert len(queue) == 5
+        assert drain(queue) == [("row", 5), ("col", 1), ("row", 0), ("row", 1), ("col", 0)]
+
+    def test_fifo_keeps_place(self):
+        queue = LineScheduler("fifo", all_lines(2, 2))
+        queue.push(("row", 0))
+        queue.push(("row", 5))
+        assert drain(queue) == [("row", 0), ("row", 1), ("col", 0), ("col", 1), ("row", 5)]
+
+    def test_priority_accumulates(self):
+        queue = LineScheduler("priority", all_lines(2, 2))
+        queue.push(("col", 1))
+        queue.push(("row", 1), weight=0.5)
+        queue.push(("row", 1), weight=0.75)
+        assert list(queue) == [("row", 1), ("col", 1), ("row", 0), ("col", 0)]
+        assert drain(queue) == [("row", 1), ("col", 1), ("row", 0), ("col", 0)]
+
+    @pytest.mark.parametrize("strategy", ["lifo", "fifo", "priority"])
+    def test_membership(self, strategy):
+        queue = LineScheduler(strategy, all_lines(1, 1))
+        assert ("row", 0) in queue
+        queue.discard(("row", 0))
+        assert ("row", 0) not in queue
+        assert len(queue) == 1
+        copy = queue.copy()
+        assert queue.pop() == ("col", 0)
+        assert not queue
+        assert list(copy) == [("col", 0)]
+        with pytest.raises((IndexError, KeyError)):
+            queue.pop()
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            LineScheduler("random")
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from nonogram.core import Cell, Clues, Grid
+from nonogram.parser import parse_nonogram
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.search import SearchEngine, choose_cell, satisfies
+
+EXAMPLES = Path(__file__).resolve().parents[3] / "examples"
+
+
+def clues(*lines: list[int]) -> list[Clues]:
+    return [Clues(line) for line in lines]
+
+
+class TestSearchEngine:
+    search = SearchEngine(PropagationEngine(make_line_solver(complete=True)))
+
+    def test_branches_when_propagation_stalls(self):
+        # Two diagonal solutions; line solving alone cannot fix a single cell
+        rows = cols = clues([1], [1])
+        grid = Grid(2, 2)
+
+        result = self.search.solve(grid, rows, cols)
+
+        assert result.status == "solved"
+        assert result.nodes > 0
+        assert satisfies(result.grid, rows, cols)
+        assert not grid.is_solved()
+
+    def test_unsolvable(self):
+        rows = clues([1, 1], [0])
+        cols = clues([1], [1])
+        result = self.search.solve(Grid(2, 2), rows, cols)
+        assert result.status == "unsolvable"
+        assert result.grid is None
+
+    def test_budget(self):
+        search = SearchEngine(self.search.propagation, max_nodes=0)
+        result = search.solve(Grid(2, 2), clues([1], [1]), clues([1], [1]))
+        assert result.status == "budget"
+
+    def test_heuristic_rules_backtrack(self):
+        """The rule pipeline misses contradictions, so search relies on complete-line checks."""
+        rows = clues([1, 1], [1], [1, 1])
+        cols = clues([1, 1], [1], [1, 1])
+        search = SearchEngine(PropagationEngine(make_line_solver()))
+        result = search.solve(Grid(3, 3), rows, cols)
+        assert result.status == "solved"
+        assert satisfies(result.grid, rows, cols)
+
+    @pytest.mark.parametrize("path", sorted(EXAMPLES.glob("*.json")), ids=lambda p: p.stem)
+    def test_examples(self, path):
+        puzzle = parse_nonogram(str(path))
+        result = self.search.solve(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+        assert result.status == "solved"
+        assert satisfies(result.grid, puzzle.row_clues, puzzle.col_clues)
+
+
+class TestChooseCell:
+    def test_fewest_unknowns(self):
+        grid = Grid(3, 3)
+        grid.set(0, 1, Cell.BOX)
+        grid.set(2, 1, Cell.CROSS)
+        assert choose_cell(grid) == (1, 1)
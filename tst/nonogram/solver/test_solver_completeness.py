@@ -4,10 +4,11 @@ from nonogram.core import Clues, LineState
 from nonogram.rules.edge_rules import GlueEdgeRule, MercuryEdgeRule
 from nonogram.rules.enumeration_rules import EnumerationRule
 from nonogram.rules.overlap_rules import MinimumLengthExpansionRule, NeverBlackRule, OverlapRule
+from nonogram.rules.reachability_rules import ReachabilityRule
 from nonogram.rules.simple_rules import CompleteCluesRule, FirstClueGapRule
 from nonogram.rules.split_rules import CompleteEdgeSplitRule
 from nonogram.solver.split_line_solver import SplitLineSolver
-from tst.nonogram.utils import assert_state_at_least
+from tst.nonogram.utils import assert_state, assert_state_at_least
 
 
 class TestLineSolverCompleteness:
@@ -47,3 +48,24 @@ class TestLineSolverCompleteness:
             self.line_solver.solve(clues, LineState(state)),
             EnumerationRule.apply(clues, LineState(state)),
         )
+
+
+class TestReachabilitySolverCompleteness:
+    line_solver = SplitLineSolver(rules=[ReachabilityRule()], split_rules=[])
+
+    @pytest.mark.parametrize(
+        "clues, state",
+        [
+            ((), ""),
+            ((2, 2, 2, 2, 5), "   .#  .#  .# ..##.   .#####.."),
+            ((5, 1, 8, 1), "                     #   #   ."),
+        ],
+    )
+    def test_completeness(self, clues, state):
+        """The reachability solver is exact, so it matches enumeration cell for cell."""
+        clues = Clues(clues)
+
+        assert assert_state(
+            self.line_solver.solve(clues, LineState(state)),
+            EnumerationRule.apply(clues, LineState(state)),
+        )
@@ -0,0 +1,91 @@
+from nonogram.core import Cell, Clues, Grid
+from nonogram.parser import PuzzleInput
+from nonogram.solver.ui_solver import StepwiseSolver
+
+
+def make_puzzle() -> PuzzleInput:
+    rows = [Clues(c) for c in ([5], [1], [0], [0], [0])]
+    cols = [Clues(c) for c in ([1], [2], [1], [1], [1])]
+    return PuzzleInput({}, 5, 5, rows, cols, Grid(5, 5))
+
+
+def rows_of(solver: StepwiseSolver) -> list[str]:
+    return [str(solver.grid.row(i)) for i in range(solver.grid.height)]
+
+
+class TestStepwiseSolver:
+    def test_undo_every_step(self):
+        solver = StepwiseSolver(make_puzzle())
+        snapshots = []
+        while not solver.is_done:
+            snapshots.append([row[:] for row in solver.grid.cells])
+            assert solver.step() is not None
+
+        assert len(snapshots) > 0
+        for snapshot in reversed(snapshots):
+            assert solver.undo()
+            assert solver.grid.cells == snapshot
+        assert not solver.undo()
+
+    def test_undo_reverts_manual_edit(self):
+        solver = StepwiseSolver(make_puzzle())
+        solver.step()
+        solver.set_cell(4, 4, Cell.BOX)
+        solver.undo()
+        assert solver.grid.get(4, 4) == Cell.UNKNOWN
+
+    def test_probes_when_stalled(self):
+        rows = [Clues(c) for c in ([1, 2], [1, 1], [1, 1], [1, 2], [2])]
+        cols = [Clues(c) for c in ([1, 2], [1], [1, 2], [1, 2], [1, 1])]
+        solver = StepwiseSolver(PuzzleInput({}, 5, 5, rows, cols, Grid(5, 5)))
+        kinds = []
+        while (result := solver.step()) is not None:
+            kinds.append(result.kind)
+        assert solver.is_done
+        assert kinds[-1] == "probe"
+        assert solver.undo()
+        assert not solver.is_done
+
+    def test_stopped_probe_is_not_stuck(self):
+        rows = [Clues(c) for c in ([1, 2], [1, 1], [1, 1], [1, 2], [2])]
+        cols = [Clues(c) for c in ([1, 2], [1], [1, 2], [1, 2], [1, 1])]
+        solver = StepwiseSolver(PuzzleInput({}, 5, 5, rows, cols, Grid(5, 5)))
+        while (result := solver.step(should_stop=lambda: True)).kind != "probe":
+            pass
+        assert not result.changed
+        assert not solver.is_stuck
+        while solver.step() is not None:
+            pass
+        assert solver.is_done
+
+    def test_stuck_without_probing(self):
+        rows = [Clues(c) for c in ([1, 2], [1, 1], [1, 1], [1, 2], [2])]
+        cols = [Clues(c) for c in ([1, 2], [1], [1, 2], [1, 2], [1, 1])]
+        puzzle = PuzzleInput({}, 5, 5, rows, cols, Grid(5, 5))
+        solver = StepwiseSolver(puzzle, probe_budget=None)
+        while solver.step() is not None:
+            pass
+        assert solver.is_stuck
+
+    def test_edit_retracts_only_dependent_deductions(self):
+        # Propagation fixes the cross shape; the corners depend on a guess
+        rows = [Clues(c) for c in ([2], [3], [2])]
+        cols = [Clues(c) for c in ([2], [3], [2])]
+        solver = StepwiseSolver(PuzzleInput({}, 3, 3, rows, cols, Grid(3, 3)), probe_budget=None)
+        while solver.step() is not None:
+            pass
+        assert rows_of(solver) == [" # ", "###", " # "]
+
+        solver.set_cell(0, 0, Cell.BOX)
+        while solver.step() is not None:
+            pass
+        assert rows_of(solver) == ["##.", "###", ".##"]
+
+        assert solver.set_cell(0, 0, Cell.CROSS) == {(0, 2), (2, 0), (2, 2)}
+        assert rows_of(solver) == [".# ", "###", " # "]
+        while solver.step() is not None:
+            pass
+        assert rows_of(solver) == [".##", "###", "##."]
+
+        solver.undo()
+        assert solver.set_cell(0, 0, Cell.UNKNOWN) == {(0, 2), (2, 0), (2, 2)}
@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from nonogram.core import Cell, Clues, Grid, LineState
+from nonogram.exceptions import Contradiction
+from nonogram.parser import parse_puzzle
+from nonogram.rules.overlap_rules import NeverBlackRule, OverlapRule
+from nonogram.rules.placement import black_runs
+
+np = pytest.importorskip("numpy")
+
+from nonogram.solver.vectorised import (  # noqa: E402
+    ArrayGrid,
+    pad_clues,
+    presolve,
+    solve_lines,
+    to_array,
+)
+
+
+def batch_solve(clues: list[Clues], lines: list[LineState]) -> list[LineState]:
+    grid = ArrayGrid(len(lines[0]), len(lines))
+    for i, line in enumerate(lines):
+        grid.apply_row(i, line)
+    new = solve_lines(grid.values, *pad_clues(clues))
+    grid.apply(new)
+    return grid.cells
+
+
+def rules_solve(clues: Clues, line: LineState) -> LineState:
+    """The oracle: what overlap and never-black each deduce from the line."""
+    new = LineState(line)
+    for rule in (OverlapRule, NeverBlackRule):
+        for i, cell in enumerate(rule.apply(clues, line)):
+            if cell != Cell.UNKNOWN:
+                new[i] = cell
+    return new
+
+
+def random_lines(rng: random.Random, count: int, n: int, boxes: bool):
+    clues, lines = [], []
+    while len(lines) < count:
+        solution = "".join("#" if rng.random() < 0.55 else "." for _ in range(n))
+        line_clues = Clues([run for _, run in black_runs(LineState(solution))])
+        if not line_clues:
+            continue
+        known = [c if rng.random() < 0.3 and (boxes or c == ".") else " " for c in solution]
+        clues.append(line_clues)
+        lines.append(LineState("".join(known)))
+    return clues, lines
+
+
+class TestPadClues:
+    def test_pads_and_counts(self):
+        lengths, counts = pad_clues([Clues((1, 2)), Clues((0,)), Clues((3,))])
+        assert lengths.tolist() == [[1, 2], [0, 0], [3, 0]]
+        assert counts.tolist() == [2, 0, 1]
+
+
+class TestSolveLines:
+    def test_overlap_and_never_black(self):
+        clues = [Clues((3,)), Clues((1, 1)), Clues((0,)), Clues((2,))]
+        lines = [LineState("    "), LineState(". . "), LineState("    "), LineState(".   ")]
+        assert batch_solve(clues, lines) == [
+            LineState(" ## "),
+            LineState(".#.#"),
+            LineState("...."),
+            LineState(". # "),
+        ]
+
+    def test_matches_rules_without_boxes(self):
+        rng = random.Random(0)
+        clues, lines = random_lines(rng, 300, 15, boxes=False)
+        expected = [rules_solve(c, line) for c, line in zip(clues, lines)]
+        assert batch_solve(clues, lines) == expected
+
+    def test_subset_of_rules_with_boxes(self):
+        rng = random.Random(1)
+        clues, lines = random_lines(rng, 300, 15, boxes=True)
+        for c, line, got in zip(clues, lines, batch_solve(clues, lines)):
+            expected = rules_solve(c, line)
+            assert all(g in (old, e) for old, g, e in zip(line, got, expected))
+
+    def test_contradictions(self):
+        with pytest.raises(Contradiction):
+            batch_solve([Clues((1,)), Clues((3,))], [LineState("   "), LineState(" . ")])
+        with pytest.raises(Contradiction):
+            batch_solve([Clues((2,))], [LineState("#.  ")])
+
+
+class TestArrayGrid:
+    def test_grid_interface(self):
+        grid = ArrayGrid(3, 2)
+        assert grid.apply_row(0, LineState("# ."))
+        assert not grid.apply_row(0, LineState("#  "))
+        assert grid.apply_col(1, LineState(".#"))
+        assert grid.cells == [LineState("#.."), LineState(" # ")]
+        assert grid.col(1) == LineState(".#")
+        with pytest.raises(Contradiction):
+            grid.apply_row(1, LineState(" . "))
+        assert not grid.is_solved()
+
+    def test_trail_and_rollback(self):
+        grid = ArrayGrid(3, 2)
+        mark = grid.mark()
+        grid.apply_col(2, LineState("#."))
+        grid.set(0, 0, Cell.BOX)
+        assert grid.rollback(mark) == 3
+        assert (grid.values == 0).all()
+
+
+class TestPresolve:
+    def test_plain_grid(self):
+        puzzle = parse_puzzle(
+            {
+                "width": 5,
+                "height": 5,
+                "rows": [[5], [1], [0], [0], [0]],
+                "cols": [[1], [2], [1], [1], [1]],
+            }
+        )
+        # Boxes are ignored when placing clues, so the lone row box is left unplaced
+        assert presolve(puzzle.grid, puzzle.row_clues, puzzle.col_clues) == 21
+        assert puzzle.grid.row(1) == LineState(" #   ")
+        assert puzzle.grid.col(0) == LineState("# ...")
+
+    def test_array_grid_in_place(self):
+        grid = ArrayGrid(2, 2)
+        assert presolve(grid, [Clues((2,)), Clues((0,))], [Clues((1,)), Clues((1,))]) == 4
+        assert (to_array(grid) == np.array([[1, 1], [2, 2]])).all()
+
+    def test_to_array(self):
+        grid = Grid(2, 1)
+        grid.apply_row(0, LineState("#."))
+        assert to_array(grid).tolist() == [[1, 2]]
@@ -0,0 +1,87 @@
+import io
+import json
+
+from nonogram.batch import BatchOptions, iter_sources, run_batch
+from nonogram.parser import parse_puzzle
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+from nonogram.solver.search import SearchEngine
+
+SMALL = {
+    "version": "1",
+    "meta": {"title": "Small"},
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+AMBIGUOUS = {"width": 2, "height": 2, "rows": [[1], [1]], "cols": [[1], [1]]}
+BROKEN = {"width": 2, "height": 2, "rows": [[2], [0]], "cols": [[0], [2]]}
+
+
+def run(records, **kwargs):
+    output = io.StringIO()
+    counts = run_batch(records, output, **kwargs)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestIterSources:
+    def test_files_dirs_globs_and_jsonl(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps(SMALL))
+        (tmp_path / "b.jsonl").write_text(json.dumps(SMALL) + "\n\n" + "not json\n")
+        nested = tmp_path / "nested"
+        nested.mkdir()
+        (nested / "c.json").write_text(json.dumps(SMALL))
+
+        ids = [source for source, _ in iter_sources([str(tmp_path)])]
+        assert ids == [
+            str(tmp_path / "a.json"),
+            f"{tmp_path / 'b.jsonl'}:1",
+            f"{tmp_path / 'b.jsonl'}:3",
+        ]
+
+        globbed = list(iter_sources([str(tmp_path / "**" / "*.json")]))
+        assert [source for source, _ in globbed] == [
+            str(tmp_path / "a.json"),
+            str(nested / "c.json"),
+        ]
+
+    def test_stdin(self):
+        stdin = io.StringIO(json.dumps(SMALL) + "\n")
+        assert list(iter_sources(["-"], stdin=stdin)) == [("stdin:1", SMALL)]
+
+
+class TestRunBatch:
+    def test_statuses(self):
+        counts, records = run(
+            [("small", SMALL), ("ambiguous", AMBIGUOUS), ("broken", BROKEN), ("bad", None)],
+            options=BatchOptions(complete=True),
+        )
+        by_id = {record["id"]: record for record in records}
+
+        assert counts == {"solved": 1, "stuck": 1, "contradiction": 1, "invalid": 1}
+        assert by_id["small"]["grid"][:2] == ["#####", ".#..."]
+        assert by_id["small"]["title"] == "Small"
+        assert by_id["small"]["line_solves"] > 0
+        assert by_id["ambiguous"]["grid"] == ["  ", "  "]
+        assert by_id["broken"]["error"]
+        assert by_id["bad"]["grid"] is None
+
+    def test_search(self):
+        counts, records = run([("ambiguous", AMBIGUOUS)], options=BatchOptions(search=True))
+        assert counts == {"solved": 1}
+
+        # Counts every propagation: the first, then each of the search's
+        _, stuck = run([("ambiguous", AMBIGUOUS)])
+        puzzle = parse_puzzle(AMBIGUOUS)
+        search = SearchEngine(PropagationEngine(make_line_solver()))
+        result = search.solve(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+        assert result.line_solves > search.propagation.stats.line_solves
+        assert records[0]["line_solves"] == stuck[0]["line_solves"] + result.line_solves
+
+    def test_process_pool(self):
+        counts, records = run(
+            [(str(i), SMALL) for i in range(6)], options=BatchOptions(complete=True), workers=2
+        )
+        assert counts == {"solved": 6}
+        assert sorted(record["id"] for record in records) == [str(i) for i in range(6)]
@@ -0,0 +1,73 @@
+import copy
+
+from nonogram.bench import bench_puzzle, compare, generate_puzzle, run_bench
+from nonogram.parser import parse_puzzle
+
+SMALL = {
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+
+
+class TestGeneratePuzzle:
+    def test_is_deterministic_and_valid(self):
+        data = generate_puzzle(12, seed=3)
+        assert data == generate_puzzle(12, seed=3)
+        assert data != generate_puzzle(12, seed=4)
+
+        puzzle = parse_puzzle(data)
+        assert (puzzle.width, puzzle.height) == (12, 12)
+
+    def test_empty_lines_have_zero_clue(self):
+        data = generate_puzzle(4, density=0.0)
+        assert data["rows"] == [[0]] * 4
+        assert data["cols"] == [[0]] * 4
+
+
+class TestBench:
+    def test_records_metrics(self):
+        result = bench_puzzle("small", SMALL, repeat=1)
+        assert result.status == "solved"
+        assert result.line_solves > 0
+        assert result.rule_applications >= result.line_solves
+        assert result.cells == 25
+        assert result.cells_per_second > 0
+        assert result.peak_memory > 0
+
+    def test_report(self):
+        report = run_bench([("small", SMALL)], complete=True, repeat=1)
+        assert report["complete"] is True
+        assert [r["name"] for r in report["results"]] == ["small"]
+
+
+class TestCompare:
+    def setup_method(self):
+        self.baseline = run_bench([("small", SMALL)], repeat=1)
+
+    def test_identical_report_has_no_regressions(self):
+        assert compare(self.baseline, self.baseline) == []
+
+    def test_flags_growth_beyond_threshold(self):
+        current = copy.deepcopy(self.baseline)
+        result = current["results"][0]
+        result["line_solves"] *= 2
+        result["rule_applications"] += 1
+        result["wall"] += 1.0
+        result["status"] = "stuck"
+
+        regressions = compare(current, self.baseline, threshold=0.1)
+        assert len(regressions) == 3
+        assert any("line_solves" in r for r in regressions)
+        assert any("wall" in r for r in regressions)
+        assert any("was solved" in r for r in regressions)
+
+    def test_small_wall_changes_are_noise(self):
+        current = copy.deepcopy(self.baseline)
+        current["results"][0]["wall"] += 0.001
+        assert compare(current, self.baseline, threshold=0.0) == []
+
+    def test_mismatched_solver(self):
+        current = dict(self.baseline, complete=True)
+        assert len(compare(current, self.baseline)) == 1
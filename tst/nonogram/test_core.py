@@ -1,6 +1,9 @@
+import random
+
 import pytest
 
-from nonogram.core import Cell, Clues, Grid, LineState
+from nonogram.core import BitGrid, Cell, Clues, Grid, LineState, decode_line, encode_line
+from nonogram.exceptions import Contradiction
 
 
 class TestCellState:
@@ -34,6 +37,21 @@ class TestLineClue:
         with pytest.raises(TypeError):
             Clues(init)
 
+    def test_equal_clues_are_interned(self):
+        clues = Clues([1, 2, 3])
+        assert Clues((1, 2, 3)) is clues
+        assert Clues(clues) is clues
+        assert hash(clues) == hash((1, 2, 3))
+
+    def test_reversed_and_sliced(self):
+        clues = Clues([1, 2, 3])
+        assert clues.reversed() == (3, 2, 1)
+        assert isinstance(clues.reversed(), Clues)
+        assert clues.reversed().reversed() is clues
+        assert clues.sliced(1) is Clues([2, 3])
+        assert clues.sliced(stop=1) == (1,)
+        assert clues.sliced(3) == ()
+
 
 class TestLineView:
     def test_basic_usage(self):
@@ -75,6 +93,22 @@ class TestLineView:
         assert str(LineState("#. ")) == "#. "
         assert str(LineState([Cell.BOX, Cell.CROSS, Cell.UNKNOWN])) == "#. "
 
+    def test_reversed_and_sliced(self):
+        line = LineState("#. ")
+        assert line.reversed() == LineState(" .#")
+        assert line.sliced(1) == LineState(". ")
+        assert line.sliced(stop=1) == LineState("#")
+        assert type(line.sliced(1)) is LineState
+        copy = line.sliced()
+        copy[0] = Cell.CROSS
+        assert line[0] == Cell.BOX
+
+    def test_hash_follows_contents(self):
+        line = LineState("#. ")
+        assert hash(line) == hash(LineState([Cell.BOX, Cell.CROSS, Cell.UNKNOWN]))
+        assert line.is_complete() is False
+        assert LineState("#.").is_complete()
+
     def test_state_method(self):
         line = LineState("#. ")
         assert line.state() == (Cell.BOX, Cell.CROSS, Cell.UNKNOWN)
@@ -118,3 +152,111 @@ class TestGrid:
         grid = Grid(width=2, height=2)
         grid.apply_row(0, LineState("##"))
         assert not grid.is_solved()
+
+
+class TestEncodeLine:
+    @pytest.mark.parametrize(
+        "line, boxes, crosses",
+        [
+            ("", 0, 0),
+            ("   ", 0, 0),
+            ("#. ", 0b001, 0b010),
+            ("..##", 0b1100, 0b0011),
+        ],
+    )
+    def test_round_trip(self, line, boxes, crosses):
+        assert encode_line(LineState(line)) == (boxes, crosses)
+        assert decode_line(boxes, crosses, len(line)) == LineState(line)
+
+
+class TestBitGrid:
+    def test_matches_grid(self):
+        """Random row/column writes leave both backends in the same state."""
+        rng = random.Random(0)
+        grid, bits = Grid(7, 5), BitGrid(7, 5)
+        solution = [[rng.choice([Cell.BOX, Cell.CROSS]) for _ in range(7)] for _ in range(5)]
+
+        for _ in range(40):
+            if rng.random() < 0.5:
+                i = rng.randrange(5)
+                line = LineState([c if rng.random() < 0.3 else Cell.UNKNOWN for c in solution[i]])
+                assert grid.apply_row(i, line) == bits.apply_row(i, line)
+            else:
+                j = rng.randrange(7)
+                column = [solution[i][j] for i in range(5)]
+                line = LineState([c if rng.random() < 0.3 else Cell.UNKNOWN for c in column])
+                assert grid.apply_col(j, line) == bits.apply_col(j, line)
+
+            assert bits.cells == grid.cells
+            assert all(bits.col(j) == grid.col(j) for j in range(7))
+            assert bits.is_solved() == grid.is_solved()
+
+    def test_apply_bits_reports_changes(self):
+        grid = BitGrid(4, 2)
+        assert grid.apply_row_bits(0, 0b0011, 0b0100) == 0b0111
+        assert grid.apply_row_bits(0, 0b0011, 0b1100) == 0b1000
+        assert grid.col_bits(0) == (0b01, 0b00)
+        assert grid.col_bits(3) == (0b00, 0b01)
+
+    @pytest.mark.parametrize("line", ["#   ", " .  ", "##  "])
+    def test_conflicts(self, line):
+        grid = BitGrid(4, 1)
+        grid.apply_row(0, LineState(".#  "))
+        with pytest.raises(Contradiction):
+            grid.apply_row(0, LineState(line))
+
+    def test_length_mismatch(self):
+        with pytest.raises(Contradiction):
+            BitGrid(4, 1).apply_row(0, LineState("   "))
+
+    def test_set_and_copy(self):
+        grid = BitGrid(3, 3)
+        grid.set(1, 2, Cell.BOX)
+        copy = grid.copy()
+        grid.set(1, 2, Cell.CROSS)
+        assert copy.get(1, 2) == Cell.BOX
+        assert grid.get(1, 2) == Cell.CROSS
+        assert grid.col(2) == LineState(" . ")
+        assert BitGrid.from_grid(grid).cells == grid.cells
+
+
+@pytest.mark.parametrize("grid_cls", [Grid, BitGrid])
+class TestGridTrail:
+    def test_rollback_restores_cells(self, grid_cls):
+        grid = grid_cls(3, 2)
+        grid.apply_row(0, LineState("#  "))
+        mark = grid.mark()
+        grid.apply_row(1, LineState(" .#"))
+        grid.apply_col(0, LineState("#."))
+        grid.set(0, 0, Cell.CROSS)
+
+        assert grid.rollback(mark) == 4
+        assert grid.cells == [LineState("#  "), LineState("   ")]
+        assert grid.col(0) == LineState("# ")
+
+    def test_nested_marks(self, grid_cls):
+        grid = grid_cls(2, 1)
+        outer = grid.mark()
+        grid.apply_row(0, LineState("# "))
+        inner = grid.mark()
+        grid.apply_row(0, LineState("#."))
+        grid.rollback(inner)
+        assert grid.row(0) == LineState("# ")
+        grid.rollback(outer)
+        assert grid.row(0) == LineState("  ")
+
+    def test_partial_conflict_rolls_back(self, grid_cls):
+        grid = grid_cls(3, 1)
+        grid.apply_row(0, LineState("  ."))
+        mark = grid.mark()
+        with pytest.raises(Contradiction):
+            grid.apply_row(0, LineState("###"))
+        grid.rollback(mark)
+        assert grid.row(0) == LineState("  .")
+
+    def test_untracked_by_default(self, grid_cls):
+        grid = grid_cls(2, 1)
+        grid.apply_row(0, LineState("#."))
+        assert grid.trail is None
+        with pytest.raises(ValueError):
+            grid.rollback(0)
@@ -0,0 +1,136 @@
+import io
+import json
+
+import pytest
+
+from nonogram.batch import BatchOptions, iter_sources, run_batch
+from nonogram.core import Clues, LineState
+from nonogram.corpus import Corpus, CorpusRef, pack_sources
+from nonogram.main import pack_corpus
+from nonogram.parser import ParseError, parse_puzzle
+
+SMALL = {
+    "meta": {"title": "Small"},
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+PARTIAL = {
+    "width": 3,
+    "height": 2,
+    "rows": [[200], [1, 1]],
+    "cols": [[100], [1], [100, 1]],
+    "grid": ["# .", " ##"],
+}
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = tmp_path / "puzzles.ngc"
+    count, errors = pack_sources(
+        [("small", SMALL), ("bad", {"width": 1}), ("partial", PARTIAL)], path
+    )
+    assert count == 2
+    assert errors == ["bad: Missing required field: 'height'"]
+    return path
+
+
+class TestCorpus:
+    def test_round_trip(self, corpus_path):
+        with Corpus(corpus_path) as corpus:
+            assert len(corpus) == 2
+            assert [source for source, _ in corpus] == ["small", "partial"]
+
+            small = corpus[0]
+            assert small.meta == {"title": "Small"}
+            assert small.row_clues == parse_puzzle(SMALL).row_clues
+            assert small.col_clues == [
+                Clues((1,)),
+                Clues((2,)),
+                Clues((1,)),
+                Clues((1,)),
+                Clues((1,)),
+            ]
+            assert small.grid.row(0) == LineState("     ")
+
+            partial = corpus.find("partial")
+            assert (partial.width, partial.height, partial.meta) == (3, 2, {})
+            assert partial.row_clues == [Clues((200,)), Clues((1, 1))]
+            assert partial.col_clues[2] == Clues((100, 1))
+            assert [str(partial.grid.row(i)) for i in range(2)] == ["# .", " ##"]
+
+    def test_lookup_errors(self, corpus_path):
+        with Corpus(corpus_path) as corpus:
+            with pytest.raises(IndexError):
+                corpus[2]
+            with pytest.raises(KeyError):
+                corpus.find("missing")
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "puzzle.ngc"
+        path.write_text(json.dumps(SMALL))
+        with pytest.raises(ParseError):
+            Corpus(path)
+
+    def test_rejects_empty_files(self, tmp_path):
+        path = tmp_path / "empty.ngc"
+        path.touch()
+        with pytest.raises(ParseError):
+            Corpus(path)
+        assert list(iter_sources([str(tmp_path)])) == [(str(path), None)]
+
+    @pytest.mark.parametrize("value", [0x7F, 0])
+    def test_malformed_records(self, corpus_path, value):
+        data = bytearray(corpus_path.read_bytes())
+        # The width of "small": after the 24 byte header, its id and its meta
+        data[24 + 1 + len("small") + 1 + len('{"title":"Small"}')] = value
+        corpus_path.write_bytes(bytes(data))
+        with Corpus(corpus_path) as corpus:
+            with pytest.raises(ParseError):
+                corpus[0]
+            assert corpus.find("partial").width == 3
+
+        output = io.StringIO()
+        run_batch(iter_sources([str(corpus_path)]), output, BatchOptions())
+        small = json.loads(output.getvalue().splitlines()[0])
+        assert small["status"] == "invalid"
+        assert "malformed" in small["error"]
+
+    def test_malformed_index(self, corpus_path):
+        data = bytearray(corpus_path.read_bytes())
+        # The index starts where the header's last field says; point "partial" past it
+        index = int.from_bytes(data[16:24], "little")
+        data[index + 8 : index + 16] = (len(data) * 2).to_bytes(8, "little")
+        # And make the id of "small" run into the next record
+        data[24] = 0x7F
+        corpus_path.write_bytes(bytes(data))
+        with Corpus(corpus_path) as corpus:
+            for index in range(2):
+                with pytest.raises(ParseError):
+                    corpus.id(index)
+            with pytest.raises(ParseError):
+                list(corpus.refs())
+            with pytest.raises(ParseError):
+                corpus[1]
+        assert list(iter_sources([str(corpus_path)])) == [(str(corpus_path), None)]
+
+    def test_pack_into_input_directory(self, tmp_path, capsys):
+        (tmp_path / "small.json").write_text(json.dumps(SMALL))
+        output = tmp_path / "all.ngc"
+        for _ in range(2):
+            pack_corpus([str(tmp_path)], str(output))
+            with Corpus(output) as corpus:
+                assert [source for source, _ in corpus] == [str(tmp_path / "small.json")]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["all.ngc", "small.json"]
+
+    def test_batch_reads_by_reference(self, corpus_path):
+        sources = list(iter_sources([str(corpus_path.parent)]))
+        assert sources == [
+            ("small", CorpusRef(str(corpus_path), 0)),
+            ("partial", CorpusRef(str(corpus_path), 1)),
+        ]
+        output = io.StringIO()
+        counts = run_batch(sources[:1], output, BatchOptions())
+        assert counts == {"solved": 1}
+        assert json.loads(output.getvalue())["grid"][:2] == ["#####", ".#..."]
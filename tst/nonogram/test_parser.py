@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from nonogram.core import Clues, LineState
+from nonogram.parser import ParseError, iter_puzzles, iter_records, write_puzzle
+
+SMALL = {
+    "version": "1",
+    "meta": {"title": "Small"},
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+
+
+class TestIterPuzzles:
+    def test_parses_line_by_line(self):
+        stream = io.StringIO(json.dumps(SMALL) + "\n\n" + json.dumps(SMALL) + "\n")
+        puzzles = iter_puzzles(stream)
+        first = next(puzzles)
+        assert first.meta == {"title": "Small"}
+        assert first.row_clues[0] == Clues((5,))
+        # The second puzzle has not been read yet
+        assert stream.tell() < len(stream.getvalue())
+        assert len(list(puzzles)) == 1
+
+    def test_reports_line_of_invalid_record(self):
+        bad = dict(SMALL, rows=[[5], [1], [0], [0]])
+        stream = io.StringIO(json.dumps(SMALL) + "\n" + json.dumps(bad) + "\n")
+        puzzles = iter_puzzles(stream)
+        next(puzzles)
+        with pytest.raises(ParseError, match="Line 2: Row count does not match height"):
+            next(puzzles)
+
+        with pytest.raises(ParseError, match="Line 1"):
+            next(iter_puzzles(io.StringIO("[1, 2]\n")))
+        with pytest.raises(ParseError, match="Line 1"):
+            next(iter_puzzles(io.StringIO("{not json\n")))
+
+    def test_records_continue_past_invalid_lines(self):
+        stream = io.StringIO("\n".join([json.dumps(SMALL), "{not json", json.dumps(SMALL)]))
+        records = list(iter_records(stream))
+        assert len(records) == 3
+        assert isinstance(records[1], ParseError)
+        assert str(records[1]).startswith("Line 2: ")
+        assert records[2].width == 5
+
+
+class TestWritePuzzle:
+    def test_round_trip(self):
+        puzzle = next(iter_puzzles(io.StringIO(json.dumps(SMALL))))
+        puzzle.grid.apply_row(0, LineState("#####"))
+        out = io.StringIO()
+        write_puzzle(out, puzzle)
+        write_puzzle(out, puzzle, grid=puzzle.grid.copy())
+
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0]) == dict(SMALL, grid=["#####"] + ["     "] * 4)
+        again = next(iter_puzzles(io.StringIO(lines[1])))
+        assert again.grid.row(0) == LineState("#####")
@@ -0,0 +1,26 @@
+from nonogram.parser import parse_puzzle
+from nonogram.plain import format_grid
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+
+
+def test_format_grid():
+    puzzle = parse_puzzle(
+        {
+            "width": 5,
+            "height": 5,
+            "rows": [[5], [1], [0], [0], [0]],
+            "cols": [[1], [2], [1], [1], [1]],
+        }
+    )
+    PropagationEngine(make_line_solver()).propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+    assert format_grid(puzzle).split("\n") == [
+        "    1 2 1 1 1 ",
+        "   ---------- ",
+        "5 |██████████|",
+        "1 |░░██░░░░░░|",
+        "0 |░░░░░░░░░░|",
+        "0 |░░░░░░░░░░|",
+        "0 |░░░░░░░░░░|",
+        "   ---------- ",
+    ]
@@ -0,0 +1,47 @@
+from nonogram.parser import parse_puzzle
+from nonogram.printer import RichObserver
+from nonogram.solver.engine import PropagationEngine
+from nonogram.solver.pipeline import make_line_solver
+
+SMALL = {
+    "width": 5,
+    "height": 5,
+    "rows": [[5], [1], [0], [0], [0]],
+    "cols": [[1], [2], [1], [1], [1]],
+}
+
+
+class FakeLive:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self, renderable):
+        self.updates += 1
+
+
+def solve_with(refresh_per_second):
+    puzzle = parse_puzzle(SMALL)
+    live = FakeLive()
+    observer = RichObserver(puzzle, live, refresh_per_second=refresh_per_second)
+    engine = PropagationEngine(make_line_solver(), observer=observer)
+    engine.propagate(puzzle.grid, puzzle.row_clues, puzzle.col_clues)
+    return observer, live, engine
+
+
+class TestRichObserver:
+    def test_updates_are_coalesced(self):
+        observer, live, engine = solve_with(refresh_per_second=0.001)
+        # One render for the first step, one for the final solved state
+        assert live.updates == 2
+        assert observer.rows + observer.cols == engine.stats.line_solves
+
+    def test_unthrottled_renders_every_callback(self):
+        _, live, engine = solve_with(refresh_per_second=float("inf"))
+        assert live.updates >= engine.stats.line_solves
+
+    def test_flush_draws_latest_grid(self):
+        observer, _, _ = solve_with(refresh_per_second=0.001)
+        assert not observer._grid_dirty
+        observer.on_line_update("row", 0, None, None)
+        observer.flush()
+        assert not observer._grid_dirty